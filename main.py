@@ -1,8 +1,29 @@
+import multiprocessing
+import os
+import sys
+
+# 使用 --importtime 参数或 TOOLSAPP_IMPORTTIME=1 环境变量输出模块导入耗时报告
+IMPORT_TIME_REPORT = "--importtime" in sys.argv or os.environ.get("TOOLSAPP_IMPORTTIME") == "1"
+if IMPORT_TIME_REPORT:
+    from ui import import_timer
+    import_timer.enable()
+
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 from ui.main_window import ToolsApp
 
+def print_import_report(title):
+    print(f"===== {title} =====", file=sys.stderr)
+    print(import_timer.report(), file=sys.stderr)
+
 if __name__ == "__main__":
-    app = QApplication([])
+    # 打包后的程序使用进程池时需要
+    multiprocessing.freeze_support()
+    app = QApplication([arg for arg in sys.argv if arg != "--importtime"])
     window = ToolsApp()
     window.show()
-    app.exec() 
\ No newline at end of file
+    if IMPORT_TIME_REPORT:
+        # 首帧绘制后输出启动阶段报告，退出时再输出包含按需加载工具在内的完整报告
+        QTimer.singleShot(0, lambda: print_import_report("启动导入耗时"))
+        app.aboutToQuit.connect(lambda: print_import_report("全部导入耗时"))
+    app.exec()
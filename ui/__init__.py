@@ -1 +1,6 @@
-from .main_window import ToolsApp 
\ No newline at end of file
+def __getattr__(name):
+    # 延迟导入主窗口，使 ui.import_timer 等模块可以在 PyQt6 之前加载
+    if name == "ToolsApp":
+        from .main_window import ToolsApp
+        return ToolsApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,60 @@
+import importlib._bootstrap
+import sys
+import threading
+import time
+
+# 模块名 -> [自身耗时(秒), 累计耗时(秒)]，类似 python -X importtime 的统计
+import_times = {}
+
+# 与 -X importtime 一样在模块加载这一步计时：import 语句、fromlist 中的子模块、相对导入
+# 和 importlib.import_module 最终都会对每个尚未加载的模块调用一次 _find_and_load
+_original_find_and_load = importlib._bootstrap._find_and_load
+# 每个线程有自己的导入栈，工作线程中的导入不会和界面线程的计时互相混在一起
+_local = threading.local()
+_lock = threading.Lock()
+_enabled = False
+
+def _timed_find_and_load(name, *args, **kwargs):
+    """记录一次模块加载的自身耗时和累计耗时"""
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_find_and_load(name, *args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        if name in sys.modules:
+            with _lock:
+                # 多个线程同时首次导入同一模块时只记录第一个
+                import_times.setdefault(name, [elapsed - children, elapsed])
+
+def enable():
+    """开始统计之后发生的模块导入耗时"""
+    global _enabled
+    if _enabled:
+        return
+    importlib._bootstrap._find_and_load = _timed_find_and_load
+    _enabled = True
+
+def disable():
+    """停止统计，恢复原始的模块加载函数"""
+    global _enabled
+    importlib._bootstrap._find_and_load = _original_find_and_load
+    _enabled = False
+
+def report(limit=30):
+    """按累计耗时排序，生成导入耗时报告文本"""
+    lines = [f"{'self [us]':>10} | {'cumulative':>10} | module"]
+    with _lock:
+        snapshot = dict(import_times)
+    items = sorted(snapshot.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_time, cumulative) in items[:limit]:
+        lines.append(f"{self_time * 1e6:>10.0f} | {cumulative * 1e6:>10.0f} | {name}")
+    total = sum(self_time for self_time, _ in snapshot.values())
+    lines.append(f"共导入 {len(snapshot)} 个模块，总耗时 {total * 1000:.1f} ms")
+    return "\n".join(lines)
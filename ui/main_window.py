@@ -1,27 +1,17 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QDialog, QMessageBox,
                             QStackedWidget, QFrame, QScrollArea, QTreeWidget, QTreeWidgetItem)
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QTimer, QSettings
 from PyQt6.QtGui import QFont, QIcon, QPixmap, QColor, QPalette, QGradient, QLinearGradient, QBrush
 import os
-from .tools.hash_calculator import HashCalculator
-from .tools.timestamp_converter import TimestampConverter
-from .tools.base64_converter import Base64Converter
-from .tools.json_formatter import JsonFormatter
-from .tools.clipboard_tool import ClipboardTool
-from .tools.qr_code_generator import QRCodeGenerator
-from .tools.color_picker import ColorPicker
-from .tools.file_renamer import FileRenamer
-from .tools.text_encryptor import TextEncryptor
-from .tools.image_compressor import ImageCompressor
-from .tools.url_shortener import URLShortener
-from .tools.calculator import Calculator
-from .tools.weather_checker import WeatherChecker
-from .tools.text_diff import TextDiff
+from .tools import load_tool_class
 
 # 为每个工具类创建一个实例缓存，避免重复创建
 tool_instances = {}
 
+# 首次绘制后在空闲时预热的常用工具（可通过QSettings覆盖）
+DEFAULT_WARMUP_TOOLS = ["文件哈希计算", "JSON格式化", "Base64编解码"]
+
 class ToolsApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -258,26 +248,26 @@ class ToolsApp(QMainWindow):
         # 定义工具分类
         self.tool_categories = {
             "文件工具": [
-                {"name": "文件哈希计算", "class": HashCalculator, "icon": "hash.png"},
-                {"name": "文件重命名", "class": FileRenamer, "icon": "rename.png"},
-                {"name": "图片压缩", "class": ImageCompressor, "icon": "compress.png"},
+                {"name": "文件哈希计算", "class": "HashCalculator", "icon": "hash.png"},
+                {"name": "文件重命名", "class": "FileRenamer", "icon": "rename.png"},
+                {"name": "图片压缩", "class": "ImageCompressor", "icon": "compress.png"},
             ],
             "编码工具": [
-                {"name": "Base64编解码", "class": Base64Converter, "icon": "base64.png"},
-                {"name": "文本加密", "class": TextEncryptor, "icon": "encrypt.png"},
-                {"name": "二维码生成", "class": QRCodeGenerator, "icon": "qrcode.png"},
-                {"name": "URL缩短器", "class": URLShortener, "icon": "link.png"},
+                {"name": "Base64编解码", "class": "Base64Converter", "icon": "base64.png"},
+                {"name": "文本加密", "class": "TextEncryptor", "icon": "encrypt.png"},
+                {"name": "二维码生成", "class": "QRCodeGenerator", "icon": "qrcode.png"},
+                {"name": "URL缩短器", "class": "URLShortener", "icon": "link.png"},
             ],
             "格式化工具": [
-                {"name": "JSON格式化", "class": JsonFormatter, "icon": "json.png"},
-                {"name": "时间戳转换", "class": TimestampConverter, "icon": "timestamp.png"},
-                {"name": "文本差异比较", "class": TextDiff, "icon": "diff.png"},
+                {"name": "JSON格式化", "class": "JsonFormatter", "icon": "json.png"},
+                {"name": "时间戳转换", "class": "TimestampConverter", "icon": "timestamp.png"},
+                {"name": "文本差异比较", "class": "TextDiff", "icon": "diff.png"},
             ],
             "实用工具": [
-                {"name": "颜色选择器", "class": ColorPicker, "icon": "color.png"},
-                {"name": "剪贴板工具", "class": ClipboardTool, "icon": "clipboard.png"},
-                {"name": "科学计算器", "class": Calculator, "icon": "calculator.png"},
-                {"name": "天气查询", "class": WeatherChecker, "icon": "weather.png"},
+                {"name": "颜色选择器", "class": "ColorPicker", "icon": "color.png"},
+                {"name": "剪贴板工具", "class": "ClipboardTool", "icon": "clipboard.png"},
+                {"name": "科学计算器", "class": "Calculator", "icon": "calculator.png"},
+                {"name": "天气查询", "class": "WeatherChecker", "icon": "weather.png"},
             ]
         }
         
@@ -386,7 +376,7 @@ class ToolsApp(QMainWindow):
 <div style="margin-left: 10px;">
     <p style="margin-bottom: 15px;"><b style="color: #2E7D32;">文件工具</b> - 处理文件相关操作</p>
     <ul style="margin-left: 20px; margin-bottom: 15px;">
-        <li style="margin-bottom: 5px;">文件哈希计算 - 计算文件的MD5、SHA1和SHA256哈希值</li>
+        <li style="margin-bottom: 5px;">文件哈希计算 - 计算与校验文件的MD5、SHA系列和BLAKE2哈希值</li>
         <li style="margin-bottom: 5px;">文件重命名 - 批量重命名文件，支持模式替换</li>
         <li style="margin-bottom: 5px;">图片压缩 - 无损压缩图片减小体积</li>
     </ul>
@@ -440,16 +430,66 @@ class ToolsApp(QMainWindow):
         main_layout.addWidget(content_area, 1)
     
     def init_tool_pages(self):
-        """初始化所有工具页面"""
+        """初始化所有工具页面（先放置轻量占位页，首次打开时再创建真实工具）"""
+        self.tool_pages = {}
         for tool in self.tools_list:
-            # 创建工具实例并添加到堆叠部件
-            tool_instance = tool["class"](self)
-            
-            # 存储工具实例
-            tool_instances[tool["class"].__name__] = tool_instance
-            
-            # 将工具实例添加到堆叠部件
-            self.stacked_widget.addWidget(tool_instance)
+            placeholder = QWidget()
+            self.stacked_widget.addWidget(placeholder)
+        
+        # 预热设置：是否启用以及预热哪些工具
+        self.startup_settings = QSettings("ToolsApp", "Startup")
+        self.warmup_enabled = self.startup_settings.value("warmup_enabled", True, type=bool)
+        warmup_names = self.startup_settings.value("warmup_tools", DEFAULT_WARMUP_TOOLS)
+        if isinstance(warmup_names, str):
+            warmup_names = [warmup_names]
+        names = [tool["name"] for tool in self.tools_list]
+        self.warmup_queue = [names.index(name) for name in warmup_names or [] if name in names]
+        self.warmup_started = False
+    
+    def ensure_tool_page(self, tool_index):
+        """按需创建工具实例，并替换对应的占位页"""
+        tool_instance = self.tool_pages.get(tool_index)
+        if tool_instance is not None:
+            return tool_instance
+        
+        # 首次打开时才导入工具模块及其依赖
+        tool = self.tools_list[tool_index]
+        tool_instance = load_tool_class(tool["class"])(self)
+        
+        # 存储工具实例
+        tool_instances[tool["class"]] = tool_instance
+        self.tool_pages[tool_index] = tool_instance
+        
+        # 用真实工具替换占位页，保持页面索引不变（+1 是因为0是欢迎页面）
+        page_index = tool_index + 1
+        placeholder = self.stacked_widget.widget(page_index)
+        current_index = self.stacked_widget.currentIndex()
+        self.stacked_widget.insertWidget(page_index, tool_instance)
+        self.stacked_widget.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.stacked_widget.setCurrentIndex(current_index)
+        return tool_instance
+    
+    def showEvent(self, event):
+        """窗口首次显示后，安排在空闲时预热常用工具"""
+        super().showEvent(event)
+        if self.warmup_enabled and not self.warmup_started:
+            self.warmup_started = True
+            QTimer.singleShot(300, self.warmup_next_tool)
+    
+    def warmup_next_tool(self):
+        """每次空闲只预热一个工具，避免阻塞界面"""
+        while self.warmup_queue:
+            tool_index = self.warmup_queue.pop(0)
+            if tool_index in self.tool_pages:
+                continue
+            try:
+                self.ensure_tool_page(tool_index)
+            except Exception as e:
+                print(f"Error warming up tool: {e}, tool_index: {tool_index}")
+            break
+        if self.warmup_queue:
+            QTimer.singleShot(0, self.warmup_next_tool)
     
     def handle_tool_selection(self, item, column):
         """处理工具树项目的选择"""
@@ -466,6 +506,7 @@ class ToolsApp(QMainWindow):
         
         # 显示对应的工具页面
         try:
+            self.ensure_tool_page(tool_index)
             self.stacked_widget.setCurrentIndex(tool_index + 1)  # +1 是因为0是欢迎页面
         except Exception as e:
             QMessageBox.critical(self, "错误", f"显示工具时出错: {str(e)}")
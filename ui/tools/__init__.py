@@ -1,14 +1,40 @@
-from .hash_calculator import HashCalculator
-from .timestamp_converter import TimestampConverter
-from .base64_converter import Base64Converter
-from .json_formatter import JsonFormatter
-from .clipboard_tool import ClipboardTool
-from .qr_code_generator import QRCodeGenerator
-from .color_picker import ColorPicker
-from .file_renamer import FileRenamer
-from .text_encryptor import TextEncryptor
-from .image_compressor import ImageCompressor
-from .url_shortener import URLShortener
-from .calculator import Calculator
-from .weather_checker import WeatherChecker
-from .text_diff import TextDiff 
\ No newline at end of file
+import importlib
+
+# 工具类名 -> 所在子模块，工具模块及其依赖（PIL、qrcode、requests等）在首次使用时才导入
+TOOL_MODULES = {
+    "HashCalculator": "hash_calculator",
+    "TimestampConverter": "timestamp_converter",
+    "Base64Converter": "base64_converter",
+    "JsonFormatter": "json_formatter",
+    "ClipboardTool": "clipboard_tool",
+    "QRCodeGenerator": "qr_code_generator",
+    "ColorPicker": "color_picker",
+    "FileRenamer": "file_renamer",
+    "TextEncryptor": "text_encryptor",
+    "ImageCompressor": "image_compressor",
+    "URLShortener": "url_shortener",
+    "Calculator": "calculator",
+    "WeatherChecker": "weather_checker",
+    "TextDiff": "text_diff",
+}
+
+__all__ = list(TOOL_MODULES)
+
+def load_tool_class(class_name):
+    """按类名导入工具模块并返回工具类"""
+    module_name = TOOL_MODULES.get(class_name)
+    if module_name is None:
+        raise AttributeError(f"未知的工具: {class_name}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    tool_class = getattr(module, class_name)
+    globals()[class_name] = tool_class
+    return tool_class
+
+def __getattr__(name):
+    # 兼容 from ui.tools import HashCalculator 的写法
+    if name in TOOL_MODULES:
+        return load_tool_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,6 +1,232 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QTextEdit, 
-                            QPushButton, QHBoxLayout)
+                            QPushButton, QHBoxLayout, QLabel,
+                            QProgressBar, QFileDialog, QMessageBox, QComboBox)
+from PyQt6.QtCore import QThread, pyqtSignal
 import base64
+import binascii
+import os
+import time
+
+# 支持的编码格式
+VARIANTS = {
+    "base64": "Base64",
+    "base64url": "Base64 URL安全",
+    "base64mime": "Base64 MIME（每行76字符）",
+    "base32": "Base32",
+    "base16": "Base16（十六进制）",
+    "ascii85": "Ascii85",
+    "base85": "Base85",
+}
+# 流式处理时的对齐单位：(编码时的字节数, 解码时的字符数)，按这个单位切块时各块可以独立编解码
+# Ascii85 用 z 表示全零的4字节，编码后的字符数不固定，无法按字符对齐流式解码
+VARIANT_BLOCKS = {
+    "base64": (3, 4),
+    "base64url": (3, 4),
+    "base64mime": (57, 4),  # 57字节正好是一行76个字符
+    "base32": (5, 8),
+    "base16": (1, 2),
+    "ascii85": (4, None),
+    "base85": (4, 5),
+}
+# 流式编码每次读取的字节数（会向下对齐到格式的编码单位），流式解码每次读取的字符数
+ENCODE_CHUNK_SIZE = 3 * 1024 * 1024
+DECODE_CHUNK_SIZE = 4 * 1024 * 1024
+# 编码数据中允许出现的空白字符（换行折行等）
+WHITESPACE = b" \t\r\n\v\f"
+# 十六进制预览最多显示的字节数
+HEX_DUMP_LIMIT = 64 * 1024
+
+def encode_bytes(data, variant="base64"):
+    """把字节编码为指定格式，返回ASCII字节"""
+    if variant == "base64":
+        return base64.b64encode(data)
+    if variant == "base64url":
+        return base64.urlsafe_b64encode(data)
+    if variant == "base64mime":
+        return base64.encodebytes(data)
+    if variant == "base32":
+        return base64.b32encode(data)
+    if variant == "base16":
+        return base64.b16encode(data)
+    if variant == "ascii85":
+        return base64.a85encode(data)
+    if variant == "base85":
+        return base64.b85encode(data)
+    raise ValueError(f"不支持的编码格式: {variant}")
+
+def decode_bytes(data, variant="base64", strict=False):
+    """解码指定格式的数据，忽略空白字符；非严格模式下缺少或多余的填充符也能解码
+    
+    data 可以是字符串或字节，数据无效时抛出 ValueError。
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"不支持的编码格式: {variant}")
+    if isinstance(data, str):
+        try:
+            data = data.encode("ascii")
+        except UnicodeEncodeError:
+            raise ValueError(f"不是有效的{VARIANTS[variant]}数据: 包含非ASCII字符")
+    data = data.translate(None, WHITESPACE)
+    try:
+        if variant in ("base64", "base64url", "base64mime"):
+            if not strict:
+                data = data.rstrip(b"=")
+                data += b"=" * (-len(data) % 4)
+            return base64.b64decode(data, altchars=b"-_" if variant == "base64url" else None, validate=True)
+        if variant == "base32":
+            if not strict:
+                data = data.rstrip(b"=")
+                data += b"=" * (-len(data) % 8)
+            return base64.b32decode(data, casefold=not strict)
+        if variant == "base16":
+            return base64.b16decode(data, casefold=not strict)
+        if variant == "ascii85":
+            # Adobe格式带有 <~ ~> 定界符
+            return base64.a85decode(data, adobe=data.startswith(b"<~"))
+        return base64.b85decode(data)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"不是有效的{VARIANTS[variant]}数据: {e}")
+
+def convert_many(items, variant="base64", decode=False, strict=False):
+    """批量编解码，单个输入出错不影响其他输入，返回 [(结果字节或None, 错误信息), ...]"""
+    results = []
+    for item in items:
+        try:
+            if decode:
+                results.append((decode_bytes(item, variant, strict), ""))
+            else:
+                results.append((encode_bytes(item.encode("utf-8") if isinstance(item, str) else item, variant), ""))
+        except ValueError as e:
+            results.append((None, str(e)))
+    return results
+
+def hex_dump(data, limit=HEX_DUMP_LIMIT):
+    """生成 hexdump -C 风格的十六进制预览"""
+    lines = []
+    for offset in range(0, min(len(data), limit), 16):
+        row = data[offset:offset + 16]
+        hex_part = " ".join(f"{byte:02x}" for byte in row)
+        text_part = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in row)
+        lines.append(f"{offset:08x}  {hex_part:<47}  |{text_part}|")
+    if len(data) > limit:
+        lines.append(f"... 共 {len(data)} 字节，仅显示前 {limit} 字节")
+    return "\n".join(lines)
+
+def describe_bytes(data):
+    """UTF-8文本直接返回文本，否则返回十六进制预览，返回 (显示内容, 是否为二进制)"""
+    try:
+        return data.decode("utf-8"), False
+    except UnicodeDecodeError:
+        return hex_dump(data), True
+
+def encode_file(source, target, variant="base64", chunk_size=ENCODE_CHUNK_SIZE,
+                progress_callback=None, is_cancelled=None):
+    """流式编码文件，内存占用与文件大小无关；取消时返回None，否则返回输出大小
+    
+    先写入临时文件，完成后再替换目标文件，取消或出错时不留下不完整的输出。
+    """
+    block = VARIANT_BLOCKS[variant][0]
+    chunk_size -= chunk_size % block
+    if not chunk_size:
+        raise ValueError(f"编码块大小必须至少为{block}字节")
+    return transform_file(source, target, chunk_size, lambda data: encode_bytes(data, variant), None,
+                          None, progress_callback, is_cancelled)
+
+def decode_file(source, target, variant="base64", chunk_size=DECODE_CHUNK_SIZE,
+                progress_callback=None, is_cancelled=None):
+    """流式解码文件，忽略换行等空白字符；取消时返回None，否则返回输出大小"""
+    block = VARIANT_BLOCKS[variant][1]
+    if block is None:
+        raise ValueError(f"{VARIANTS[variant]} 不支持流式解码")
+    decode = lambda data: decode_bytes(data, variant)
+    return transform_file(source, target, chunk_size, decode, decode, block, progress_callback, is_cancelled)
+
+def transform_file(source, target, chunk_size, transform, finish, block, progress_callback, is_cancelled):
+    """按块读取 source、转换后写入 target 的公共流程
+    
+    finish 为None时每块直接转换（编码）；否则先去掉空白，按 block 个字符对齐后转换，
+    不足 block 的部分留到下一次，最后交给 finish 处理（解码）。
+    """
+    total = os.path.getsize(source)
+    temp_path = f"{target}.part"
+    done = 0
+    written = 0
+    pending = b""
+    try:
+        with open(source, "rb") as src, open(temp_path, "wb") as dst:
+            while True:
+                if is_cancelled is not None and is_cancelled():
+                    dst.close()
+                    os.remove(temp_path)
+                    return None
+                # BufferedReader.read 只在文件末尾才会返回不足 chunk_size 的数据
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                done += len(chunk)
+                if finish is None:
+                    output = transform(chunk)
+                else:
+                    pending += chunk.translate(None, WHITESPACE)
+                    aligned = len(pending) - len(pending) % block
+                    output = transform(pending[:aligned])
+                    pending = pending[aligned:]
+                dst.write(output)
+                written += len(output)
+                if progress_callback is not None:
+                    progress_callback(done, total)
+            if finish is not None and pending:
+                output = finish(pending)
+                dst.write(output)
+                written += len(output)
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if progress_callback is not None:
+        progress_callback(total, total)
+    return written
+
+class Base64FileThread(QThread):
+    """线程用于在后台流式编解码文件"""
+    progress_signal = pyqtSignal(int, float)  # 进度(千分比), 速度(MB/s)
+    result_signal = pyqtSignal(str, int, int)  # 输出文件, 输入大小, 输出大小
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, mode, source, target, variant="base64"):
+        super().__init__()
+        self.mode = mode
+        self.variant = variant
+        self.source = source
+        self.target = target
+        self.cancel_requested = False
+        
+    def cancel(self):
+        self.cancel_requested = True
+        
+    def run(self):
+        start = time.perf_counter()
+        last_emit = 0.0
+        
+        def report(done, total):
+            nonlocal last_emit
+            now = time.perf_counter()
+            # 限制进度信号频率，避免刷屏拖慢界面
+            if now - last_emit < 0.1 and done < total:
+                return
+            last_emit = now
+            speed = done / (1024 * 1024) / max(now - start, 1e-6)
+            self.progress_signal.emit(int(done * 1000 / total) if total else 1000, speed)
+            
+        try:
+            function = encode_file if self.mode == "encode" else decode_file
+            written = function(self.source, self.target, self.variant, progress_callback=report,
+                               is_cancelled=lambda: self.cancel_requested)
+            if written is not None:
+                self.result_signal.emit(self.target, os.path.getsize(self.source), written)
+        except Exception as e:
+            self.error_signal.emit(str(e))
 
 class Base64Converter(QDialog):
     def __init__(self, parent=None):
@@ -8,6 +234,8 @@ class Base64Converter(QDialog):
         self.setWindowTitle("Base64编解码")
         self.setMinimumSize(500, 400)
         self.setModal(True)
+        self.file_thread = None
+        self.decoded_bytes = None
         self.init_ui()
         
     def init_ui(self):
@@ -21,6 +249,12 @@ class Base64Converter(QDialog):
         # 按钮区域
         btn_layout = QHBoxLayout()
         
+        # 编码格式
+        self.variant_combo = QComboBox()
+        for variant, label in VARIANTS.items():
+            self.variant_combo.addItem(label, variant)
+        btn_layout.addWidget(self.variant_combo)
+        
         # 编码按钮
         self.encode_btn = QPushButton("编码")
         self.encode_btn.clicked.connect(self.encode_text)
@@ -31,20 +265,150 @@ class Base64Converter(QDialog):
         self.decode_btn.clicked.connect(self.decode_text)
         btn_layout.addWidget(self.decode_btn)
         
+        # 解码结果不是文本时，可以把原始字节保存为文件
+        self.save_btn = QPushButton("保存解码结果...")
+        self.save_btn.clicked.connect(self.save_decoded)
+        self.save_btn.setEnabled(False)
+        btn_layout.addWidget(self.save_btn)
+        
         layout.addLayout(btn_layout)
         
+        self.info_label = QLabel("")
+        layout.addWidget(self.info_label)
+        
+        # 文件编解码按钮，支持任意二进制文件和大文件
+        file_btn_layout = QHBoxLayout()
+        
+        self.encode_file_btn = QPushButton("编码文件...")
+        self.encode_file_btn.clicked.connect(lambda: self.start_file_job("encode"))
+        file_btn_layout.addWidget(self.encode_file_btn)
+        
+        self.decode_file_btn = QPushButton("解码文件...")
+        self.decode_file_btn.clicked.connect(lambda: self.start_file_job("decode"))
+        file_btn_layout.addWidget(self.decode_file_btn)
+        
+        layout.addLayout(file_btn_layout)
+        
+        # 进度条和取消按钮
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setVisible(False)
+        progress_layout.addWidget(self.progress_bar)
+        
+        self.speed_label = QLabel("")
+        progress_layout.addWidget(self.speed_label)
+        
+        self.cancel_btn = QPushButton("取消")
+        self.cancel_btn.clicked.connect(self.cancel_file_job)
+        self.cancel_btn.setVisible(False)
+        progress_layout.addWidget(self.cancel_btn)
+        layout.addLayout(progress_layout)
+        
     def encode_text(self):
         text = self.text_edit.toPlainText()
         if text:
-            encoded = base64.b64encode(text.encode()).decode()
+            encoded = encode_bytes(text.encode("utf-8"), self.variant_combo.currentData()).decode("ascii")
             self.text_edit.setPlainText(encoded)
+            self.set_decoded_bytes(None)
             
     def decode_text(self):
         text = self.text_edit.toPlainText()
         if text:
             try:
-                decoded = base64.b64decode(text).decode()
-                self.text_edit.setPlainText(decoded)
+                decoded = decode_bytes(text, self.variant_combo.currentData())
+            except ValueError as e:
+                QMessageBox.warning(self, "解码错误", f"无法解码: {str(e)}")
+                return
+            display, is_binary = describe_bytes(decoded)
+            self.text_edit.setPlainText(display)
+            self.set_decoded_bytes(decoded if is_binary else None)
+            
+    def set_decoded_bytes(self, data):
+        """记录非文本的解码结果，供保存为文件"""
+        self.decoded_bytes = data
+        self.save_btn.setEnabled(data is not None)
+        if data is None:
+            self.info_label.setText("")
+        else:
+            self.info_label.setText(f"解码结果不是UTF-8文本（{len(data)} 字节），已显示十六进制预览")
+            
+    def save_decoded(self):
+        if self.decoded_bytes is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "保存解码结果", "decoded.bin")
+        if file_path:
+            try:
+                with open(file_path, "wb") as f:
+                    f.write(self.decoded_bytes)
+                QMessageBox.information(self, "成功", f"已保存到: {file_path}")
             except Exception as e:
-                from PyQt6.QtWidgets import QMessageBox
-                QMessageBox.warning(self, "解码错误", f"无法解码: {str(e)}") 
\ No newline at end of file
+                QMessageBox.critical(self, "错误", f"保存文件时出错: {str(e)}")
+                
+    def start_file_job(self, mode):
+        variant = self.variant_combo.currentData()
+        if mode == "decode" and VARIANT_BLOCKS[variant][1] is None:
+            QMessageBox.warning(self, "警告", f"{VARIANTS[variant]} 不支持文件解码，请在文本框中解码")
+            return
+        title = "选择要编码的文件" if mode == "encode" else f"选择要解码的{VARIANTS[variant]}文件"
+        source, _ = QFileDialog.getOpenFileName(self, title)
+        if not source:
+            return
+            
+        # 编码默认追加 .b64 等扩展名，解码默认去掉
+        suffix = ".b64" if variant.startswith("base64") else f".{variant}"
+        if mode == "encode":
+            default_target = source + suffix
+        else:
+            root, ext = os.path.splitext(source)
+            default_target = root if ext.lower() in (suffix, ".base64") else source + ".bin"
+        target, _ = QFileDialog.getSaveFileName(self, "保存结果", default_target)
+        if not target:
+            return
+        if os.path.abspath(target) == os.path.abspath(source):
+            QMessageBox.warning(self, "警告", "输出文件不能与输入文件相同")
+            return
+            
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.speed_label.setText("")
+        self.cancel_btn.setVisible(True)
+        self.encode_file_btn.setEnabled(False)
+        self.decode_file_btn.setEnabled(False)
+        
+        self.file_thread = Base64FileThread(mode, source, target, variant)
+        self.file_thread.progress_signal.connect(self.update_progress)
+        self.file_thread.result_signal.connect(self.show_file_result)
+        self.file_thread.error_signal.connect(
+            lambda message: QMessageBox.critical(self, "错误", f"处理文件时出错: {message}"))
+        self.file_thread.finished.connect(self.file_job_finished)
+        self.file_thread.start()
+        
+    def update_progress(self, permille, speed):
+        self.progress_bar.setValue(permille)
+        self.speed_label.setText(f"{speed:.1f} MB/s")
+        
+    def show_file_result(self, target, input_size, output_size):
+        QMessageBox.information(self, "完成", f"已保存到: {target}\n"
+                                f"输入大小: {input_size / 1024:.2f} KB\n"
+                                f"输出大小: {output_size / 1024:.2f} KB")
+                                
+    def cancel_file_job(self):
+        """取消处理，界面立即恢复，后台线程在当前块结束后删除临时文件并退出"""
+        if self.file_thread is None:
+            return
+        self.file_thread.cancel()
+        self.file_thread.result_signal.disconnect()
+        self.file_thread.progress_signal.disconnect()
+        self.progress_bar.setVisible(False)
+        self.speed_label.setText("")
+        self.cancel_btn.setVisible(False)
+        
+    def file_job_finished(self):
+        self.file_thread.wait()
+        self.file_thread = None
+        self.progress_bar.setVisible(False)
+        self.speed_label.setText("")
+        self.cancel_btn.setVisible(False)
+        self.encode_file_btn.setEnabled(True)
+        self.decode_file_btn.setEnabled(True)
@@ -1,8 +1,813 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, 
                             QLabel, QLineEdit, QPushButton, 
-                            QFileDialog, QListWidget, QMessageBox)
-from PyQt6.QtGui import QFont
+                            QFileDialog, QListView, QMessageBox, 
+                            QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox,
+                            QSpinBox, QProgressBar)
+from PyQt6.QtGui import QFont, QColor
+from PyQt6.QtCore import Qt, QSettings, QThread, QAbstractListModel, QModelIndex, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+import errno
+import fnmatch
+import json
 import os
+import re
+import threading
+import time
+import uuid
+try:
+    import fcntl
+except ImportError:
+    # Windows 上没有 fcntl，使用 msvcrt 加锁
+    fcntl = None
+    import msvcrt
+
+# 预览表格最多显示的行数，冲突总是排在最前面
+PREVIEW_LIMIT = 2000
+# Windows文件名中不允许出现的字符
+INVALID_NAME_CHARS = set('<>:"|?*') if os.name == "nt" else set()
+# 重命名日志每写入多少步调用一次fsync
+JOURNAL_SYNC_INTERVAL = 1000
+# 重命名日志中最多保留的已完成批次数，更早的批次在整理日志时删除
+JOURNAL_KEEP_BATCHES = 10
+# 循环和链式重命名使用的临时文件名前缀
+TEMP_PREFIX = ".~rename-"
+# 规则中的占位符：{{ }} 为转义的花括号，{...} 为占位符
+TOKEN_PATTERN = re.compile(r"\{\{|\}\}|\{([^{}]*)\}")
+# 日期占位符的默认格式
+DEFAULT_DATE_FORMAT = "%Y-%m-%d"
+# 读取EXIF拍摄日期的线程数和缓存条数
+EXIF_WORKERS = 8
+EXIF_CACHE_SIZE = 100000
+# 扫描文件夹时每找到多少个文件报告一次进度
+SCAN_PROGRESS_INTERVAL = 5000
+# 并行重命名的默认线程数，以及每个任务包含的同目录重命名数量
+DEFAULT_RENAME_WORKERS = 8
+RENAME_GROUP_SIZE = 200
+# 网络文件系统上可以重试的临时错误，以及每次重试前的等待秒数
+TRANSIENT_ERRNOS = {code for code in (errno.EAGAIN, errno.EBUSY, errno.EINTR, errno.EIO, errno.ETIMEDOUT,
+                                      errno.ECONNRESET, getattr(errno, "ESTALE", None)) if code is not None}
+TRANSIENT_WINERRORS = {32, 33, 53, 64, 121}  # 共享冲突、锁冲突、网络路径不可用、网络名称已删除、信号灯超时
+RETRY_DELAYS = (0.1, 0.5, 2.0)
+
+def compile_globs(patterns):
+    """把用分号或空格分隔的通配符编译成一个正则，没有通配符时返回None"""
+    globs = [glob for glob in re.split(r"[;\s]+", patterns) if glob]
+    if not globs:
+        return None
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile("|".join(fnmatch.translate(glob) for glob in globs), flags)
+
+def scan_folder(root, recursive=True, include="", exclude="", is_cancelled=None, progress_callback=None):
+    """用scandir遍历文件夹，返回按目录深度优先、目录内按名称排序的文件路径列表
+    
+    include 只匹配文件名；exclude 同时匹配文件名和子文件夹名，被排除的文件夹整个跳过。
+    不跟随符号链接进入文件夹，避免循环。取消时返回None。
+    """
+    include_regex = compile_globs(include)
+    exclude_regex = compile_globs(exclude)
+    files = []
+    stack = [root]
+    while stack:
+        if is_cancelled is not None and is_cancelled():
+            return None
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if exclude_regex is not None and exclude_regex.match(name):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        subdirs.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            # 跳过中断的重命名留下的临时文件
+            if name.startswith(TEMP_PREFIX):
+                continue
+            if include_regex is None or include_regex.match(name):
+                files.append(entry.path)
+                if progress_callback is not None and len(files) % SCAN_PROGRESS_INTERVAL == 0:
+                    progress_callback(len(files))
+        stack.extend(reversed(subdirs))
+    return files
+
+def format_size(size, unit):
+    """{size} 为字节数，{size:kb} {size:mb} 取整，{size:h} 为带单位的可读格式"""
+    if unit == "":
+        return str(size)
+    if unit == "kb":
+        return str(round(size / 1024))
+    if unit == "mb":
+        return str(round(size / 1024 / 1024))
+    for suffix in ("B", "KB", "MB", "GB"):
+        if size < 1024 or suffix == "GB":
+            return f"{size:.0f}{suffix}" if suffix == "B" else f"{size:.1f}{suffix}"
+        size /= 1024
+
+def compile_token(token, groups):
+    """把单个占位符编译为函数 part(stem, ext, match, number, metadata) -> str"""
+    name, _, spec = token.partition(":")
+    if name == "name":
+        return lambda stem, ext, match, number, metadata: stem
+    if name == "ext":
+        return lambda stem, ext, match, number, metadata: ext
+    if name == "index":
+        # {index:宽度:起始值:步长}，宽度大于0时补零
+        fields = spec.split(":") if spec else []
+        if len(fields) > 3 or not all(field.lstrip("-").isdigit() for field in fields if field):
+            raise ValueError(f"序号格式无效: {{{token}}}")
+        fields += [""] * (3 - len(fields))
+        width = int(fields[0] or 0)
+        start = int(fields[1] or 1)
+        step = int(fields[2] or 1)
+        return lambda stem, ext, match, number, metadata: str(start + (number - 1) * step).zfill(width)
+    if name in ("mtime", "exif"):
+        # 没有EXIF拍摄日期的文件使用修改时间
+        date_format = spec or DEFAULT_DATE_FORMAT
+        key = "taken" if name == "exif" else "mtime"
+        return lambda stem, ext, match, number, metadata: \
+            (metadata.get(key) or metadata["mtime"]).strftime(date_format)
+    if name == "size":
+        unit = spec.lower()
+        if unit not in ("", "kb", "mb", "h"):
+            raise ValueError(f"大小单位无效: {{{token}}}")
+        return lambda stem, ext, match, number, metadata: format_size(metadata["size"], unit)
+    if token.isdigit() or (token.startswith("<") and token.endswith(">")):
+        group = int(token) if token.isdigit() else token[1:-1]
+        if groups is None:
+            raise ValueError(f"使用分组占位符 {{{token}}} 需要填写匹配正则")
+        if group not in groups:
+            raise ValueError(f"正则中没有分组 {{{token}}}")
+        return lambda stem, ext, match, number, metadata: match.group(group) or ""
+    raise ValueError(f"未知的占位符: {{{token}}}")
+
+class RenameRule:
+    """编译后的重命名规则，模板和正则只解析一次，之后对每个文件只做拼接
+    
+    支持的占位符：{name} {ext} {index[:宽度[:起始[:步长]]]} {mtime[:格式]} {exif[:格式]}
+    {size[:kb|mb|h]}，以及匹配正则的分组 {1} {<名称>}；{{ 和 }} 表示花括号本身。
+    """
+    
+    def __init__(self, template, pattern=""):
+        try:
+            self.regex = re.compile(pattern) if pattern else None
+        except re.error as e:
+            raise ValueError(f"正则表达式无效: {e}")
+        groups = None
+        if self.regex is not None:
+            groups = set(range(self.regex.groups + 1)) | set(self.regex.groupindex)
+        self.parts = []
+        self.needs_metadata = False
+        self.needs_exif = False
+        position = 0
+        for token in TOKEN_PATTERN.finditer(template):
+            self.add_literal(template[position:token.start()])
+            position = token.end()
+            if token.group(1) is None:
+                self.add_literal(token.group(0)[0])
+                continue
+            name = token.group(1).partition(":")[0]
+            self.needs_metadata |= name in ("mtime", "exif", "size")
+            self.needs_exif |= name == "exif"
+            self.parts.append(compile_token(token.group(1), groups))
+        self.add_literal(template[position:])
+        
+    def add_literal(self, text):
+        if text:
+            self.parts.append(lambda stem, ext, match, number, metadata: text)
+            
+    def match(self, stem):
+        """没有填写正则时所有文件都匹配；填写了正则但不匹配时返回None"""
+        if self.regex is None:
+            return True
+        return self.regex.search(stem)
+        
+    def apply(self, filename, match, number, metadata=None):
+        """生成新文件名，number 为匹配文件的序号（从1开始）"""
+        stem, ext = os.path.splitext(filename)
+        new_name = "".join(part(stem, ext, match, number, metadata) for part in self.parts)
+        
+        # 确保有扩展名
+        if not new_name.endswith(ext):
+            new_name += ext
+        return new_name
+
+@lru_cache(maxsize=EXIF_CACHE_SIZE)
+def read_exif_date(path, size, mtime_ns):
+    """读取EXIF拍摄日期，按 (路径, 大小, 修改时间) 缓存，文件修改后自动重新读取"""
+    # 只有规则用到EXIF日期时才加载Pillow
+    from PIL import Image
+    try:
+        with Image.open(path) as img:
+            exif = img.getexif()
+            value = exif.get_ifd(0x8769).get(0x9003) or exif.get(0x0132)
+        return datetime.strptime(value.strip("\0 "), "%Y:%m:%d %H:%M:%S") if value else None
+    except Exception:
+        return None
+
+def read_metadata(files, with_exif=False):
+    """批量读取文件大小、修改时间和EXIF拍摄日期，返回 {路径: {"size", "mtime", "taken"}}
+    
+    同一目录只scandir一次；EXIF只读文件头，在线程池中并行读取。
+    """
+    by_directory = {}
+    for file_path in files:
+        directory, filename = os.path.split(file_path)
+        by_directory.setdefault(directory, {})[filename] = file_path
+    metadata = {}
+    stats = {}
+    for directory, wanted in by_directory.items():
+        try:
+            with os.scandir(directory or ".") as entries:
+                for entry in entries:
+                    file_path = wanted.get(entry.name)
+                    if file_path is not None:
+                        stat_result = entry.stat()
+                        stats[file_path] = stat_result
+                        metadata[file_path] = {"size": stat_result.st_size,
+                                               "mtime": datetime.fromtimestamp(stat_result.st_mtime),
+                                               "taken": None}
+        except OSError:
+            continue
+    if with_exif and stats:
+        paths = list(stats)
+        with ThreadPoolExecutor(max_workers=EXIF_WORKERS) as executor:
+            dates = executor.map(lambda path: read_exif_date(path, stats[path].st_size, stats[path].st_mtime_ns),
+                                 paths)
+            for file_path, taken in zip(paths, dates):
+                metadata[file_path]["taken"] = taken
+    return metadata
+
+def invalid_name_reason(name):
+    """检查新文件名是否合法，合法时返回空字符串"""
+    if not name.strip() or name in (".", ".."):
+        return "文件名为空"
+    if os.sep in name or (os.altsep and os.altsep in name):
+        return "文件名包含路径分隔符"
+    if INVALID_NAME_CHARS.intersection(name):
+        return "文件名包含非法字符"
+    return ""
+
+def plan_renames(files, rule):
+    """在内存中生成完整的重命名计划，不改动任何文件
+    
+    rule 为 RenameRule，不匹配其正则的文件保持原名，也不占用序号。
+    返回 (moves, conflicts)：moves 为 [(原路径, 新路径), ...]，已去掉名称不变的文件；
+    conflicts 为 [(原路径, 新路径, 原因), ...]，非空时整个计划都不能执行。
+    所有检查都基于哈希集合，十万级文件也只需线性时间。
+    """
+    moves = []
+    conflicts = []
+    metadata = read_metadata(files, rule.needs_exif) if rule.needs_metadata else {}
+    number = 0
+    for file_path in files:
+        directory, filename = os.path.split(file_path)
+        match = rule.match(os.path.splitext(filename)[0])
+        if match is None:
+            continue
+        if rule.needs_metadata and file_path not in metadata:
+            conflicts.append((file_path, file_path, "无法读取文件信息"))
+            continue
+        number += 1
+        new_name = rule.apply(filename, match, number, metadata.get(file_path))
+        new_path = os.path.join(directory, new_name)
+        reason = invalid_name_reason(new_name)
+        if reason:
+            conflicts.append((file_path, new_path, reason))
+        elif new_path != file_path:
+            moves.append((file_path, new_path))
+            
+    # 参与重命名的源文件会被移走，它们原来的名字可以被其他文件使用
+    sources = {os.path.normcase(old_path) for old_path, _ in moves}
+    targets = {}
+    existing = {}
+    for old_path, new_path in moves:
+        key = os.path.normcase(new_path)
+        if key in targets:
+            conflicts.append((old_path, new_path, f"与 {os.path.basename(targets[key])} 重名"))
+            continue
+        targets[key] = old_path
+        # 每个目录只列一次，避免逐个文件调用exists
+        directory = os.path.dirname(key)
+        if directory not in existing:
+            try:
+                existing[directory] = {os.path.normcase(name) for name in os.listdir(directory or ".")}
+            except OSError:
+                existing[directory] = set()
+        if os.path.basename(key) in existing[directory] and key not in sources:
+            conflicts.append((old_path, new_path, "目标文件已存在"))
+    return moves, conflicts
+
+def find_cycles(moves):
+    """找出重命名计划中的循环（如 a→b, b→a），返回每个循环涉及的原路径列表"""
+    next_path = {os.path.normcase(old_path): os.path.normcase(new_path) for old_path, new_path in moves}
+    original = {os.path.normcase(old_path): old_path for old_path, _ in moves}
+    cycles = []
+    visited = set()
+    for start in next_path:
+        if start in visited:
+            continue
+        # 沿着 原路径→新路径 链前进，回到本轮走过的节点即为循环
+        chain = []
+        on_chain = set()
+        node = start
+        while node in next_path and node not in visited:
+            visited.add(node)
+            on_chain.add(node)
+            chain.append(node)
+            node = next_path[node]
+        if node in on_chain:
+            cycles.append([original[path] for path in chain[chain.index(node):]])
+    return cycles
+
+def plan_steps(moves):
+    """把重命名计划展开为按顺序执行的单步重命名 [(当前路径, 新路径), ...]
+    
+    名字被其他文件占用的源文件先移到临时名，使循环和链式重命名都能完成；
+    其余文件直接改为新名字，不多做一次系统调用。
+    """
+    targets = {os.path.normcase(new_path) for _, new_path in moves}
+    token = uuid.uuid4().hex[:8]
+    staging = []
+    finals = []
+    for index, (old_path, new_path) in enumerate(moves):
+        if os.path.normcase(old_path) in targets:
+            temp_path = os.path.join(os.path.dirname(old_path), f"{TEMP_PREFIX}{token}-{index}")
+            staging.append((old_path, temp_path))
+            finals.append((temp_path, new_path))
+        else:
+            finals.append((old_path, new_path))
+    return staging + finals
+
+def execute_steps(steps, before_chunk=None, chunk_size=JOURNAL_SYNC_INTERVAL, progress_callback=None):
+    """按顺序执行单步重命名，任何一步失败都会撤销已完成的步骤后重新抛出异常
+    
+    before_chunk 在每组 chunk_size 个步骤执行前调用，用于先写日志再改文件。
+    """
+    done = []
+    try:
+        for start in range(0, len(steps), chunk_size):
+            chunk = steps[start:start + chunk_size]
+            if before_chunk is not None:
+                before_chunk(chunk)
+            for current_path, new_path in chunk:
+                os.rename(current_path, new_path)
+                done.append((current_path, new_path))
+            if progress_callback is not None:
+                progress_callback(len(done), len(steps))
+    except OSError:
+        revert_steps(done)
+        raise
+    return len(done)
+
+def is_transient_error(error):
+    if getattr(error, "winerror", None) in TRANSIENT_WINERRORS:
+        return True
+    return error.errno in TRANSIENT_ERRNOS
+
+def rename_with_retry(current_path, new_path, retry_delays=RETRY_DELAYS):
+    """遇到临时错误时等待后重试的os.rename"""
+    attempt = 0
+    while True:
+        try:
+            os.rename(current_path, new_path)
+            return
+        except OSError as e:
+            # NFS上服务器可能已完成重命名但响应丢失，重试时会报文件不存在
+            if attempt and not os.path.lexists(current_path) and os.path.lexists(new_path):
+                return
+            if attempt >= len(retry_delays) or not is_transient_error(e):
+                raise
+            time.sleep(retry_delays[attempt])
+            attempt += 1
+
+def split_phases(steps):
+    """plan_steps 的结果分为移到临时名和改为新名两个阶段，同一阶段内的步骤互不依赖"""
+    staging = [step for step in steps if os.path.basename(step[1]).startswith(TEMP_PREFIX)]
+    finals = [step for step in steps if not os.path.basename(step[1]).startswith(TEMP_PREFIX)]
+    return [phase for phase in (staging, finals) if phase]
+
+def group_by_directory(steps, group_size=RENAME_GROUP_SIZE):
+    """按所在目录分组，大目录再切成 group_size 大小的任务"""
+    groups = {}
+    for step in steps:
+        groups.setdefault(os.path.dirname(step[0]), []).append(step)
+    return [group[start:start + group_size]
+            for group in groups.values() for start in range(0, len(group), group_size)]
+
+def execute_steps_parallel(steps, max_workers=DEFAULT_RENAME_WORKERS, before_chunk=None,
+                           chunk_size=JOURNAL_SYNC_INTERVAL, progress_callback=None):
+    """在线程池中并行执行单步重命名，用于每次重命名都要等待网络往返的NFS/SMB共享
+    
+    两个阶段之间等待全部完成，阶段内按目录分组并行，最终结果与 execute_steps 相同。
+    任何一步失败都会等待进行中的任务结束，撤销已完成的步骤后重新抛出异常。
+    """
+    done = []
+    lock = threading.Lock()
+    failed = threading.Event()
+    
+    def run_group(group):
+        for current_path, new_path in group:
+            if failed.is_set():
+                return
+            rename_with_retry(current_path, new_path)
+            with lock:
+                done.append((current_path, new_path))
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for phase in split_phases(steps):
+                if before_chunk is not None:
+                    for start in range(0, len(phase), chunk_size):
+                        before_chunk(phase[start:start + chunk_size])
+                futures = [executor.submit(run_group, group) for group in group_by_directory(phase)]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except OSError:
+                        failed.set()
+                        raise
+                    if progress_callback is not None:
+                        progress_callback(len(done), len(steps))
+    except OSError:
+        # 退出线程池时已等待所有任务结束，done 按完成顺序记录，倒序撤销即可
+        revert_steps(done)
+        raise
+    return len(done)
+
+def revert_steps(steps):
+    """倒序撤销单步重命名，返回 (恢复原名的文件数, 跳过数量)
+    
+    只有新路径存在且原路径空闲时才改回去，因此对未执行、已撤销的步骤重复调用不会产生任何改动。
+    """
+    reverted = 0
+    skipped = 0
+    for old_path, new_path in reversed(steps):
+        if not os.path.lexists(new_path):
+            continue
+        if os.path.lexists(old_path):
+            # 原路径又被其他文件占用，不能覆盖
+            skipped += 1
+            continue
+        try:
+            os.rename(new_path, old_path)
+            # 改回临时名只是中间步骤，每个文件只在恢复原名时计数一次
+            if not os.path.basename(old_path).startswith(TEMP_PREFIX):
+                reverted += 1
+        except OSError:
+            skipped += 1
+    return reverted, skipped
+
+def default_journal_path():
+    """日志文件放在与QSettings配置文件相同的目录下"""
+    settings = QSettings(QSettings.Format.IniFormat, QSettings.Scope.UserScope, "ToolsApp", "RenameJournal")
+    return os.path.join(os.path.dirname(settings.fileName()), "rename_journal.jsonl")
+
+class FileLock:
+    """基于锁文件的进程间互斥锁，持有锁的进程退出（包括崩溃）时由操作系统自动释放"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        
+    def acquire(self, blocking=True):
+        """加锁；blocking 为 False 时锁已被占用则返回 False"""
+        f = open(self.path, "a+b")
+        try:
+            f.seek(0)
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            else:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except OSError:
+            f.close()
+            if blocking:
+                raise
+            return False
+        self.file = f
+        return True
+        
+    def release(self, remove=False):
+        """解锁；remove 为 True 时同时删除锁文件，只用于不会再被使用的锁"""
+        if self.file is None:
+            return
+        if remove:
+            try:
+                os.remove(self.path)  # Windows 上文件打开时无法删除，关闭后再试
+            except OSError:
+                pass
+        if fcntl is None:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.file.close()
+        self.file = None
+        if remove and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+                
+    def __enter__(self):
+        self.acquire()
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.release()
+
+class RenameJournal:
+    """只追加的JSON行重命名日志，记录每批重命名的每一步，支持撤销和崩溃恢复
+    
+    每批依次写入 begin、若干 step 和 commit/abort 记录；step 记录在对应的重命名执行之前写入，
+    每 sync_interval 步才调用一次fsync。撤销时先写 undo 再写 undone，中途崩溃可重新执行。
+    
+    日志由所有窗口和进程共用：追加和整理时持有日志锁；执行或撤销一个批次期间持有该批次的锁，
+    恢复时只处理锁未被占用（持有者已退出）的批次。已完成的批次只保留最近 keep_batches 个。
+    """
+    
+    def __init__(self, path=None, sync_interval=JOURNAL_SYNC_INTERVAL, keep_batches=JOURNAL_KEEP_BATCHES):
+        self.path = path or default_journal_path()
+        self.sync_interval = sync_interval
+        self.keep_batches = keep_batches
+        
+    def journal_lock(self):
+        return FileLock(f"{self.path}.lock")
+        
+    def batch_lock(self, batch):
+        return FileLock(f"{self.path}.{batch}.lock")
+        
+    def append(self, records):
+        """追加记录并fsync，上次崩溃留下的半行会先补上换行，不影响新记录"""
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self.journal_lock(), open(self.path, "a+b") as f:
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            
+    def records(self):
+        """逐行读取日志，产出 (原始行, 记录)，跳过崩溃时写了一半的行"""
+        try:
+            f = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and "batch" in record and "type" in record:
+                    yield line, record
+                
+    def batches(self):
+        """读取日志，返回按开始顺序排列的批次 [{"batch", "time", "steps", "status"}, ...]
+        
+        status 为 open（未完成）、committed、aborted、undoing（撤销未完成）或 undone。
+        """
+        batches = {}
+        for _, record in self.records():
+            batch = record["batch"]
+            kind = record["type"]
+            if kind == "begin":
+                batches[batch] = {"batch": batch, "time": record.get("time", 0), "steps": [], "status": "open"}
+            elif batch not in batches:
+                continue
+            elif kind == "step":
+                batches[batch]["steps"].append((record["src"], record["dst"]))
+            elif kind == "commit":
+                batches[batch]["status"] = "committed"
+            elif kind == "abort":
+                batches[batch]["status"] = "aborted"
+            elif kind == "undo":
+                batches[batch]["status"] = "undoing"
+            elif kind == "undone":
+                batches[batch]["status"] = "undone"
+        return list(batches.values())
+        
+    def run(self, steps, max_workers=1, progress_callback=None):
+        """先写日志再执行重命名，失败时撤销并记录 abort 后重新抛出异常，返回批次ID
+        
+        max_workers 大于1时并行执行，日志中步骤的顺序不变，恢复和撤销的方式相同。
+        """
+        batch = uuid.uuid4().hex
+        # 先加批次锁再写 begin，其他窗口恢复时不会把正在执行的批次当作崩溃遗留
+        lock = self.batch_lock(batch)
+        lock.acquire()
+        try:
+            self.append([{"type": "begin", "batch": batch, "time": time.time(), "count": len(steps)}])
+            
+            def log_chunk(chunk):
+                self.append([{"type": "step", "batch": batch, "src": current_path, "dst": new_path}
+                             for current_path, new_path in chunk])
+            
+            try:
+                if max_workers > 1:
+                    execute_steps_parallel(steps, max_workers, before_chunk=log_chunk, chunk_size=self.sync_interval,
+                                           progress_callback=progress_callback)
+                else:
+                    execute_steps(steps, before_chunk=log_chunk, chunk_size=self.sync_interval,
+                                  progress_callback=progress_callback)
+            except OSError:
+                self.append([{"type": "abort", "batch": batch}])
+                raise
+            self.append([{"type": "commit", "batch": batch}])
+        finally:
+            lock.release(remove=True)
+            self.compact()
+        return batch
+        
+    def find_batch(self, batch_id):
+        for batch in self.batches():
+            if batch["batch"] == batch_id:
+                return batch
+        return None
+        
+    def undo(self, batch):
+        """撤销一个已完成的批次，返回 (撤销数量, 跳过数量)"""
+        lock = self.batch_lock(batch["batch"])
+        if not lock.acquire(blocking=False):
+            raise ValueError("该批次正在被另一个窗口处理，请稍后再试")
+        try:
+            # 取得锁后重新读取状态，另一个窗口可能已经撤销了这个批次
+            current = self.find_batch(batch["batch"])
+            if current is None or current["status"] != "committed":
+                raise ValueError("该批次已被撤销或已从日志中移除")
+            result = self.revert(current)
+        finally:
+            lock.release(remove=True)
+        self.compact()
+        return result
+        
+    def revert(self, batch):
+        """撤销批次并记录 undo/undone，调用方需持有批次锁"""
+        self.append([{"type": "undo", "batch": batch["batch"]}])
+        result = revert_steps(batch["steps"])
+        self.append([{"type": "undone", "batch": batch["batch"]}])
+        return result
+        
+    def last_batch(self):
+        """最近一个已完成且未撤销的批次，没有时返回None"""
+        for batch in reversed(self.batches()):
+            if batch["status"] == "committed":
+                return batch
+        return None
+        
+    def recover(self):
+        """撤销崩溃时未完成的批次、完成中断的撤销，返回恢复的文件数量；可重复调用
+        
+        批次锁仍被占用说明另一个窗口或进程正在执行或撤销该批次，这样的批次保持不动。
+        """
+        recovered = 0
+        for batch in self.batches():
+            if batch["status"] not in ("open", "undoing"):
+                continue
+            lock = self.batch_lock(batch["batch"])
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                # 持有者可能在释放锁之前刚写完 commit，取得锁后要重新读取状态
+                current = self.find_batch(batch["batch"])
+                if current is None:
+                    continue
+                if current["status"] == "open":
+                    recovered += revert_steps(current["steps"])[0]
+                    self.append([{"type": "abort", "batch": current["batch"]}])
+                elif current["status"] == "undoing":
+                    recovered += self.revert(current)[0]
+            finally:
+                lock.release(remove=True)
+        self.compact()
+        return recovered
+        
+    def compact(self):
+        """整理日志：删除已中止和已撤销的批次，已完成的批次只保留最近 keep_batches 个
+        
+        未完成的批次（可能属于其他窗口）总是保留。整理期间持有日志锁，其他进程的追加会等待。
+        整理失败（例如 Windows 上日志正被其他进程读取）不影响日志内容，下次再整理。
+        """
+        with self.journal_lock():
+            statuses = {}
+            for _, record in self.records():
+                kind = record["type"]
+                if kind == "begin":
+                    statuses[record["batch"]] = "open"
+                elif kind in ("commit", "abort", "undo", "undone") and record["batch"] in statuses:
+                    statuses[record["batch"]] = {"commit": "committed", "abort": "aborted",
+                                                 "undo": "undoing", "undone": "undone"}[kind]
+            committed = [batch for batch, status in statuses.items() if status == "committed"]
+            keep = {batch for batch, status in statuses.items() if status in ("open", "undoing")}
+            keep.update(committed[-self.keep_batches:] if self.keep_batches else [])
+            if len(keep) == len(statuses):
+                return
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8", newline="") as f:
+                    for line, record in self.records():
+                        if record["batch"] in keep:
+                            f.write(line if line.endswith("\n") else line + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+class FileListModel(QAbstractListModel):
+    """只保存路径列表的虚拟列表模型，显示时才生成文字，几十万个文件也不占用大量内存"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.files = []
+        self.root = ""
+        
+    def set_files(self, files, root=""):
+        """root 非空时显示相对于 root 的路径，否则只显示文件名"""
+        self.beginResetModel()
+        self.files = files
+        self.root = root
+        self.endResetModel()
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.files)
+        
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        file_path = self.files[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if self.root:
+                return os.path.relpath(file_path, self.root)
+            return os.path.basename(file_path)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return file_path
+        return None
+
+class ScanThread(QThread):
+    """线程用于在后台扫描文件夹"""
+    progress_signal = pyqtSignal(int)
+    result_signal = pyqtSignal(list)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, root, recursive, include, exclude):
+        super().__init__()
+        self.root = root
+        self.recursive = recursive
+        self.include = include
+        self.exclude = exclude
+        self.cancel_requested = False
+        
+    def cancel(self):
+        self.cancel_requested = True
+        
+    def run(self):
+        try:
+            files = scan_folder(self.root, self.recursive, self.include, self.exclude,
+                                is_cancelled=lambda: self.cancel_requested,
+                                progress_callback=self.progress_signal.emit)
+            if files is not None:
+                self.result_signal.emit(files)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+class RenameThread(QThread):
+    """线程用于执行重命名计划，避免大量重命名阻塞界面"""
+    progress_signal = pyqtSignal(int, int)  # 已完成步骤数, 总步骤数
+    result_signal = pyqtSignal(int)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, moves, journal=None, max_workers=1):
+        super().__init__()
+        self.moves = moves
+        self.journal = journal
+        self.max_workers = max_workers
+        
+    def run(self):
+        try:
+            steps = plan_steps(self.moves)
+            if self.journal is not None:
+                self.journal.run(steps, self.max_workers, progress_callback=self.progress_signal.emit)
+            elif self.max_workers > 1:
+                execute_steps_parallel(steps, self.max_workers, progress_callback=self.progress_signal.emit)
+            else:
+                execute_steps(steps, progress_callback=self.progress_signal.emit)
+            self.result_signal.emit(len(self.moves))
+        except Exception as e:
+            self.error_signal.emit(str(e))
 
 class FileRenamer(QDialog):
     def __init__(self, parent=None):
@@ -11,20 +816,61 @@ class FileRenamer(QDialog):
         self.setMinimumSize(600, 500)
         self.setModal(True)
         self.selected_files = []
+        self.journal = None
+        self.journal_checked = False
+        self.scan_root = ""
+        self.scan_thread = None
+        # 已取消但尚未结束的扫描线程，结束前需要保持引用
+        self.scan_threads = []
+        self.rename_thread = None
+        self.settings = QSettings("FileRenamer", "Execution")
         self.init_ui()
         
     def init_ui(self):
         layout = QVBoxLayout(self)
         
-        # 选择文件按钮
+        # 选择文件和文件夹按钮
+        select_layout = QHBoxLayout()
         select_btn = QPushButton("选择文件")
         select_btn.clicked.connect(self.select_files)
-        layout.addWidget(select_btn)
+        select_layout.addWidget(select_btn)
         
-        # 选择的文件列表
-        self.file_list = QListWidget()
+        select_folder_btn = QPushButton("选择文件夹")
+        select_folder_btn.clicked.connect(self.select_folder)
+        select_layout.addWidget(select_folder_btn)
+        
+        self.recursive_check = QCheckBox("包含子文件夹")
+        self.recursive_check.setChecked(True)
+        self.recursive_check.toggled.connect(self.rescan_folder)
+        select_layout.addWidget(self.recursive_check)
+        layout.addLayout(select_layout)
+        
+        # 文件夹模式的过滤条件
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("包含:"))
+        self.include_input = QLineEdit()
+        self.include_input.setPlaceholderText("如 *.jpg;*.png，留空为全部")
+        self.include_input.editingFinished.connect(self.rescan_folder)
+        filter_layout.addWidget(self.include_input)
+        
+        filter_layout.addWidget(QLabel("排除:"))
+        self.exclude_input = QLineEdit()
+        self.exclude_input.setPlaceholderText("如 .git;*.tmp，也用于排除子文件夹")
+        self.exclude_input.editingFinished.connect(self.rescan_folder)
+        filter_layout.addWidget(self.exclude_input)
+        layout.addLayout(filter_layout)
+        
+        # 选择的文件列表，使用模型/视图只绘制可见的行
+        self.file_model = FileListModel(self)
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.setLayoutMode(QListView.LayoutMode.Batched)
         layout.addWidget(self.file_list)
         
+        self.file_count_label = QLabel("")
+        layout.addWidget(self.file_count_label)
+        
         # 重命名规则
         rule_layout = QHBoxLayout()
         
@@ -39,10 +885,64 @@ class FileRenamer(QDialog):
         
         layout.addLayout(rule_layout)
         
-        # 重命名按钮
-        rename_btn = QPushButton("重命名")
-        rename_btn.clicked.connect(self.rename_files)
-        layout.addWidget(rename_btn)
+        pattern_layout = QHBoxLayout()
+        
+        pattern_label = QLabel("匹配正则:")
+        pattern_label.setFont(QFont("Arial", 12))
+        pattern_layout.addWidget(pattern_label)
+        
+        self.pattern_input = QLineEdit()
+        self.pattern_input.setFont(QFont("Arial", 12))
+        self.pattern_input.setPlaceholderText("可选，如 (\\d+)-(.*)，只重命名文件名匹配的文件")
+        pattern_layout.addWidget(self.pattern_input)
+        
+        layout.addLayout(pattern_layout)
+        
+        # 预览和重命名按钮
+        btn_layout = QHBoxLayout()
+        preview_btn = QPushButton("预览")
+        preview_btn.clicked.connect(self.preview_renames)
+        btn_layout.addWidget(preview_btn)
+        
+        self.rename_btn = QPushButton("重命名")
+        self.rename_btn.clicked.connect(self.rename_files)
+        btn_layout.addWidget(self.rename_btn)
+        
+        self.undo_btn = QPushButton("撤销上次重命名")
+        self.undo_btn.clicked.connect(self.undo_last_batch)
+        btn_layout.addWidget(self.undo_btn)
+        layout.addLayout(btn_layout)
+        
+        # 并行执行选项，适用于NFS/SMB等网络文件夹
+        parallel_layout = QHBoxLayout()
+        self.parallel_check = QCheckBox("并行重命名（适用于网络文件夹）")
+        self.parallel_check.setChecked(self.settings.value("parallel", False, type=bool))
+        self.parallel_check.toggled.connect(lambda checked: self.settings.setValue("parallel", checked))
+        parallel_layout.addWidget(self.parallel_check)
+        
+        parallel_layout.addWidget(QLabel("线程数:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(2, 64)
+        self.workers_spin.setValue(self.settings.value("workers", DEFAULT_RENAME_WORKERS, type=int))
+        self.workers_spin.valueChanged.connect(lambda value: self.settings.setValue("workers", value))
+        parallel_layout.addWidget(self.workers_spin)
+        parallel_layout.addStretch()
+        layout.addLayout(parallel_layout)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        # 重命名预览
+        self.preview_table = QTableWidget(0, 3)
+        self.preview_table.setHorizontalHeaderLabels(["原文件名", "新文件名", "状态"])
+        self.preview_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.preview_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.preview_table.setVisible(False)
+        layout.addWidget(self.preview_table)
+        
+        self.preview_info = QLabel("")
+        layout.addWidget(self.preview_info)
         
         # 帮助说明
         help_text = """
@@ -50,58 +950,226 @@ class FileRenamer(QDialog):
         - {index}: 序号占位符，如"文件{index}" → 文件1, 文件2, ...
         - {name}: 原文件名占位符(不含扩展名)
         - {ext}: 扩展名占位符
+        - {index:3:100:10}: 补零到3位、从100开始、步长10的序号，各项均可省略
+        - {mtime:%Y%m%d} / {exif:%Y%m%d}: 修改日期 / EXIF拍摄日期(无则用修改日期)
+        - {size} / {size:kb} / {size:mb} / {size:h}: 文件大小
+        - {1} / {<名称>}: 匹配正则的分组；{{ 和 }} 表示花括号本身
         """
         help_label = QLabel(help_text)
         help_label.setFont(QFont("Arial", 10))
         layout.addWidget(help_label)
         
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 第一次显示时检查上次是否有中断的重命名
+        if not self.journal_checked:
+            self.journal_checked = True
+            self.recover_journal()
+            
+    def get_journal(self):
+        """按需打开重命名日志，日志目录不可用时返回None"""
+        if self.journal is None:
+            try:
+                journal = RenameJournal()
+                os.makedirs(os.path.dirname(journal.path), exist_ok=True)
+                self.journal = journal
+            except OSError as e:
+                print(f"Error opening rename journal: {e}")
+        return self.journal
+        
+    def recover_journal(self):
+        journal = self.get_journal()
+        if journal is None:
+            return
+        try:
+            recovered = journal.recover()
+            if recovered:
+                QMessageBox.information(self, "提示", f"检测到上次重命名未完成，已恢复 {recovered} 个文件的原名")
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"恢复未完成的重命名时出错: {str(e)}")
+            
+    def undo_last_batch(self):
+        journal = self.get_journal()
+        if journal is None:
+            QMessageBox.warning(self, "警告", "无法打开重命名日志")
+            return
+        try:
+            batch = journal.last_batch()
+            if batch is None:
+                QMessageBox.information(self, "提示", "没有可以撤销的重命名")
+                return
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(batch["time"]))
+            result = QMessageBox.question(
+                self, "撤销重命名", f"确定要撤销 {when} 的重命名吗？",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if result != QMessageBox.StandardButton.Yes:
+                return
+            reverted, skipped = journal.undo(batch)
+            message = f"已恢复 {reverted} 个文件的原名"
+            if skipped:
+                message += f"，{skipped} 个文件因原名已被占用而跳过"
+            QMessageBox.information(self, "成功", message)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"撤销重命名时出错: {str(e)}")
+            
     def select_files(self):
         files, _ = QFileDialog.getOpenFileNames(self, "选择文件")
         
         if files:
-            self.selected_files = files
-            self.file_list.clear()
-            for file in files:
-                self.file_list.addItem(os.path.basename(file))
-                
-    def rename_files(self):
+            self.cancel_scan()
+            self.scan_root = ""
+            self.set_selected_files(files)
+            
+    def set_selected_files(self, files, root=""):
+        self.selected_files = files
+        self.file_model.set_files(files, root)
+        self.file_count_label.setText(f"共 {len(files)} 个文件" if files else "")
+        self.preview_table.setVisible(False)
+        self.preview_info.setText("")
+        
+    def select_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "选择文件夹")
+        if folder:
+            self.scan_root = folder
+            self.rescan_folder()
+            
+    def rescan_folder(self):
+        """过滤条件或子文件夹选项改变时重新扫描当前文件夹"""
+        if not self.scan_root:
+            return
+        self.cancel_scan()
+        self.set_selected_files([])
+        self.file_count_label.setText("正在扫描...")
+        
+        self.scan_thread = ScanThread(self.scan_root, self.recursive_check.isChecked(),
+                                      self.include_input.text(), self.exclude_input.text())
+        self.scan_thread.progress_signal.connect(
+            lambda count: self.file_count_label.setText(f"正在扫描，已找到 {count} 个文件..."))
+        self.scan_thread.result_signal.connect(lambda files: self.set_selected_files(files, self.scan_root))
+        self.scan_thread.error_signal.connect(
+            lambda message: QMessageBox.critical(self, "错误", f"扫描文件夹时出错: {message}"))
+        self.scan_thread.finished.connect(lambda thread=self.scan_thread: self.scan_finished(thread))
+        self.scan_threads.append(self.scan_thread)
+        self.scan_thread.start()
+        
+    def cancel_scan(self):
+        """取消正在进行的扫描，旧线程的结果不再更新界面"""
+        if self.scan_thread is None:
+            return
+        self.scan_thread.cancel()
+        self.scan_thread.progress_signal.disconnect()
+        self.scan_thread.result_signal.disconnect()
+        self.scan_thread.error_signal.disconnect()
+        self.scan_thread = None
+        
+    def scan_finished(self, thread):
+        thread.wait()
+        self.scan_threads.remove(thread)
+        if self.scan_thread is thread:
+            self.scan_thread = None
+            
+    def build_plan(self):
+        """检查输入并生成重命名计划，输入无效时返回None"""
         if not self.selected_files:
             QMessageBox.warning(self, "警告", "请先选择文件")
-            return
+            return None
             
         rule = self.rule_input.text()
         if not rule:
             QMessageBox.warning(self, "警告", "请输入重命名规则")
-            return
-        
+            return None
+            
         try:
-            renamed_count = 0
+            compiled_rule = RenameRule(rule, self.pattern_input.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "警告", f"重命名规则无效: {str(e)}")
+            return None
             
-            for i, file_path in enumerate(self.selected_files):
-                directory = os.path.dirname(file_path)
-                filename = os.path.basename(file_path)
-                name, ext = os.path.splitext(filename)
-                
-                # 应用规则
-                new_name = rule.replace("{index}", str(i+1))
-                new_name = new_name.replace("{name}", name)
-                new_name = new_name.replace("{ext}", ext)
-                
-                # 确保有扩展名
-                if not new_name.endswith(ext):
-                    new_name += ext
-                    
-                new_path = os.path.join(directory, new_name)
-                
-                # 重命名文件
-                os.rename(file_path, new_path)
-                renamed_count += 1
-                
-            QMessageBox.information(self, "成功", f"已重命名 {renamed_count} 个文件")
+        return plan_renames(self.selected_files, compiled_rule)
+        
+    def preview_renames(self):
+        plan = self.build_plan()
+        if plan is not None:
+            self.show_preview(*plan)
             
-            # 更新列表
-            self.file_list.clear()
-            self.selected_files = []
+    def show_preview(self, moves, conflicts):
+        """冲突排在最前面，其后是正常的重命名，超过 PREVIEW_LIMIT 的部分不显示"""
+        cycles = find_cycles(moves)
+        in_cycle = {path for cycle in cycles for path in cycle}
+        rows = [(old_path, new_path, reason, True) for old_path, new_path, reason in conflicts]
+        rows += [(old_path, new_path, "循环重命名" if old_path in in_cycle else "", False)
+                 for old_path, new_path in moves]
+        rows = rows[:PREVIEW_LIMIT]
+        
+        self.preview_table.setUpdatesEnabled(False)
+        self.preview_table.setRowCount(len(rows))
+        for row, (old_path, new_path, status, is_conflict) in enumerate(rows):
+            items = [QTableWidgetItem(os.path.basename(old_path)),
+                     QTableWidgetItem(os.path.basename(new_path)),
+                     QTableWidgetItem(status or "待重命名")]
+            for column, item in enumerate(items):
+                item.setToolTip(old_path if column == 0 else new_path)
+                if is_conflict:
+                    item.setForeground(QColor("red"))
+                self.preview_table.setItem(row, column, item)
+        self.preview_table.setUpdatesEnabled(True)
+        self.preview_table.setVisible(True)
+        
+        # 重名冲突的文件同时出现在 moves 和 conflicts 中，按路径去重后再计数
+        changed = {old_path for old_path, _ in moves} | {old_path for old_path, _, _ in conflicts}
+        unchanged = len(self.selected_files) - len(changed)
+        info = f"将重命名 {len(moves)} 个文件，名称不变 {unchanged} 个"
+        if cycles:
+            info += f"，循环 {len(cycles)} 组（将通过临时文件名完成）"
+        if conflicts:
+            info += f"，冲突 {len(conflicts)} 个（需修改规则后才能执行）"
+        if len(conflicts) + len(moves) > PREVIEW_LIMIT:
+            info += f"\n仅显示前 {PREVIEW_LIMIT} 条"
+        self.preview_info.setText(info)
+        
+    def rename_files(self):
+        plan = self.build_plan()
+        if plan is None:
+            return
             
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"重命名文件时出错: {str(e)}") 
\ No newline at end of file
+        moves, conflicts = plan
+        if conflicts:
+            self.show_preview(moves, conflicts)
+            QMessageBox.warning(self, "警告", f"发现 {len(conflicts)} 个冲突，未重命名任何文件，请查看预览")
+            return
+            
+        if not moves:
+            QMessageBox.information(self, "提示", "没有需要重命名的文件")
+            return
+            
+        max_workers = self.workers_spin.value() if self.parallel_check.isChecked() else 1
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.rename_btn.setEnabled(False)
+        self.undo_btn.setEnabled(False)
+        
+        self.rename_thread = RenameThread(moves, self.get_journal(), max_workers)
+        self.rename_thread.progress_signal.connect(self.update_rename_progress)
+        self.rename_thread.result_signal.connect(self.rename_succeeded)
+        self.rename_thread.error_signal.connect(
+            lambda message: QMessageBox.critical(self, "错误", f"重命名文件时出错，已撤销本次所有改动: {message}"))
+        self.rename_thread.finished.connect(self.rename_finished)
+        self.rename_thread.start()
+        
+    def update_rename_progress(self, done, total):
+        self.progress_bar.setValue(int(done * 100 / total) if total else 100)
+        
+    def rename_succeeded(self, renamed_count):
+        QMessageBox.information(self, "成功", f"已重命名 {renamed_count} 个文件")
+        
+        # 更新列表
+        self.scan_root = ""
+        self.set_selected_files([])
+        
+    def rename_finished(self):
+        self.rename_thread.wait()
+        self.rename_thread = None
+        self.progress_bar.setVisible(False)
+        self.rename_btn.setEnabled(True)
+        self.undo_btn.setEnabled(True)
@@ -1,10 +1,21 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, 
                            QComboBox, QPushButton, QTextEdit, 
-                           QHBoxLayout, QFileDialog, QMessageBox, QDialog, QApplication)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
+                           QHBoxLayout, QFileDialog, QMessageBox, QDialog, QApplication,
+                           QProgressBar, QCheckBox, QLineEdit,
+                           QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSettings
+from PyQt6.QtGui import QFont, QColor
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 import hashlib
+import hmac
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
 import sys
+import threading
+import time
 try:
     import pyperclip
 except ImportError:
@@ -14,14 +25,608 @@ except ImportError:
             pass
     pyperclip = Pyperclip()
 
+# 每次读取的块大小，所有算法共享同一次读取
+CHUNK_SIZE = 1024 * 1024
+
+# 支持的算法（hashlib名称 -> 显示名称），按界面显示顺序排列
+ALGORITHMS = {
+    "md5": "MD5",
+    "sha1": "SHA1",
+    "sha256": "SHA256",
+    "sha512": "SHA512",
+    "sha3_256": "SHA3-256",
+    "blake2b": "BLAKE2b",
+    "blake2s": "BLAKE2s",
+}
+DEFAULT_ALGORITHMS = ("md5", "sha1", "sha256")
+
+def hash_file(file_path, algorithms=DEFAULT_ALGORITHMS, chunk_size=CHUNK_SIZE,
+              progress_callback=None, is_cancelled=None):
+    """流式计算文件哈希值，一次读取同时更新所有算法
+
+    progress_callback(已读字节数, 文件总字节数) 在每个块之后调用；
+    is_cancelled() 返回 True 时立即停止并返回 None。
+    """
+    hashers = [(name, hashlib.new(name)) for name in algorithms]
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    done = 0
+    with open(file_path, 'rb', buffering=0) as f:
+        total = os.fstat(f.fileno()).st_size
+        while True:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            count = f.readinto(buffer)
+            if not count:
+                break
+            chunk = view[:count]
+            for _, hasher in hashers:
+                hasher.update(chunk)
+            done += count
+            if progress_callback is not None:
+                progress_callback(done, total)
+    return {name: hasher.hexdigest() for name, hasher in hashers}
+
+# 批量模式下，大文件单独提交到进程池，小文件打包后提交以减少进程间通信开销
+LARGE_FILE_SIZE = 64 * 1024 * 1024
+SMALL_BATCH_BYTES = 32 * 1024 * 1024
+SMALL_BATCH_FILES = 256
+
+def collect_files(root):
+    """递归收集目录下的所有普通文件，返回 [(路径, 大小), ...]"""
+    files = []
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    files.sort()
+    return files
+
+def plan_batches(files):
+    """大文件按大小降序单独成批（先处理耗时长的），小文件按数量和总大小打包"""
+    large = sorted((f for f in files if f[1] >= LARGE_FILE_SIZE), key=lambda f: f[1], reverse=True)
+    batches = [[f] for f in large]
+    current, current_bytes = [], 0
+    for f in files:
+        if f[1] >= LARGE_FILE_SIZE:
+            continue
+        current.append(f)
+        current_bytes += f[1]
+        if len(current) >= SMALL_BATCH_FILES or current_bytes >= SMALL_BATCH_BYTES:
+            batches.append(current)
+            current, current_bytes = [], 0
+    if current:
+        batches.append(current)
+    return batches
+
+def hash_file_batch(files, algorithms=DEFAULT_ALGORITHMS):
+    """在子进程中计算一批文件的哈希值，返回 [(路径, 大小, 哈希字典或None, 错误信息), ...]"""
+    results = []
+    for file_path, size in files:
+        try:
+            results.append((file_path, size, hash_file(file_path, algorithms), ""))
+        except Exception as e:
+            results.append((file_path, size, None, str(e)))
+    return results
+
+def manifest_name(file_path, root):
+    return os.path.relpath(file_path, root).replace(os.sep, "/")
+
+def write_manifest(results, root, output_path, algorithm="sha256"):
+    """写出可被 sha256sum -c 等工具读取的校验清单"""
+    with open(output_path, "w", encoding="utf-8", newline="\n") as f:
+        for file_path, _, digests, _ in results:
+            if not digests or algorithm not in digests:
+                continue
+            name = manifest_name(file_path, root)
+            prefix = ""
+            # 与 GNU coreutils 一致：文件名含反斜杠或换行时转义并在行首加反斜杠
+            if "\\" in name or "\n" in name:
+                name = name.replace("\\", "\\\\").replace("\n", "\\n")
+                prefix = "\\"
+            f.write(f"{prefix}{digests[algorithm]}  {name}\n")
+
+def write_json_report(results, root, output_path):
+    """写出包含全部算法结果和错误信息的JSON报告"""
+    report = {
+        "root": root,
+        "files": [],
+        "errors": [],
+    }
+    for file_path, size, digests, error in results:
+        name = manifest_name(file_path, root)
+        if digests is None:
+            report["errors"].append({"path": name, "error": error})
+        else:
+            report["files"].append({"path": name, "size": size, **digests})
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+# 哈希缓存默认最多保留的文件条数，超出后按最近使用时间淘汰
+DEFAULT_CACHE_ENTRIES = 200000
+
+def default_cache_path():
+    """缓存数据库放在与QSettings配置文件相同的目录下"""
+    settings = QSettings(QSettings.Format.IniFormat, QSettings.Scope.UserScope, "ToolsApp", "HashCache")
+    return os.path.join(os.path.dirname(settings.fileName()), "hash_cache.sqlite3")
+
+class HashCache:
+    """基于SQLite的持久化哈希缓存，按 (路径, 大小, 修改时间, inode) 识别未变化的文件"""
+    
+    def __init__(self, db_path=None, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.db_path = db_path or default_cache_path()
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        # 单文件线程与批量线程共用同一个连接，由锁保证串行访问
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS hashes (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                digests TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS hashes_last_used ON hashes(last_used)")
+        self.conn.commit()
+    
+    @staticmethod
+    def identity(file_path, stat_result=None):
+        st = stat_result or os.stat(file_path)
+        return (os.path.abspath(file_path), st.st_size, st.st_mtime_ns, st.st_ino)
+    
+    def get_many(self, identities, algorithms):
+        """批量查询，返回 {路径: 哈希字典}，只包含所有算法都已缓存的文件"""
+        hits = {}
+        now = time.time()
+        with self.lock:
+            for path, size, mtime_ns, inode in identities:
+                row = self.conn.execute(
+                    "SELECT digests FROM hashes WHERE path=? AND size=? AND mtime_ns=? AND inode=?",
+                    (path, size, mtime_ns, inode)).fetchone()
+                if row is None:
+                    continue
+                digests = json.loads(row[0])
+                if all(name in digests for name in algorithms):
+                    hits[path] = {name: digests[name] for name in algorithms}
+            if hits:
+                self.conn.executemany("UPDATE hashes SET last_used=? WHERE path=?",
+                                      [(now, path) for path in hits])
+                self.conn.commit()
+        return hits
+    
+    def get(self, file_path, algorithms, stat_result=None):
+        identity = self.identity(file_path, stat_result)
+        return self.get_many([identity], algorithms).get(identity[0])
+    
+    def put_many(self, items):
+        """批量写入 [(身份元组, 哈希字典), ...]，已有的其他算法结果会被保留"""
+        now = time.time()
+        with self.lock:
+            for (path, size, mtime_ns, inode), digests in items:
+                row = self.conn.execute(
+                    "SELECT digests FROM hashes WHERE path=? AND size=? AND mtime_ns=? AND inode=?",
+                    (path, size, mtime_ns, inode)).fetchone()
+                merged = json.loads(row[0]) if row else {}
+                merged.update(digests)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, size, mtime_ns, inode, json.dumps(merged), now))
+            self.evict()
+            self.conn.commit()
+    
+    def put(self, file_path, digests, stat_result=None):
+        self.put_many([(self.identity(file_path, stat_result), digests)])
+    
+    def evict(self):
+        count = self.conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM hashes WHERE path IN (SELECT path FROM hashes ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,))
+    
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM hashes")
+            self.conn.commit()
+            self.conn.execute("VACUUM")
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+# 校验时根据摘要长度（十六进制字符数）选择唯一需要计算的算法，长度相同时默认使用这里的算法
+DIGEST_ALGORITHMS = {32: "md5", 40: "sha1", 64: "sha256", 128: "sha512"}
+# BSD风格清单 "SHA256 (文件名) = 摘要" 中的算法名（去掉连字符后的大写形式）
+BSD_ALGORITHM_NAMES = {"MD5": "md5", "SHA1": "sha1", "SHA256": "sha256", "SHA512": "sha512",
+                       "SHA3256": "sha3_256", "BLAKE2B": "blake2b", "BLAKE2S": "blake2s"}
+BSD_LINE = re.compile(r"^([\w-]+) \((.*)\) = ([0-9A-Fa-f]+)$")
+# GNU格式清单没有算法名，按清单文件名推断（B2SUMS、*.b2 等），同一长度有多种常见算法时都计算
+MANIFEST_NAME_HINTS = (("sha3", "sha3_256"), ("blake2s", "blake2s"), ("sha512", "sha512"), ("sha256", "sha256"),
+                       ("sha1", "sha1"), ("md5", "md5"), ("b2", "blake2b"))
+AMBIGUOUS_DIGESTS = {128: ("sha512", "blake2b")}
+
+def manifest_hint(manifest_path):
+    """根据清单文件名推断GNU格式清单使用的算法，无法推断时返回None"""
+    name = os.path.basename(manifest_path).lower()
+    for marker, algorithm in MANIFEST_NAME_HINTS:
+        if marker in name:
+            return algorithm
+    return None
+
+def candidate_algorithms(digest, preferred=()):
+    """根据摘要长度推断可能的算法
+
+    preferred 中长度匹配的算法全部作为候选（如SHA3-256与SHA256等长），
+    DIGEST_ALGORITHMS 中该长度的默认算法总是在候选中，任一候选匹配即校验通过。
+    """
+    digest = digest.strip().lower()
+    if not digest or any(c not in "0123456789abcdef" for c in digest):
+        return ()
+    candidates = [name for name in preferred if hashlib.new(name).digest_size * 2 == len(digest)]
+    default = DIGEST_ALGORITHMS.get(len(digest))
+    if default and default not in candidates:
+        candidates.append(default)
+    return tuple(candidates)
+
+def algorithm_for_digest(digest, preferred=()):
+    candidates = candidate_algorithms(digest, preferred)
+    return candidates[0] if candidates else None
+
+def benchmark_algorithms(algorithms=tuple(ALGORITHMS), data_size=64 * 1024 * 1024, is_cancelled=None):
+    """在本机上测量各算法的吞吐量，返回 {算法: MB/s}"""
+    chunk = os.urandom(CHUNK_SIZE)
+    rounds = max(data_size // CHUNK_SIZE, 1)
+    speeds = {}
+    for name in algorithms:
+        if is_cancelled is not None and is_cancelled():
+            return None
+        hasher = hashlib.new(name)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            hasher.update(chunk)
+        hasher.digest()
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        speeds[name] = rounds * CHUNK_SIZE / (1024 * 1024) / elapsed
+    return speeds
+
+def unescape_manifest_name(name):
+    """还原 GNU coreutils 清单中转义过的文件名"""
+    result = []
+    i = 0
+    while i < len(name):
+        if name[i] == "\\" and i + 1 < len(name):
+            result.append("\n" if name[i + 1] == "n" else name[i + 1])
+            i += 2
+        else:
+            result.append(name[i])
+            i += 1
+    return "".join(result)
+
+def parse_manifest(text, base_dir, hint=None):
+    """解析 sha256sum/md5sum/b2sum 格式或BSD格式的校验清单，返回 [(路径, 算法, 预期摘要), ...]
+
+    GNU格式的行没有算法名：hint（见 manifest_hint）与摘要长度相符时使用 hint，
+    否则按长度推断；长度有歧义（128位十六进制可能是SHA512或BLAKE2b）时算法为候选元组，
+    校验时都计算，任一匹配即通过。
+    """
+    entries = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.rstrip("\r")
+        if not line.strip() or line.startswith("#"):
+            continue
+        escaped = line.startswith("\\")
+        if escaped:
+            line = line[1:]
+        match = BSD_LINE.match(line)
+        if match:
+            # BSD格式: SHA256 (文件名) = 摘要
+            algo_name, name, digest = match.groups()
+            algorithm = BSD_ALGORITHM_NAMES.get(algo_name.upper().replace("-", ""))
+        else:
+            digest, _, name = line.partition(" ")
+            # 文本模式为两个空格，二进制模式为 " *"
+            if name[:1] in (" ", "*"):
+                name = name[1:]
+            if hint and hashlib.new(hint).digest_size * 2 == len(digest):
+                algorithm = hint
+            else:
+                algorithm = AMBIGUOUS_DIGESTS.get(len(digest)) or algorithm_for_digest(digest)
+        if not name or algorithm is None or algorithm_for_digest(digest) is None:
+            raise ValueError(f"清单第 {line_no} 行格式无效: {line}")
+        if escaped:
+            name = unescape_manifest_name(name)
+        entries.append((os.path.join(base_dir, name), algorithm, digest.lower()))
+    return entries
+
+def verify_files(entries, cache=None, max_workers=None, progress_callback=None, is_cancelled=None):
+    """按清单校验文件，每个文件只计算其摘要对应的算法
+
+    entries 中的算法可以是候选元组，一次读取计算全部候选，任一匹配即通过。
+    返回 [(路径, 算法, 预期摘要, 实际摘要, 状态), ...]，状态为 通过/失败/缺失/错误；
+    取消时返回 None。校验总是重新读取文件内容，cache 只用于写回新结果：
+    内容被改动但大小和修改时间不变的文件也必须判定为失败。
+    """
+    results = []
+    groups = {}
+    for file_path, algorithm, expected in entries:
+        algorithms = algorithm if isinstance(algorithm, tuple) else (algorithm,)
+        try:
+            size = os.stat(file_path).st_size
+        except OSError:
+            # 文件不存在时无需计算，直接判定失败
+            results.append((file_path, "/".join(algorithms), expected, "", "缺失"))
+            continue
+        groups.setdefault(algorithms, []).append((file_path, size, expected))
+    
+    total_bytes = sum(size for group in groups.values() for _, size, _ in group)
+    offset = 0
+    for algorithms, group in groups.items():
+        def report(done, total, offset=offset):
+            if progress_callback is not None:
+                progress_callback(offset + done, total_bytes)
+        expected_by_path = {file_path: expected for file_path, _, expected in group}
+        outcome = hash_files_parallel([(file_path, size) for file_path, size, _ in group],
+                                      algorithms, cache=cache, max_workers=max_workers,
+                                      progress_callback=report, is_cancelled=is_cancelled,
+                                      read_cache=False)
+        if outcome is None:
+            return None
+        for file_path, _, digests, error in outcome[0]:
+            expected = expected_by_path[file_path]
+            if digests is None:
+                results.append((file_path, "/".join(algorithms), expected, error, "错误"))
+                continue
+            matched = [name for name in algorithms if hmac.compare_digest(digests[name], expected)]
+            if matched:
+                results.append((file_path, matched[0], expected, digests[matched[0]], "通过"))
+            else:
+                results.append((file_path, "/".join(algorithms), expected, digests[algorithms[0]], "失败"))
+        offset += sum(size for _, size, _ in group)
+    results.sort(key=lambda item: item[0])
+    return results
+
+class HashThread(QThread):
+    """线程用于在后台流式计算文件哈希值"""
+    progress_signal = pyqtSignal(int, float)  # 进度(千分比), 速度(MB/s)
+    result_signal = pyqtSignal(dict)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, file_path, algorithms=DEFAULT_ALGORITHMS, cache=None, read_cache=True):
+        super().__init__()
+        self.file_path = file_path
+        self.algorithms = algorithms
+        self.cache = cache
+        # 校验模式下不读取缓存，只写回新的计算结果
+        self.read_cache = read_cache
+        self.from_cache = False
+        self.cancel_requested = False
+        
+    def cancel(self):
+        self.cancel_requested = True
+        
+    def run(self):
+        start = time.perf_counter()
+        last_emit = 0.0
+        
+        def report(done, total):
+            nonlocal last_emit
+            now = time.perf_counter()
+            # 限制进度信号频率，避免刷屏拖慢界面
+            if now - last_emit < 0.1 and done < total:
+                return
+            last_emit = now
+            speed = done / (1024 * 1024) / max(now - start, 1e-6)
+            self.progress_signal.emit(int(done * 1000 / total) if total else 1000, speed)
+        
+        try:
+            # 先记录文件状态再计算，计算期间文件被修改时缓存条目会自动失效
+            stat_result = os.stat(self.file_path)
+            if self.cache is not None and self.read_cache:
+                result = self.cache.get(self.file_path, self.algorithms, stat_result)
+                if result is not None:
+                    self.from_cache = True
+                    self.progress_signal.emit(1000, 0.0)
+                    self.result_signal.emit(result)
+                    return
+            result = hash_file(self.file_path, self.algorithms,
+                               progress_callback=report,
+                               is_cancelled=lambda: self.cancel_requested)
+            if result is not None:
+                if self.cache is not None:
+                    self.cache.put(self.file_path, result, stat_result)
+                self.result_signal.emit(result)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+def hash_files_parallel(files, algorithms, cache=None, max_workers=None,
+                        progress_callback=None, is_cancelled=None, read_cache=True):
+    """用进程池计算一组文件的哈希值，命中缓存的文件不再计算
+
+    files 为 [(路径, 大小), ...]；返回 (结果列表, 缓存命中数)，取消时返回 None。
+    progress_callback(已完成字节数, 总字节数) 在每批完成后调用。
+    read_cache 为 False 时所有文件都重新计算，结果仍写入缓存。
+    """
+    total_bytes = sum(size for _, size in files)
+    done_bytes = 0
+    results = []
+    
+    # 命中缓存的文件直接使用缓存结果，只把未命中的文件交给进程池
+    identities = {}
+    if cache is not None:
+        for file_path, _ in files:
+            try:
+                identities[file_path] = HashCache.identity(file_path)
+            except OSError:
+                continue
+        hits = cache.get_many(identities.values(), algorithms) if read_cache else {}
+        misses = []
+        for file_path, size in files:
+            identity = identities.get(file_path)
+            digests = hits.get(identity[0]) if identity else None
+            if digests is None:
+                misses.append((file_path, size))
+            else:
+                results.append((file_path, size, digests, ""))
+                done_bytes += size
+        files = misses
+    cache_hits = len(results)
+    
+    batches = plan_batches(files)
+    if batches:
+        max_workers = max_workers or os.cpu_count() or 1
+        # 在多线程的Qt进程中fork可能导致子进程死锁，统一使用spawn启动子进程
+        executor = ProcessPoolExecutor(max_workers=min(max_workers, len(batches)),
+                                       mp_context=multiprocessing.get_context("spawn"))
+        cancelled = False
+        try:
+            pending = {executor.submit(hash_file_batch, batch, algorithms) for batch in batches}
+            while pending:
+                if is_cancelled is not None and is_cancelled():
+                    cancelled = True
+                    return None
+                finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batch_results = future.result()
+                    results.extend(batch_results)
+                    done_bytes += sum(item[1] for item in batch_results)
+                    if cache is not None:
+                        cache.put_many([(identities[item[0]], item[2]) for item in batch_results
+                                        if item[2] is not None and item[0] in identities])
+                if finished and progress_callback is not None:
+                    progress_callback(done_bytes, total_bytes)
+        finally:
+            executor.shutdown(wait=not cancelled, cancel_futures=True)
+    results.sort(key=lambda item: item[0])
+    return results, cache_hits
+
+class BatchHashThread(QThread):
+    """线程用于调度进程池批量计算目录中所有文件的哈希值"""
+    progress_signal = pyqtSignal(int, float)  # 进度(千分比), 速度(MB/s)
+    result_signal = pyqtSignal(list)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, root, algorithms=DEFAULT_ALGORITHMS, max_workers=None, cache=None):
+        super().__init__()
+        self.root = root
+        self.algorithms = algorithms
+        self.max_workers = max_workers
+        self.cache = cache
+        self.cache_hits = 0
+        self.cancel_requested = False
+        
+    def cancel(self):
+        self.cancel_requested = True
+        
+    def run(self):
+        try:
+            start = time.perf_counter()
+            
+            def report(done, total):
+                speed = done / (1024 * 1024) / max(time.perf_counter() - start, 1e-6)
+                self.progress_signal.emit(int(done * 1000 / total) if total else 1000, speed)
+            
+            outcome = hash_files_parallel(collect_files(self.root), self.algorithms,
+                                          cache=self.cache, max_workers=self.max_workers,
+                                          progress_callback=report,
+                                          is_cancelled=lambda: self.cancel_requested)
+            if outcome is None:
+                return
+            results, self.cache_hits = outcome
+            self.result_signal.emit(results)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+class BenchmarkThread(QThread):
+    """线程用于在后台测试各哈希算法的速度"""
+    progress_signal = pyqtSignal(int, float)
+    result_signal = pyqtSignal(dict)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, algorithms=tuple(ALGORITHMS)):
+        super().__init__()
+        self.algorithms = algorithms
+        self.cancel_requested = False
+        
+    def cancel(self):
+        self.cancel_requested = True
+        
+    def run(self):
+        try:
+            speeds = {}
+            for i, name in enumerate(self.algorithms):
+                result = benchmark_algorithms((name,), is_cancelled=lambda: self.cancel_requested)
+                if result is None:
+                    return
+                speeds.update(result)
+                self.progress_signal.emit(int((i + 1) * 1000 / len(self.algorithms)), result[name])
+            self.result_signal.emit(speeds)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+class VerifyThread(QThread):
+    """线程用于按校验清单并行校验文件"""
+    progress_signal = pyqtSignal(int, float)  # 进度(千分比), 速度(MB/s)
+    result_signal = pyqtSignal(list)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, entries, max_workers=None, cache=None):
+        super().__init__()
+        self.entries = entries
+        self.max_workers = max_workers
+        self.cache = cache
+        self.cancel_requested = False
+        
+    def cancel(self):
+        self.cancel_requested = True
+        
+    def run(self):
+        try:
+            start = time.perf_counter()
+            
+            def report(done, total):
+                speed = done / (1024 * 1024) / max(time.perf_counter() - start, 1e-6)
+                self.progress_signal.emit(int(done * 1000 / total) if total else 1000, speed)
+            
+            results = verify_files(self.entries, cache=self.cache, max_workers=self.max_workers,
+                                   progress_callback=report,
+                                   is_cancelled=lambda: self.cancel_requested)
+            if results is not None:
+                self.result_signal.emit(results)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
 class HashCalculator(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("哈希计算器")
         self.setModal(True)
-        self.md5_hash = ""
-        self.sha1_hash = ""
-        self.sha256_hash = ""
+        self.digests = {}
+        self.hash_thread = None
+        self.current_file = ""
+        self.batch_root = ""
+        self.batch_results = []
+        self.batch_algorithms = DEFAULT_ALGORITHMS
+        self.expected_digest = ""
+        self.settings = QSettings("HashCalculator", "Cache")
+        self.algorithm_settings = QSettings("HashCalculator", "Algorithms")
+        self.hash_cache = None
         self.setupUI()
         
     def setupUI(self):
@@ -33,6 +638,79 @@ class HashCalculator(QDialog):
         self.text_edit.setPlainText("请点击\"选择文件\"按钮选择要计算哈希值的文件")
         layout.addWidget(self.text_edit)
         
+        # 校验结果表格
+        self.verify_table = QTableWidget(0, 3)
+        self.verify_table.setHorizontalHeaderLabels(["文件", "算法", "结果"])
+        self.verify_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.verify_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.verify_table.setVisible(False)
+        layout.addWidget(self.verify_table)
+        
+        # 进度条与速度
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setVisible(False)
+        progress_layout.addWidget(self.progress_bar, 1)
+        
+        self.speed_label = QLabel("")
+        progress_layout.addWidget(self.speed_label)
+        
+        # 取消按钮
+        self.cancel_btn = QPushButton("取消")
+        self.cancel_btn.clicked.connect(self.cancel_hash)
+        self.cancel_btn.setVisible(False)
+        progress_layout.addWidget(self.cancel_btn)
+        layout.addLayout(progress_layout)
+        
+        # 算法选择
+        algorithm_layout = QHBoxLayout()
+        algorithm_layout.addWidget(QLabel("算法:"))
+        selected = self.algorithm_settings.value("selected", list(DEFAULT_ALGORITHMS))
+        if isinstance(selected, str):
+            selected = [selected]
+        self.algorithm_checks = {}
+        for name, label in ALGORITHMS.items():
+            check = QCheckBox(label)
+            check.setChecked(name in selected)
+            check.toggled.connect(self.save_algorithms)
+            self.algorithm_checks[name] = check
+            algorithm_layout.addWidget(check)
+        algorithm_layout.addStretch()
+        
+        self.benchmark_btn = QPushButton("性能测试")
+        self.benchmark_btn.clicked.connect(self.run_benchmark)
+        algorithm_layout.addWidget(self.benchmark_btn)
+        layout.addLayout(algorithm_layout)
+        
+        # 缓存选项
+        cache_layout = QHBoxLayout()
+        self.use_cache_check = QCheckBox("使用哈希缓存（文件未修改时直接返回结果）")
+        self.use_cache_check.setChecked(self.settings.value("enabled", True, type=bool))
+        self.use_cache_check.toggled.connect(lambda checked: self.settings.setValue("enabled", checked))
+        cache_layout.addWidget(self.use_cache_check)
+        cache_layout.addStretch()
+        
+        self.clear_cache_btn = QPushButton("清空缓存")
+        self.clear_cache_btn.clicked.connect(self.clear_cache)
+        cache_layout.addWidget(self.clear_cache_btn)
+        layout.addLayout(cache_layout)
+        
+        # 校验区域
+        verify_layout = QHBoxLayout()
+        self.expected_input = QLineEdit()
+        self.expected_input.setPlaceholderText("粘贴预期的哈希值（根据长度自动选择算法，长度相同时优先使用已勾选的算法）")
+        verify_layout.addWidget(self.expected_input, 1)
+        
+        self.verify_btn = QPushButton("校验文件")
+        self.verify_btn.clicked.connect(self.verify_file)
+        verify_layout.addWidget(self.verify_btn)
+        
+        self.verify_manifest_btn = QPushButton("校验清单")
+        self.verify_manifest_btn.clicked.connect(self.verify_manifest)
+        verify_layout.addWidget(self.verify_manifest_btn)
+        layout.addLayout(verify_layout)
+        
         # 按钮区域
         btn_layout = QHBoxLayout()
         
@@ -41,69 +719,295 @@ class HashCalculator(QDialog):
         self.select_btn.clicked.connect(self.calculate_hash)
         btn_layout.addWidget(self.select_btn)
         
-        # 复制MD5按钮
-        self.copy_md5_btn = QPushButton("复制MD5")
-        self.copy_md5_btn.clicked.connect(self.copy_md5)
-        btn_layout.addWidget(self.copy_md5_btn)
-        
-        # 复制SHA1按钮
-        self.copy_sha1_btn = QPushButton("复制SHA1")
-        self.copy_sha1_btn.clicked.connect(self.copy_sha1)
-        btn_layout.addWidget(self.copy_sha1_btn)
+        # 选择文件夹按钮（批量模式）
+        self.select_dir_btn = QPushButton("选择文件夹")
+        self.select_dir_btn.clicked.connect(self.calculate_directory_hash)
+        btn_layout.addWidget(self.select_dir_btn)
         
-        # 复制SHA256按钮
-        self.copy_sha256_btn = QPushButton("复制SHA256")
-        self.copy_sha256_btn.clicked.connect(self.copy_sha256)
-        btn_layout.addWidget(self.copy_sha256_btn)
+        # 导出清单按钮
+        self.export_btn = QPushButton("导出清单")
+        self.export_btn.clicked.connect(self.export_manifest)
+        self.export_btn.setEnabled(False)
+        btn_layout.addWidget(self.export_btn)
         
         layout.addLayout(btn_layout)
+        
+        # 复制按钮区域，根据计算结果中的算法动态生成
+        self.copy_layout = QHBoxLayout()
+        self.copy_buttons = []
+        layout.addLayout(self.copy_layout)
+        
+        # 计算过程中需要禁用的按钮
+        self.action_buttons = [self.select_btn, self.select_dir_btn,
+                               self.verify_btn, self.verify_manifest_btn, self.benchmark_btn]
+    
+    def selected_algorithms(self):
+        return tuple(name for name, check in self.algorithm_checks.items() if check.isChecked())
+    
+    def save_algorithms(self):
+        self.algorithm_settings.setValue("selected", list(self.selected_algorithms()))
+    
+    def update_copy_buttons(self, digests):
+        """按结果中的算法重新生成复制按钮"""
+        for button in self.copy_buttons:
+            self.copy_layout.removeWidget(button)
+            button.deleteLater()
+        self.copy_buttons = []
+        for name in digests:
+            button = QPushButton(f"复制{ALGORITHMS.get(name, name)}")
+            button.clicked.connect(lambda checked, name=name: self.copy_digest(name))
+            self.copy_layout.addWidget(button)
+            self.copy_buttons.append(button)
     
     def calculate_hash(self):
         try:
+            algorithms = self.selected_algorithms()
+            if not algorithms:
+                QMessageBox.warning(self, "警告", "请至少选择一种哈希算法")
+                return
             file_path, _ = QFileDialog.getOpenFileName(self, "选择文件")
             if not file_path:
                 return
-                
+            
+            self.current_file = file_path
+            self.verify_table.setVisible(False)
             self.text_edit.setPlainText("正在计算哈希值，请稍候...")
-            QApplication.processEvents()  # 更新UI
             
-            with open(file_path, 'rb') as f:
-                content = f.read()
-                self.md5_hash = hashlib.md5(content).hexdigest()
-                self.sha1_hash = hashlib.sha1(content).hexdigest()
-                self.sha256_hash = hashlib.sha256(content).hexdigest()
-                
-            result = f"文件: {file_path}\n\nMD5: {self.md5_hash}\nSHA1: {self.sha1_hash}\nSHA256: {self.sha256_hash}"
-            self.text_edit.setPlainText(result)
+            # 在后台线程中流式计算，避免阻塞界面
+            self.start_thread(HashThread(file_path, algorithms, cache=self.get_cache()), self.show_result)
         except Exception as e:
             QMessageBox.critical(self, "错误", f"计算哈希值时出错: {str(e)}")
     
-    def copy_md5(self):
+    def calculate_directory_hash(self):
         try:
-            if not self.md5_hash:
-                QMessageBox.warning(self, "警告", "请先选择文件计算哈希值")
+            algorithms = self.selected_algorithms()
+            if not algorithms:
+                QMessageBox.warning(self, "警告", "请至少选择一种哈希算法")
                 return
-            pyperclip.copy(self.md5_hash)
-            QMessageBox.information(self, "成功", "MD5哈希值已复制到剪贴板")
+            root = QFileDialog.getExistingDirectory(self, "选择文件夹")
+            if not root:
+                return
+            
+            self.batch_root = root
+            self.batch_algorithms = algorithms
+            self.batch_results = []
+            self.export_btn.setEnabled(False)
+            self.verify_table.setVisible(False)
+            self.text_edit.setPlainText(f"正在批量计算文件夹中的哈希值，请稍候...\n{root}")
+            self.start_thread(BatchHashThread(root, algorithms, cache=self.get_cache()), self.show_batch_result)
         except Exception as e:
-            QMessageBox.critical(self, "错误", f"复制MD5值时出错: {str(e)}")
+            QMessageBox.critical(self, "错误", f"批量计算哈希值时出错: {str(e)}")
     
-    def copy_sha1(self):
+    def verify_file(self):
         try:
-            if not self.sha1_hash:
-                QMessageBox.warning(self, "警告", "请先选择文件计算哈希值")
+            expected = self.expected_input.text().strip().lower()
+            algorithms = candidate_algorithms(expected, self.selected_algorithms())
+            if not algorithms:
+                QMessageBox.warning(self, "警告", "请输入有效的哈希值")
+                return
+            file_path, _ = QFileDialog.getOpenFileName(self, "选择要校验的文件")
+            if not file_path:
                 return
-            pyperclip.copy(self.sha1_hash)
-            QMessageBox.information(self, "成功", "SHA1哈希值已复制到剪贴板")
+            
+            self.current_file = file_path
+            self.expected_digest = expected
+            self.verify_table.setVisible(False)
+            labels = "/".join(ALGORITHMS.get(name, name) for name in algorithms)
+            self.text_edit.setPlainText(f"正在使用 {labels} 校验文件，请稍候...")
+            # 只计算与预期摘要长度相符的算法（通常只有一种），多个候选共用一次读取
+            self.start_thread(HashThread(file_path, algorithms, cache=self.get_cache(), read_cache=False),
+                              self.show_verify_result)
         except Exception as e:
-            QMessageBox.critical(self, "错误", f"复制SHA1值时出错: {str(e)}")
+            QMessageBox.critical(self, "错误", f"校验文件时出错: {str(e)}")
+    
+    def verify_manifest(self):
+        try:
+            manifest_path, _ = QFileDialog.getOpenFileName(
+                self, "选择校验清单", "", "校验清单 (*.sha256 *.sha1 *.md5 *.b2 *SUMS *.txt);;所有文件 (*)"
+            )
+            if not manifest_path:
+                return
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                entries = parse_manifest(f.read(), os.path.dirname(manifest_path), manifest_hint(manifest_path))
+            if not entries:
+                QMessageBox.warning(self, "警告", "清单中没有可校验的文件")
+                return
+            
+            self.batch_root = os.path.dirname(manifest_path)
+            self.verify_table.setRowCount(0)
+            self.text_edit.setPlainText(f"正在校验清单中的 {len(entries)} 个文件，请稍候...\n{manifest_path}")
+            self.start_thread(VerifyThread(entries, cache=self.get_cache()), self.show_verify_table)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"校验清单时出错: {str(e)}")
+    
+    def show_verify_result(self, digests):
+        matched = [name for name, actual in digests.items()
+                   if hmac.compare_digest(actual, self.expected_digest)]
+        name = matched[0] if matched else next(iter(digests))
+        result = f"文件: {self.current_file}\n\n"
+        result += f"算法: {ALGORITHMS.get(name, name)}\n预期: {self.expected_digest}\n实际: {digests[name]}\n\n"
+        result += "校验通过 ✔" if matched else "校验失败 ✘"
+        self.text_edit.setPlainText(result)
+    
+    def show_verify_table(self, results):
+        passed = sum(1 for item in results if item[4] == "通过")
+        self.text_edit.setPlainText(f"清单目录: {self.batch_root}\n"
+                                    f"共 {len(results)} 个文件，通过 {passed} 个，未通过 {len(results) - passed} 个")
+        colors = {"通过": QColor("#2E7D32"), "失败": QColor("#D32F2F"),
+                  "缺失": QColor("#F57C00"), "错误": QColor("#D32F2F")}
+        self.verify_table.setUpdatesEnabled(False)
+        self.verify_table.setRowCount(len(results))
+        for row, (file_path, algorithm, expected, actual, status) in enumerate(results):
+            self.verify_table.setItem(row, 0, QTableWidgetItem(manifest_name(file_path, self.batch_root)))
+            self.verify_table.setItem(row, 1, QTableWidgetItem(algorithm.upper()))
+            status_item = QTableWidgetItem(status if status != "错误" else f"错误: {actual}")
+            status_item.setForeground(colors[status])
+            self.verify_table.setItem(row, 2, status_item)
+        self.verify_table.setUpdatesEnabled(True)
+        self.verify_table.setVisible(True)
+    
+    def run_benchmark(self):
+        try:
+            algorithms = self.selected_algorithms() or tuple(ALGORITHMS)
+            self.verify_table.setVisible(False)
+            self.text_edit.setPlainText("正在测试各算法在本机上的速度，请稍候...")
+            self.start_thread(BenchmarkThread(algorithms), self.show_benchmark_result)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"性能测试时出错: {str(e)}")
+    
+    def show_benchmark_result(self, speeds):
+        lines = ["各算法在本机上的速度（单线程，内存数据）:", ""]
+        for name, speed in sorted(speeds.items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"{ALGORITHMS.get(name, name):<10} {speed:>10.1f} MB/s")
+        self.text_edit.setPlainText("\n".join(lines))
+    
+    def get_cache(self):
+        """按需打开缓存数据库，未勾选使用缓存时返回None"""
+        if not self.use_cache_check.isChecked():
+            return None
+        if self.hash_cache is None:
+            try:
+                max_entries = self.settings.value("max_entries", DEFAULT_CACHE_ENTRIES, type=int)
+                self.hash_cache = HashCache(max_entries=max_entries)
+            except Exception as e:
+                print(f"Error opening hash cache: {e}")
+                return None
+        return self.hash_cache
+    
+    def clear_cache(self):
+        try:
+            if self.hash_thread is not None:
+                QMessageBox.warning(self, "警告", "请等待当前计算完成后再清空缓存")
+                return
+            cache = self.hash_cache or HashCache()
+            cache.clear()
+            self.hash_cache = cache
+            QMessageBox.information(self, "成功", "哈希缓存已清空")
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"清空缓存时出错: {str(e)}")
+    
+    def start_thread(self, thread, result_slot):
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.speed_label.setText("")
+        self.cancel_btn.setVisible(True)
+        for button in self.action_buttons:
+            button.setEnabled(False)
+        
+        self.hash_thread = thread
+        self.hash_thread.progress_signal.connect(self.update_progress)
+        self.hash_thread.result_signal.connect(result_slot)
+        self.hash_thread.error_signal.connect(self.show_error)
+        self.hash_thread.finished.connect(self.hash_finished)
+        self.hash_thread.start()
+    
+    def update_progress(self, permille, speed):
+        self.progress_bar.setValue(permille)
+        self.speed_label.setText(f"{speed:.1f} MB/s")
+    
+    def show_result(self, digests):
+        self.digests = digests
+        lines = [f"文件: {self.current_file}", ""]
+        lines.extend(f"{ALGORITHMS.get(name, name)}: {digest}" for name, digest in digests.items())
+        result = "\n".join(lines)
+        if self.hash_thread is not None and self.hash_thread.from_cache:
+            result += "\n\n（结果来自缓存）"
+        self.text_edit.setPlainText(result)
+        self.update_copy_buttons(digests)
+    
+    def show_batch_result(self, results):
+        self.batch_results = results
+        errors = [item for item in results if item[2] is None]
+        lines = [f"文件夹: {self.batch_root}",
+                 f"共 {len(results)} 个文件，失败 {len(errors)} 个，缓存命中 {self.hash_thread.cache_hits} 个", ""]
+        # 文件过多时只显示前面部分，完整结果请导出清单
+        algorithm = self.manifest_algorithm()
+        for file_path, _, digests, error in results[:1000]:
+            name = manifest_name(file_path, self.batch_root)
+            lines.append(f"{digests[algorithm]}  {name}" if digests else f"错误: {name}: {error}")
+        if len(results) > 1000:
+            lines.append(f"... 其余 {len(results) - 1000} 个文件请导出清单查看")
+        self.text_edit.setPlainText("\n".join(lines))
+        self.export_btn.setEnabled(bool(results))
+    
+    def manifest_algorithm(self):
+        """清单使用的算法：优先SHA256，否则使用第一个选中的算法"""
+        return "sha256" if "sha256" in self.batch_algorithms else self.batch_algorithms[0]
+    
+    def export_manifest(self):
+        try:
+            if not self.batch_results:
+                QMessageBox.warning(self, "警告", "请先选择文件夹计算哈希值")
+                return
+            algorithm = self.manifest_algorithm()
+            label = ALGORITHMS.get(algorithm, algorithm)
+            output_path, selected_filter = QFileDialog.getSaveFileName(
+                self, "导出清单", os.path.join(self.batch_root, f"{label}SUMS"),
+                f"{label}清单 (*.{algorithm} {label}SUMS);;JSON报告 (*.json)"
+            )
+            if not output_path:
+                return
+            if output_path.lower().endswith(".json") or "json" in selected_filter.lower():
+                if not output_path.lower().endswith(".json"):
+                    output_path += ".json"
+                write_json_report(self.batch_results, self.batch_root, output_path)
+            else:
+                write_manifest(self.batch_results, self.batch_root, output_path, algorithm)
+            QMessageBox.information(self, "成功", f"清单已导出到: {output_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"导出清单时出错: {str(e)}")
+    
+    def show_error(self, message):
+        self.text_edit.setPlainText("计算失败")
+        QMessageBox.critical(self, "错误", f"计算哈希值时出错: {message}")
+    
+    def cancel_hash(self):
+        """取消计算，界面立即恢复，后台线程在当前块结束后退出"""
+        if self.hash_thread is None:
+            return
+        self.hash_thread.cancel()
+        self.hash_thread.result_signal.disconnect()
+        self.hash_thread.progress_signal.disconnect()
+        self.text_edit.setPlainText("已取消计算")
+        self.progress_bar.setVisible(False)
+        self.speed_label.setText("")
+        self.cancel_btn.setVisible(False)
+    
+    def hash_finished(self):
+        self.hash_thread.wait()
+        self.hash_thread = None
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        for button in self.action_buttons:
+            button.setEnabled(True)
     
-    def copy_sha256(self):
+    def copy_digest(self, name):
+        label = ALGORITHMS.get(name, name)
         try:
-            if not self.sha256_hash:
+            if not self.digests.get(name):
                 QMessageBox.warning(self, "警告", "请先选择文件计算哈希值")
                 return
-            pyperclip.copy(self.sha256_hash)
-            QMessageBox.information(self, "成功", "SHA256哈希值已复制到剪贴板")
+            pyperclip.copy(self.digests[name])
+            QMessageBox.information(self, "成功", f"{label}哈希值已复制到剪贴板")
         except Exception as e:
-            QMessageBox.critical(self, "错误", f"复制SHA256值时出错: {str(e)}") 
\ No newline at end of file
+            QMessageBox.critical(self, "错误", f"复制{label}值时出错: {str(e)}")
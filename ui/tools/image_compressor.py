@@ -1,10 +1,572 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, 
                             QLabel, QPushButton, QFileDialog, 
-                            QSlider, QMessageBox, QProgressBar)
-from PyQt6.QtGui import QFont, QPixmap
-from PyQt6.QtCore import Qt
-from PIL import Image
+                            QSlider, QMessageBox, QProgressBar,
+                            QGroupBox, QLineEdit, QComboBox, QCheckBox, QSpinBox,
+                            QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt6.QtGui import QFont, QPixmap, QImage
+from PyQt6.QtCore import Qt, QThread, QSettings, pyqtSignal
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError, features
+from functools import lru_cache
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import shutil
+import subprocess
+import time
+
+try:
+    # Pillow编译时带有libavif才支持AVIF输出
+    from PIL import AvifImagePlugin  # noqa: F401
+    AVIF_AVAILABLE = features.check_module("avif")
+except (ImportError, ValueError):
+    AVIF_AVAILABLE = False
+
+# 批量模式支持的输入格式
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp", ".tif", ".tiff")
+# 输出格式 -> 文件扩展名
+FORMAT_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp"}
+if AVIF_AVAILABLE:
+    FORMAT_EXTENSIONS["AVIF"] = "avif"
+# 文件扩展名 -> 输出格式
+EXTENSION_FORMATS = {f".{ext}": fmt for fmt, ext in FORMAT_EXTENSIONS.items()}
+EXTENSION_FORMATS[".jpeg"] = "JPEG"
+# 目标大小模式支持的有损格式
+TARGET_SIZE_FORMATS = tuple(fmt for fmt in ("JPEG", "WEBP", "AVIF") if fmt in FORMAT_EXTENSIONS)
+# 缩放时可选的重采样算法
+RESAMPLING_FILTERS = {
+    "LANCZOS": "Lanczos（质量最好）",
+    "BICUBIC": "双三次",
+    "BILINEAR": "双线性",
+    "BOX": "Box（速度快）",
+    "NEAREST": "最近邻（最快）",
+}
+# 编码选项的默认值
+DEFAULT_OPTIONS = {
+    "max_dimension": 0,         # 最大边长，0表示不缩放
+    "resample": "LANCZOS",
+    "progressive": True,        # 渐进式JPEG
+    "png_palette": False,       # PNG调色板量化
+    "png_colors": 256,
+    "png_compress_level": 6,
+    "auto_orient": True,        # 按EXIF方向信息旋转图片
+    "keep_exif": False,
+    "keep_icc": True,           # 去掉ICC配置文件会导致广色域图片偏色，默认保留
+    "keep_xmp": False,
+    "lossless_jpeg": False,     # JPEG输入输出且无需缩放旋转时不重新编码
+}
+# 元数据选项 -> Image.info 中的键
+METADATA_KEYS = {"keep_exif": "exif", "keep_icc": "icc_profile", "keep_xmp": "xmp"}
+# 系统中的jpegtran，用于不解码像素重建哈夫曼表
+JPEGTRAN_PATH = shutil.which("jpegtran")
+# 输出文件已存在时的处理方式
+OVERWRITE_RULES = {"skip": "跳过已存在的文件", "overwrite": "覆盖已存在的文件", "rename": "自动重命名"}
+DEFAULT_OUTPUT_TEMPLATE = "{name}_compressed.{ext}"
+# 预览区域的最大尺寸
+PREVIEW_SIZE = (300, 200)
+# 输出缓存的默认容量上限（MB）
+DEFAULT_CACHE_MAX_MB = 1024
+
+def collect_images(paths, recursive=False):
+    """展开文件夹，返回 [(图片路径, 相对于所在根目录的子目录), ...]"""
+    images = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, dirnames, filenames in os.walk(path):
+                if not recursive:
+                    dirnames.clear()
+                rel_dir = os.path.relpath(directory, path)
+                for filename in sorted(filenames):
+                    if filename.lower().endswith(IMAGE_EXTENSIONS):
+                        images.append((os.path.join(directory, filename), "" if rel_dir == "." else rel_dir))
+        elif path.lower().endswith(IMAGE_EXTENSIONS):
+            images.append((path, ""))
+    return images
+
+def output_format_for(source, output_format):
+    """output_format 为 None 时保持原格式（无法保持的格式统一输出为JPEG）"""
+    if output_format:
+        return output_format
+    return EXTENSION_FORMATS.get(os.path.splitext(source)[1].lower(), "JPEG")
+
+def build_output_path(source, rel_dir, output_dir, template, output_format, index):
+    """根据模板生成输出路径，支持 {name} {ext} {index} {parent} 占位符"""
+    name = os.path.splitext(os.path.basename(source))[0]
+    filename = template.format(name=name, ext=FORMAT_EXTENSIONS[output_format], index=index,
+                               parent=os.path.basename(os.path.dirname(source)))
+    return os.path.join(output_dir, rel_dir, filename)
+
+def resolve_conflict(output_path, rule, reserved):
+    """按覆盖规则处理已存在（或本批次已占用）的输出路径，跳过时返回 None"""
+    if not os.path.exists(output_path) and output_path not in reserved:
+        return output_path
+    if rule == "overwrite" and output_path not in reserved:
+        return output_path
+    if rule == "skip":
+        return None
+    base, ext = os.path.splitext(output_path)
+    counter = 1
+    while os.path.exists(f"{base}_{counter}{ext}") or f"{base}_{counter}{ext}" in reserved:
+        counter += 1
+    return f"{base}_{counter}{ext}"
+
+def prepare_for_format(img, output_format):
+    """JPEG不支持透明通道和调色板，保存前转换为RGB"""
+    if output_format == "JPEG" and img.mode not in ("RGB", "L"):
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img, mask=img.getchannel("A"))
+            return background
+        return img.convert("RGB")
+    return img
+
+def resize_image(img, max_dimension, resample="LANCZOS"):
+    """按最大边长等比缩小，未加载的JPEG先用draft在解码阶段缩小"""
+    if not max_dimension or max(img.size) <= max_dimension:
+        return img
+    scale = max_dimension / max(img.size)
+    size = (max(round(img.width * scale), 1), max(round(img.height * scale), 1))
+    if img.format == "JPEG" and img.mode in ("RGB", "L"):
+        img.draft(img.mode, size)
+    return img.resize(size, Image.Resampling[resample], reducing_gap=3.0)
+
+def apply_options(img, output_format, options=None):
+    """按编码选项处理图片：缩放、按EXIF方向旋转、转换颜色模式、PNG调色板量化"""
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    source = img
+    img = resize_image(img, options["max_dimension"], options["resample"])
+    if options["auto_orient"]:
+        # 在缩放之后旋转，处理的像素更少；旋转后的EXIF方向标记会被重置
+        img = ImageOps.exif_transpose(img)
+    metadata = {key: img.info[key] for key in METADATA_KEYS.values() if key in img.info}
+    img = prepare_for_format(img, output_format)
+    if output_format == "PNG" and options["png_palette"] and img.mode != "P":
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+        # 带透明通道的图片只能使用八叉树量化
+        method = Image.Quantize.FASTOCTREE if img.mode == "RGBA" else Image.Quantize.MEDIANCUT
+        img = img.quantize(colors=options["png_colors"], method=method)
+    if img is not source:
+        # 转换为RGB时新建的背景图不带元数据，补回旋转后的元数据
+        img.info.update(metadata)
+    return img
+
+def metadata_options(img, options):
+    """按保留选项从图片中取出元数据；不保留ICC时显式传None，避免PNG自动沿用原图的配置文件"""
+    kwargs = {}
+    for option, key in METADATA_KEYS.items():
+        if options[option] and img.info.get(key):
+            kwargs[key] = img.info[key]
+    if "icc_profile" not in kwargs:
+        kwargs["icc_profile"] = None
+    return kwargs
+
+def save_options(output_format, quality, options=None, img=None):
+    """生成传给 Image.save 的格式相关参数，传入 img 时同时带上要保留的元数据"""
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    kwargs = metadata_options(img, options) if img is not None else {}
+    if output_format == "JPEG":
+        kwargs.update(quality=quality, optimize=True, progressive=options["progressive"])
+        if not options["keep_exif"]:
+            # Pillow会自动写回原图 info 中的COM注释，与 strip_jpeg_metadata 一致随EXIF一起去除
+            kwargs["comment"] = b""
+    elif output_format == "PNG":
+        # PNG是无损格式，quality无效；optimize会强制使用最高压缩级别
+        level = options["png_compress_level"]
+        kwargs.update(compress_level=level, optimize=level >= 9)
+    elif output_format == "WEBP":
+        kwargs.update(quality=quality, method=4)
+    elif output_format == "AVIF":
+        kwargs.update(quality=quality, speed=6)
+    else:
+        kwargs.update(quality=quality)
+    return kwargs
+
+def strip_jpeg_metadata(data, keep_exif=False, keep_icc=True, keep_xmp=False):
+    """直接在JPEG段结构上删除元数据，不解码也不改动图像数据"""
+    if data[:2] != b"\xff\xd8":
+        raise ValueError("不是有效的JPEG数据")
+    output = [data[:2]]
+    pos = 2
+    while pos < len(data):
+        if data[pos] != 0xFF:
+            raise ValueError("JPEG段结构损坏")
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # 段之间允许填充0xFF
+            pos += 1
+            continue
+        if marker == 0xDA:
+            # 从第一个扫描段开始的压缩数据原样保留
+            output.append(data[pos:])
+            break
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            output.append(data[pos:pos + 2])
+            pos += 2
+            continue
+        end = pos + 2 + int.from_bytes(data[pos + 2:pos + 4], "big")
+        segment = data[pos:end]
+        payload = segment[4:]
+        if marker == 0xE1 and payload.startswith(b"Exif\0"):
+            keep = keep_exif
+        elif marker == 0xE1 and payload.startswith((b"http://ns.adobe.com/xap/1.0/\0",
+                                                    b"http://ns.adobe.com/xmp/extension/\0")):
+            keep = keep_xmp
+        elif marker == 0xE2 and payload.startswith(b"ICC_PROFILE\0"):
+            keep = keep_icc
+        elif marker in (0xE0, 0xEE):
+            # JFIF和Adobe段影响颜色解释，必须保留
+            keep = True
+        elif 0xE1 <= marker <= 0xEF or marker == 0xFE:
+            # 其余APP段（IPTC、MPF、厂商数据）和注释随EXIF一起处理
+            keep = keep_exif
+        else:
+            keep = True
+        if keep:
+            output.append(segment)
+        pos = end
+    return b"".join(output)
+
+def lossless_jpeg(data, options):
+    """不解码像素优化JPEG：有jpegtran时重建最优哈夫曼表，否则只删除元数据段"""
+    if JPEGTRAN_PATH:
+        args = [JPEGTRAN_PATH, "-copy", "all", "-optimize"]
+        if options["progressive"]:
+            args.append("-progressive")
+        data = subprocess.run(args, input=data, capture_output=True, check=True).stdout
+    return strip_jpeg_metadata(data, options["keep_exif"], options["keep_icc"], options["keep_xmp"])
+
+def can_copy_jpeg(img, options):
+    """JPEG无损路径只在无需缩放、无需按EXIF旋转时可用"""
+    if not options["lossless_jpeg"] or img.format != "JPEG":
+        return False
+    if options["max_dimension"] and max(img.size) > options["max_dimension"]:
+        return False
+    orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+    return not (options["auto_orient"] and orientation != 1)
+
+def compress_bytes(data, output_format, quality, options=None):
+    """压缩内存中的图片文件内容，返回输出文件内容；满足条件的JPEG走无损优化路径"""
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    with Image.open(io.BytesIO(data)) as img:
+        if output_format == "JPEG" and can_copy_jpeg(img, options):
+            return lossless_jpeg(data, options)
+        img = apply_options(img, output_format, options)
+        return encode_image(img, output_format, quality, options)
+
+def default_output_cache_dir():
+    """输出缓存目录放在与QSettings配置文件相同的目录下"""
+    settings = QSettings(QSettings.Format.IniFormat, QSettings.Scope.UserScope, "ToolsApp", "ImageCache")
+    return os.path.join(os.path.dirname(settings.fileName()), "image_cache")
+
+def output_cache_key(data, output_format, quality, options):
+    """源文件内容与编码参数的SHA-256，两者都相同时输出结果必然相同"""
+    params = json.dumps({"format": output_format, "quality": quality, "options": options or {}},
+                        sort_keys=True)
+    digest = hashlib.sha256(data)
+    digest.update(b"\0" + params.encode("utf-8"))
+    return digest.hexdigest()
+
+def output_cache_path(cache_dir, key, output_format):
+    """按键的前两位分子目录，避免单个目录下文件过多"""
+    return os.path.join(cache_dir, key[:2], f"{key}.{FORMAT_EXTENSIONS[output_format]}")
+
+def write_replace(path, data):
+    """先写入临时文件再原子替换目标，目标总是得到新的inode
+    
+    输出文件和缓存条目不能共用同一个inode（硬链接），否则原地改写其中一个会同时改掉另一个。
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def evict_output_cache(cache_dir, max_bytes):
+    """按最近使用时间淘汰缓存文件，直到总大小不超过 max_bytes，返回删除的文件数"""
+    if not os.path.isdir(cache_dir):
+        return 0
+    entries = []
+    total = 0
+    for subdir in os.scandir(cache_dir):
+        if not subdir.is_dir():
+            continue
+        for entry in os.scandir(subdir.path):
+            if entry.is_file():
+                stat_result = entry.stat()
+                entries.append((stat_result.st_mtime, stat_result.st_size, entry.path))
+                total += stat_result.st_size
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+def compress_file(source, output_path, output_format, quality, options=None, cache_dir=None):
+    """在子进程中压缩一张图片，返回 (源路径, 输出路径, 原始大小, 压缩后大小, 错误信息, 是否命中缓存)
+    
+    指定 cache_dir 时先按源文件内容和编码参数查找输出缓存，命中则直接复制已有结果而不重新编码"""
+    original_size = 0
+    try:
+        with open(source, "rb") as f:
+            data = f.read()
+        original_size = len(data)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        cache_path = None
+        if cache_dir:
+            cache_path = output_cache_path(cache_dir, output_cache_key(data, output_format, quality, options),
+                                           output_format)
+            try:
+                with open(cache_path, "rb") as f:
+                    output = f.read()
+            except OSError:
+                output = None
+            if output is not None:
+                # 更新修改时间，淘汰时按最近使用排序
+                os.utime(cache_path)
+                write_replace(output_path, output)
+                return (source, output_path, original_size, len(output), "", True)
+        try:
+            output = compress_bytes(data, output_format, quality, options)
+        except UnidentifiedImageError:
+            # 从内存打开时Pillow的错误信息里没有文件名
+            raise UnidentifiedImageError(f"cannot identify image file {source!r}")
+        write_replace(output_path, output)
+        if cache_path:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                write_replace(cache_path, output)
+            except OSError:
+                pass  # 写入缓存失败不影响压缩结果
+        return (source, output_path, original_size, len(output), "", False)
+    except Exception as e:
+        return (source, output_path, original_size, 0, str(e), False)
+
+def read_image_info(file_path):
+    """只读取文件头获取尺寸和格式，不解码像素"""
+    with Image.open(file_path) as img:
+        return {"width": img.width, "height": img.height,
+                "format": img.format or "", "mode": img.mode}
+
+def load_preview(file_path, max_size=PREVIEW_SIZE):
+    """生成预览缩略图：JPEG使用draft在解码时直接缩小，其他格式由thumbnail按整数倍reduce"""
+    with Image.open(file_path) as img:
+        img.draft("RGB", max_size)
+        img.thumbnail(max_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+        preview = img.convert("RGBA")
+    data = preview.tobytes("raw", "RGBA")
+    return QImage(data, preview.width, preview.height, preview.width * 4,
+                  QImage.Format.Format_RGBA8888).copy()
+
+class PreviewThread(QThread):
+    """线程用于在后台读取图片信息并生成预览"""
+    info_signal = pyqtSignal(str, dict)
+    result_signal = pyqtSignal(str, QImage)
+    error_signal = pyqtSignal(str, str)
+    
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        
+    def run(self):
+        try:
+            # 先发送文件头信息，信息标签无需等待预览解码
+            self.info_signal.emit(self.file_path, read_image_info(self.file_path))
+            self.result_signal.emit(self.file_path, load_preview(self.file_path))
+        except Exception as e:
+            self.error_signal.emit(self.file_path, str(e))
+
+def encode_image(img, output_format, quality, options=None):
+    """将已按选项处理过的图片编码到内存中，返回编码后的字节"""
+    buffer = io.BytesIO()
+    img.save(buffer, format=output_format, **save_options(output_format, quality, options, img))
+    return buffer.getvalue()
+
+def compare_formats(img, quality, options=None, formats=None):
+    """用相同的质量和选项编码为各种格式，返回 [(格式, 大小, 编码耗时秒), ...]"""
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+    # 缩放只做一次，各格式共用缩放结果
+    img = resize_image(img, options["max_dimension"], options["resample"])
+    options["max_dimension"] = 0
+    results = []
+    for output_format in formats or FORMAT_EXTENSIONS:
+        start = time.perf_counter()
+        data = encode_image(apply_options(img, output_format, options), output_format, quality, options)
+        results.append((output_format, len(data), time.perf_counter() - start))
+    return results
+
+class FormatCompareThread(QThread):
+    """线程用于在后台对比各输出格式的大小和编码耗时"""
+    result_signal = pyqtSignal(list)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, source, quality, options):
+        super().__init__()
+        self.source = source
+        self.quality = quality
+        self.options = options
+        
+    def run(self):
+        try:
+            with Image.open(self.source) as img:
+                self.result_signal.emit(compare_formats(img, self.quality, self.options))
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+def search_quality_for_size(img, output_format, target_bytes, min_quality=5, max_quality=95,
+                            tolerance=0.05, progress_callback=None, options=None):
+    """查找不超过目标大小的最高质量，全部在内存中编码
+
+    编码大小随质量单调变化，按已知的上下界做插值猜测，插值收敛慢时退回二分；
+    结果与目标的差距在 tolerance 以内即提前结束。已编码过的质量会被复用，
+    返回 (质量, 编码数据, 编码次数, 是否达到目标)。
+    """
+    # 缩放和颜色转换只做一次，各次编码共用
+    img = apply_options(img, output_format, options)
+    encoded = {}
+    
+    def encode(quality):
+        if quality not in encoded:
+            encoded[quality] = encode_image(img, output_format, quality, options)
+            if progress_callback is not None:
+                progress_callback(len(encoded))
+        return encoded[quality]
+    
+    # 最高质量已满足目标时无需继续查找
+    if len(encode(max_quality)) <= target_bytes:
+        return max_quality, encoded[max_quality], len(encoded), True
+    
+    # low 为已知满足目标的质量（None 表示尚未找到），high 为已知超出目标的质量
+    low, high = None, max_quality
+    guess = (min_quality + max_quality) // 2
+    while True:
+        size = len(encode(guess))
+        if size <= target_bytes:
+            low = guess
+            if size >= target_bytes * (1 - tolerance):
+                break
+        else:
+            high = guess
+        lower = low if low is not None else min_quality - 1
+        if high - lower <= 1:
+            break
+        middle = (lower + high) // 2
+        if low is not None:
+            # 在 (low, high) 两个已知点之间按大小线性插值
+            low_size, high_size = len(encoded[low]), len(encoded[high])
+            guess = low + round((target_bytes - low_size) * (high - low) / max(high_size - low_size, 1))
+            guess = min(max(guess, low + 1), high - 1)
+            # 插值点离中点太远时使用二分，保证最坏情况下的收敛速度
+            if abs(guess - middle) > (high - low) // 4:
+                guess = middle
+        else:
+            guess = middle
+    if low is None:
+        # 最低质量仍超出目标，返回能得到的最小结果
+        return min_quality, encode(min_quality), len(encoded), False
+    return low, encoded[low], len(encoded), True
+
+@lru_cache(maxsize=None)
+def max_search_encodes(min_quality=5, max_quality=95):
+    """search_quality_for_size 在最坏情况下的编码次数，用作进度条的上限
+    
+    按与查找相同的规则枚举每一步可能的猜测（插值点限制在中点附近 1/4 区间内），
+    包括第一次的最高质量编码和最低质量的兜底编码。
+    """
+    @lru_cache(maxsize=None)
+    def worst(low, high):
+        lower = low if low is not None else min_quality - 1
+        if high - lower <= 1:
+            # 始终没有满足目标的质量时还要编码一次最低质量
+            return 1 if low is None else 0
+        middle = (lower + high) // 2
+        if low is None:
+            guesses = [middle]
+        else:
+            quarter = (high - low) // 4
+            guesses = range(max(middle - quarter, low + 1), min(middle + quarter, high - 1) + 1)
+        return max(1 + max(worst(guess, high), worst(low, guess)) for guess in guesses)
+    
+    first = (min_quality + max_quality) // 2
+    return 2 + max(worst(first, max_quality), worst(None, first))
+
+class TargetSizeThread(QThread):
+    """线程用于在后台查找满足目标大小的压缩质量"""
+    progress_signal = pyqtSignal(int)
+    result_signal = pyqtSignal(int, object, int, bool)  # 质量, 编码数据, 编码次数, 是否达到目标
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, source, output_format, target_bytes, options=None):
+        super().__init__()
+        self.source = source
+        self.output_format = output_format
+        self.target_bytes = target_bytes
+        self.options = options
+        
+    def run(self):
+        try:
+            with Image.open(self.source) as img:
+                result = search_quality_for_size(img, self.output_format, self.target_bytes,
+                                                 progress_callback=self.progress_signal.emit,
+                                                 options=self.options)
+            self.result_signal.emit(*result)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+class BatchCompressThread(QThread):
+    """线程用于调度进程池批量压缩图片"""
+    progress_signal = pyqtSignal(int, int, str)  # 已完成数量, 总数量, 当前文件名
+    result_signal = pyqtSignal(list)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, tasks, max_workers=None, cache_dir=None, cache_max_bytes=0):
+        super().__init__()
+        self.tasks = tasks
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.cancel_requested = False
+        
+    def cancel(self):
+        self.cancel_requested = True
+        
+    def run(self):
+        results = []
+        cancelled = False
+        # 在多线程的Qt进程中fork可能导致子进程死锁，统一使用spawn启动子进程
+        executor = ProcessPoolExecutor(max_workers=min(self.max_workers, max(len(self.tasks), 1)),
+                                       mp_context=multiprocessing.get_context("spawn"))
+        try:
+            pending = {executor.submit(compress_file, *task, cache_dir=self.cache_dir) for task in self.tasks}
+            while pending:
+                if self.cancel_requested:
+                    cancelled = True
+                    return
+                finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    results.append(result)
+                    self.progress_signal.emit(len(results), len(self.tasks), os.path.basename(result[0]))
+            if self.cache_dir and self.cache_max_bytes:
+                evict_output_cache(self.cache_dir, self.cache_max_bytes)
+            self.result_signal.emit(results)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+        finally:
+            executor.shutdown(wait=not cancelled, cancel_futures=True)
 
 class ImageCompressor(QDialog):
     def __init__(self, parent=None):
@@ -13,6 +575,12 @@ class ImageCompressor(QDialog):
         self.setMinimumSize(600, 500)
         self.setModal(True)
         self.selected_image = None
+        self.batch_paths = []
+        self.batch_thread = None
+        self.target_thread = None
+        self.preview_threads = []
+        self.compare_thread = None
+        self.cache_settings = QSettings("ImageCompressor", "Cache")
         self.init_ui()
         
     def init_ui(self):
@@ -54,47 +622,239 @@ class ImageCompressor(QDialog):
         
         layout.addLayout(quality_layout)
         
+        # 目标大小模式
+        target_layout = QHBoxLayout()
+        self.target_check = QCheckBox("目标大小模式（仅JPEG/WebP/AVIF，自动查找质量）")
+        self.target_check.toggled.connect(lambda checked: self.quality_slider.setEnabled(not checked))
+        target_layout.addWidget(self.target_check)
+        
+        self.target_spin = QSpinBox()
+        self.target_spin.setRange(1, 100000)
+        self.target_spin.setValue(500)
+        self.target_spin.setSuffix(" KB")
+        target_layout.addWidget(self.target_spin)
+        target_layout.addStretch()
+        
+        layout.addLayout(target_layout)
+        
+        # 输出选项
+        options_group = QGroupBox("输出选项")
+        options_layout = QVBoxLayout(options_group)
+        
+        resize_layout = QHBoxLayout()
+        resize_layout.addWidget(QLabel("最大边长:"))
+        self.max_dimension_spin = QSpinBox()
+        self.max_dimension_spin.setRange(0, 20000)
+        self.max_dimension_spin.setSingleStep(100)
+        self.max_dimension_spin.setSpecialValueText("不缩放")
+        self.max_dimension_spin.setSuffix(" px")
+        resize_layout.addWidget(self.max_dimension_spin)
+        
+        resize_layout.addWidget(QLabel("缩放算法:"))
+        self.resample_combo = QComboBox()
+        for name, label in RESAMPLING_FILTERS.items():
+            self.resample_combo.addItem(label, name)
+        resize_layout.addWidget(self.resample_combo)
+        resize_layout.addStretch()
+        options_layout.addLayout(resize_layout)
+        
+        format_options_layout = QHBoxLayout()
+        self.progressive_check = QCheckBox("渐进式JPEG")
+        self.progressive_check.setChecked(DEFAULT_OPTIONS["progressive"])
+        format_options_layout.addWidget(self.progressive_check)
+        
+        self.png_palette_check = QCheckBox("PNG调色板量化")
+        format_options_layout.addWidget(self.png_palette_check)
+        self.png_colors_spin = QSpinBox()
+        self.png_colors_spin.setRange(2, 256)
+        self.png_colors_spin.setValue(DEFAULT_OPTIONS["png_colors"])
+        self.png_colors_spin.setSuffix(" 色")
+        format_options_layout.addWidget(self.png_colors_spin)
+        
+        format_options_layout.addWidget(QLabel("PNG压缩级别:"))
+        self.png_level_spin = QSpinBox()
+        self.png_level_spin.setRange(0, 9)
+        self.png_level_spin.setValue(DEFAULT_OPTIONS["png_compress_level"])
+        format_options_layout.addWidget(self.png_level_spin)
+        format_options_layout.addStretch()
+        options_layout.addLayout(format_options_layout)
+        
+        metadata_layout = QHBoxLayout()
+        self.auto_orient_check = QCheckBox("按EXIF方向旋转")
+        self.auto_orient_check.setChecked(DEFAULT_OPTIONS["auto_orient"])
+        metadata_layout.addWidget(self.auto_orient_check)
+        
+        metadata_layout.addWidget(QLabel("保留:"))
+        self.keep_exif_check = QCheckBox("EXIF")
+        self.keep_exif_check.setChecked(DEFAULT_OPTIONS["keep_exif"])
+        metadata_layout.addWidget(self.keep_exif_check)
+        self.keep_icc_check = QCheckBox("ICC")
+        self.keep_icc_check.setChecked(DEFAULT_OPTIONS["keep_icc"])
+        metadata_layout.addWidget(self.keep_icc_check)
+        self.keep_xmp_check = QCheckBox("XMP")
+        self.keep_xmp_check.setChecked(DEFAULT_OPTIONS["keep_xmp"])
+        metadata_layout.addWidget(self.keep_xmp_check)
+        
+        self.lossless_jpeg_check = QCheckBox("JPEG无损优化")
+        self.lossless_jpeg_check.setToolTip(
+            "JPEG转JPEG且无需缩放和旋转时不重新编码，只删除元数据"
+            + ("并用jpegtran重建哈夫曼表" if JPEGTRAN_PATH else "（安装jpegtran后可同时重建哈夫曼表）"))
+        metadata_layout.addWidget(self.lossless_jpeg_check)
+        metadata_layout.addStretch()
+        options_layout.addLayout(metadata_layout)
+        
+        # 格式对比
+        self.compare_btn = QPushButton("对比各格式大小")
+        self.compare_btn.clicked.connect(self.compare_formats)
+        options_layout.addWidget(self.compare_btn)
+        
+        self.compare_table = QTableWidget(0, 4)
+        self.compare_table.setHorizontalHeaderLabels(["格式", "大小", "相对原图", "编码耗时"])
+        self.compare_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.compare_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.compare_table.setVisible(False)
+        options_layout.addWidget(self.compare_table)
+        
+        layout.addWidget(options_group)
+        
         # 压缩按钮
-        compress_btn = QPushButton("压缩图片")
-        compress_btn.clicked.connect(self.compress_image)
-        layout.addWidget(compress_btn)
+        self.compress_btn = QPushButton("压缩图片")
+        self.compress_btn.clicked.connect(self.compress_image)
+        layout.addWidget(self.compress_btn)
         
         # 进度条
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
         layout.addWidget(self.progress_bar)
         
+        # 批量压缩区域
+        batch_group = QGroupBox("批量压缩")
+        batch_layout = QVBoxLayout(batch_group)
+        
+        source_layout = QHBoxLayout()
+        select_folder_btn = QPushButton("选择文件夹")
+        select_folder_btn.clicked.connect(self.select_batch_folder)
+        source_layout.addWidget(select_folder_btn)
+        
+        select_files_btn = QPushButton("选择多个图片")
+        select_files_btn.clicked.connect(self.select_batch_files)
+        source_layout.addWidget(select_files_btn)
+        
+        self.recursive_check = QCheckBox("包含子文件夹")
+        source_layout.addWidget(self.recursive_check)
+        source_layout.addStretch()
+        batch_layout.addLayout(source_layout)
+        
+        self.batch_info = QLabel("未选择批量图片")
+        batch_layout.addWidget(self.batch_info)
+        
+        output_layout = QHBoxLayout()
+        output_layout.addWidget(QLabel("输出目录:"))
+        self.output_dir_input = QLineEdit()
+        self.output_dir_input.setPlaceholderText("留空则输出到原图所在目录")
+        output_layout.addWidget(self.output_dir_input, 1)
+        output_dir_btn = QPushButton("浏览")
+        output_dir_btn.clicked.connect(self.select_output_dir)
+        output_layout.addWidget(output_dir_btn)
+        batch_layout.addLayout(output_layout)
+        
+        template_layout = QHBoxLayout()
+        template_layout.addWidget(QLabel("文件名模板:"))
+        self.template_input = QLineEdit(DEFAULT_OUTPUT_TEMPLATE)
+        self.template_input.setToolTip("{name}: 原文件名  {ext}: 输出扩展名  {index}: 序号  {parent}: 所在文件夹名")
+        template_layout.addWidget(self.template_input, 1)
+        
+        self.batch_format_combo = QComboBox()
+        self.batch_format_combo.addItem("保持原格式", None)
+        for output_format in FORMAT_EXTENSIONS:
+            self.batch_format_combo.addItem(output_format, output_format)
+        template_layout.addWidget(self.batch_format_combo)
+        
+        self.overwrite_combo = QComboBox()
+        for rule, label in OVERWRITE_RULES.items():
+            self.overwrite_combo.addItem(label, rule)
+        template_layout.addWidget(self.overwrite_combo)
+        batch_layout.addLayout(template_layout)
+        
+        cache_layout = QHBoxLayout()
+        self.use_cache_check = QCheckBox("使用输出缓存（内容和参数未变化的图片直接复用上次结果）")
+        self.use_cache_check.setChecked(self.cache_settings.value("enabled", True, type=bool))
+        self.use_cache_check.toggled.connect(lambda checked: self.cache_settings.setValue("enabled", checked))
+        cache_layout.addWidget(self.use_cache_check)
+        cache_layout.addStretch()
+        
+        cache_layout.addWidget(QLabel("上限(MB):"))
+        self.cache_size_spin = QSpinBox()
+        self.cache_size_spin.setRange(16, 1024 * 1024)
+        self.cache_size_spin.setValue(self.cache_settings.value("max_mb", DEFAULT_CACHE_MAX_MB, type=int))
+        self.cache_size_spin.valueChanged.connect(lambda value: self.cache_settings.setValue("max_mb", value))
+        cache_layout.addWidget(self.cache_size_spin)
+        
+        clear_cache_btn = QPushButton("清空缓存")
+        clear_cache_btn.clicked.connect(self.clear_output_cache)
+        cache_layout.addWidget(clear_cache_btn)
+        batch_layout.addLayout(cache_layout)
+        
+        batch_btn_layout = QHBoxLayout()
+        self.batch_btn = QPushButton("开始批量压缩")
+        self.batch_btn.clicked.connect(self.compress_batch)
+        batch_btn_layout.addWidget(self.batch_btn)
+        
+        self.batch_cancel_btn = QPushButton("取消")
+        self.batch_cancel_btn.clicked.connect(self.cancel_batch)
+        self.batch_cancel_btn.setVisible(False)
+        batch_btn_layout.addWidget(self.batch_cancel_btn)
+        batch_layout.addLayout(batch_btn_layout)
+        
+        layout.addWidget(batch_group)
+        
         # 质量滑块变化事件
         self.quality_slider.valueChanged.connect(self.update_quality_label)
         
     def select_image(self):
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "选择图片", "", "图像文件 (*.jpg *.jpeg *.png *.bmp)"
+            self, "选择图片", "", "图像文件 (*.jpg *.jpeg *.png *.bmp *.webp *.tif *.tiff)"
         )
         
         if file_path:
             self.selected_image = file_path
+            self.image_preview.setText("正在加载预览...")
+            self.image_info.setText(f"文件: {os.path.basename(file_path)}")
             
-            # 显示图片预览
-            pixmap = QPixmap(file_path)
-            if not pixmap.isNull():
-                pixmap = pixmap.scaled(300, 200, Qt.AspectRatioMode.KeepAspectRatio)
-                self.image_preview.setPixmap(pixmap)
-                
-                # 显示图片信息
-                try:
-                    img = Image.open(file_path)
-                    file_size = os.path.getsize(file_path) / 1024  # KB
-                    info = f"文件: {os.path.basename(file_path)}\n"
-                    info += f"尺寸: {img.width} x {img.height} 像素\n"
-                    info += f"大小: {file_size:.2f} KB"
-                    self.image_info.setText(info)
-                except Exception as e:
-                    self.image_info.setText(f"无法读取图片信息: {str(e)}")
-            else:
-                self.image_preview.setText("预览失败")
-                self.image_info.setText(f"文件: {os.path.basename(file_path)}")
-                
+            # 在后台读取文件头并生成缩略图，大图也不会阻塞界面
+            thread = PreviewThread(file_path)
+            thread.info_signal.connect(self.show_image_info)
+            thread.result_signal.connect(self.show_preview)
+            thread.error_signal.connect(self.show_preview_error)
+            thread.finished.connect(lambda: self.preview_finished(thread))
+            self.preview_threads.append(thread)
+            thread.start()
+    
+    def show_image_info(self, file_path, info):
+        # 忽略已被新选择替换的图片
+        if file_path != self.selected_image:
+            return
+        file_size = os.path.getsize(file_path) / 1024  # KB
+        text = f"文件: {os.path.basename(file_path)}\n"
+        text += f"尺寸: {info['width']} x {info['height']} 像素\n"
+        text += f"大小: {file_size:.2f} KB"
+        self.image_info.setText(text)
+    
+    def show_preview(self, file_path, image):
+        if file_path != self.selected_image:
+            return
+        self.image_preview.setPixmap(QPixmap.fromImage(image))
+    
+    def show_preview_error(self, file_path, message):
+        if file_path != self.selected_image:
+            return
+        self.image_preview.setText("预览失败")
+        self.image_info.setText(f"无法读取图片信息: {message}")
+    
+    def preview_finished(self, thread):
+        thread.wait()
+        self.preview_threads.remove(thread)
+    
     def update_quality_label(self, value):
         self.quality_value.setText(f"{value}%")
         
@@ -103,19 +863,25 @@ class ImageCompressor(QDialog):
             QMessageBox.warning(self, "警告", "请先选择图片")
             return
             
-        output_path, _ = QFileDialog.getSaveFileName(
-            self, "保存压缩后的图片", "", "JPEG图像 (*.jpg);;PNG图像 (*.png)"
-        )
+        filters = "JPEG图像 (*.jpg);;PNG图像 (*.png);;WebP图像 (*.webp)"
+        if AVIF_AVAILABLE:
+            filters += ";;AVIF图像 (*.avif)"
+        output_path, _ = QFileDialog.getSaveFileName(self, "保存压缩后的图片", "", filters)
         
         if not output_path:
             return
+        
+        if self.target_check.isChecked():
+            self.compress_to_target(output_path)
+            return
             
         try:
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(10)
             
-            # 打开图片
-            img = Image.open(self.selected_image)
+            # 读取图片文件内容
+            with open(self.selected_image, "rb") as f:
+                data = f.read()
             
             self.progress_bar.setValue(30)
             
@@ -123,33 +889,263 @@ class ImageCompressor(QDialog):
             quality = self.quality_slider.value()
             
             # 确定输出格式
-            if output_path.lower().endswith('.png'):
-                format = 'PNG'
-            else:
+            format = EXTENSION_FORMATS.get(os.path.splitext(output_path)[1].lower())
+            if format is None:
                 format = 'JPEG'
-                if not output_path.lower().endswith('.jpg') and not output_path.lower().endswith('.jpeg'):
-                    output_path += '.jpg'
+                output_path += '.jpg'
                     
             self.progress_bar.setValue(60)
             
             # 保存压缩后的图片
-            img.save(output_path, format=format, quality=quality, optimize=True)
+            output = compress_bytes(data, format, quality, self.encode_options())
+            with open(output_path, "wb") as f:
+                f.write(output)
             
             self.progress_bar.setValue(100)
             
             # 显示压缩结果
-            original_size = os.path.getsize(self.selected_image) / 1024  # KB
-            compressed_size = os.path.getsize(output_path) / 1024  # KB
-            
-            result = f"压缩完成!\n"
-            result += f"原始大小: {original_size:.2f} KB\n"
-            result += f"压缩后大小: {compressed_size:.2f} KB\n"
-            result += f"节省空间: {(original_size - compressed_size):.2f} KB "
-            result += f"({(1 - compressed_size/original_size) * 100:.1f}%)"
-            
-            QMessageBox.information(self, "压缩成功", result)
+            self.show_compress_result(output_path)
             
         except Exception as e:
             QMessageBox.critical(self, "错误", f"压缩图片时出错: {str(e)}")
         finally:
-            self.progress_bar.setVisible(False) 
\ No newline at end of file
+            self.progress_bar.setVisible(False)
+    
+    def show_compress_result(self, output_path, extra=""):
+        original_size = os.path.getsize(self.selected_image) / 1024  # KB
+        compressed_size = os.path.getsize(output_path) / 1024  # KB
+        
+        result = f"压缩完成!\n"
+        result += f"原始大小: {original_size:.2f} KB\n"
+        result += f"压缩后大小: {compressed_size:.2f} KB\n"
+        result += f"节省空间: {(original_size - compressed_size):.2f} KB "
+        result += f"({(1 - compressed_size/original_size) * 100:.1f}%)"
+        result += extra
+        
+        QMessageBox.information(self, "压缩成功", result)
+    
+    def encode_options(self):
+        """从界面收集编码选项"""
+        return {
+            "max_dimension": self.max_dimension_spin.value(),
+            "resample": self.resample_combo.currentData(),
+            "progressive": self.progressive_check.isChecked(),
+            "png_palette": self.png_palette_check.isChecked(),
+            "png_colors": self.png_colors_spin.value(),
+            "png_compress_level": self.png_level_spin.value(),
+            "auto_orient": self.auto_orient_check.isChecked(),
+            "keep_exif": self.keep_exif_check.isChecked(),
+            "keep_icc": self.keep_icc_check.isChecked(),
+            "keep_xmp": self.keep_xmp_check.isChecked(),
+            "lossless_jpeg": self.lossless_jpeg_check.isChecked(),
+        }
+    
+    def compare_formats(self):
+        if not self.selected_image:
+            QMessageBox.warning(self, "警告", "请先选择图片")
+            return
+        self.compare_btn.setEnabled(False)
+        self.compare_btn.setText("正在对比...")
+        self.compare_thread = FormatCompareThread(self.selected_image, self.quality_slider.value(),
+                                                  self.encode_options())
+        self.compare_thread.result_signal.connect(self.show_format_comparison)
+        self.compare_thread.error_signal.connect(
+            lambda message: QMessageBox.critical(self, "错误", f"对比格式时出错: {message}"))
+        self.compare_thread.finished.connect(self.compare_finished)
+        self.compare_thread.start()
+    
+    def show_format_comparison(self, results):
+        original_size = os.path.getsize(self.selected_image)
+        self.compare_table.setRowCount(len(results))
+        # 按大小排序，最小的格式排在最前面
+        for row, (output_format, size, seconds) in enumerate(sorted(results, key=lambda item: item[1])):
+            self.compare_table.setItem(row, 0, QTableWidgetItem(output_format))
+            self.compare_table.setItem(row, 1, QTableWidgetItem(f"{size / 1024:.2f} KB"))
+            self.compare_table.setItem(row, 2, QTableWidgetItem(f"{size / original_size * 100:.1f}%"))
+            self.compare_table.setItem(row, 3, QTableWidgetItem(f"{seconds * 1000:.0f} ms"))
+        self.compare_table.setVisible(True)
+    
+    def compare_finished(self):
+        self.compare_thread.wait()
+        self.compare_thread = None
+        self.compare_btn.setEnabled(True)
+        self.compare_btn.setText("对比各格式大小")
+    
+    def compress_to_target(self, output_path):
+        """目标大小模式：在内存中查找质量，只把最终结果写入磁盘"""
+        output_format = EXTENSION_FORMATS.get(os.path.splitext(output_path)[1].lower())
+        if output_format is None:
+            output_format = 'JPEG'
+            output_path += '.jpg'
+        if output_format not in TARGET_SIZE_FORMATS:
+            QMessageBox.warning(self, "警告", "目标大小模式仅支持有损格式（JPEG/WebP/AVIF）")
+            return
+        
+        self.target_output = output_path
+        # 进度按编码次数计算，上限为查找在最坏情况下的编码次数
+        self.progress_bar.setRange(0, max_search_encodes())
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.compress_btn.setEnabled(False)
+        
+        self.target_thread = TargetSizeThread(self.selected_image, output_format,
+                                              self.target_spin.value() * 1024, self.encode_options())
+        self.target_thread.progress_signal.connect(self.progress_bar.setValue)
+        self.target_thread.result_signal.connect(self.save_target_result)
+        self.target_thread.error_signal.connect(
+            lambda message: QMessageBox.critical(self, "错误", f"压缩图片时出错: {message}"))
+        self.target_thread.finished.connect(self.target_finished)
+        self.target_thread.start()
+    
+    def save_target_result(self, quality, data, encode_count, reached):
+        # 查找通常提前结束，完成时把进度条补满
+        self.progress_bar.setValue(self.progress_bar.maximum())
+        try:
+            with open(self.target_output, 'wb') as f:
+                f.write(data)
+            extra = f"\n\n使用质量: {quality}（共编码 {encode_count} 次）"
+            if not reached:
+                extra += "\n注意: 最低质量下仍无法达到目标大小"
+            self.show_compress_result(self.target_output, extra)
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"保存图片时出错: {str(e)}")
+    
+    def target_finished(self):
+        self.target_thread.wait()
+        self.target_thread = None
+        self.progress_bar.setVisible(False)
+        self.progress_bar.setRange(0, 100)
+        self.compress_btn.setEnabled(True)
+    
+    def select_batch_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "选择图片文件夹")
+        if folder:
+            self.batch_paths = [folder]
+            self.batch_info.setText(f"文件夹: {folder}")
+    
+    def select_batch_files(self):
+        files, _ = QFileDialog.getOpenFileNames(
+            self, "选择图片", "", "图像文件 (*.jpg *.jpeg *.png *.bmp *.webp *.tif *.tiff)"
+        )
+        if files:
+            self.batch_paths = files
+            self.batch_info.setText(f"已选择 {len(files)} 个图片")
+    
+    def select_output_dir(self):
+        folder = QFileDialog.getExistingDirectory(self, "选择输出目录")
+        if folder:
+            self.output_dir_input.setText(folder)
+    
+    def build_batch_tasks(self):
+        """生成 (源路径, 输出路径, 格式, 质量, 编码选项) 任务列表，返回 (任务列表, 跳过数量)"""
+        images = collect_images(self.batch_paths, self.recursive_check.isChecked())
+        output_dir = self.output_dir_input.text().strip()
+        template = self.template_input.text().strip() or DEFAULT_OUTPUT_TEMPLATE
+        output_format = self.batch_format_combo.currentData()
+        rule = self.overwrite_combo.currentData()
+        quality = self.quality_slider.value()
+        options = self.encode_options()
+        
+        tasks = []
+        skipped = 0
+        reserved = set()
+        for index, (source, rel_dir) in enumerate(images, 1):
+            fmt = output_format_for(source, output_format)
+            target_dir = output_dir or os.path.dirname(source)
+            output_path = build_output_path(source, rel_dir if output_dir else "", target_dir,
+                                            template, fmt, index)
+            # 不允许覆盖源文件本身
+            if os.path.abspath(output_path) == os.path.abspath(source):
+                skipped += 1
+                continue
+            output_path = resolve_conflict(output_path, rule, reserved)
+            if output_path is None:
+                skipped += 1
+                continue
+            reserved.add(output_path)
+            tasks.append((source, output_path, fmt, quality, options))
+        return tasks, skipped
+    
+    def compress_batch(self):
+        if not self.batch_paths:
+            QMessageBox.warning(self, "警告", "请先选择图片文件夹或多个图片")
+            return
+        try:
+            tasks, skipped = self.build_batch_tasks()
+        except (KeyError, IndexError, ValueError) as e:
+            QMessageBox.warning(self, "警告", f"文件名模板无效: {str(e)}")
+            return
+        if not tasks:
+            QMessageBox.information(self, "提示", f"没有需要压缩的图片（跳过 {skipped} 个）")
+            return
+        
+        self.batch_skipped = skipped
+        self.progress_bar.setRange(0, len(tasks))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.batch_btn.setEnabled(False)
+        self.batch_cancel_btn.setVisible(True)
+        
+        if self.use_cache_check.isChecked():
+            self.batch_thread = BatchCompressThread(tasks, cache_dir=default_output_cache_dir(),
+                                                    cache_max_bytes=self.cache_size_spin.value() * 1024 * 1024)
+        else:
+            self.batch_thread = BatchCompressThread(tasks)
+        self.batch_thread.progress_signal.connect(self.update_batch_progress)
+        self.batch_thread.result_signal.connect(self.show_batch_summary)
+        self.batch_thread.error_signal.connect(
+            lambda message: QMessageBox.critical(self, "错误", f"批量压缩时出错: {message}"))
+        self.batch_thread.finished.connect(self.batch_finished)
+        self.batch_thread.start()
+    
+    def update_batch_progress(self, done, total, filename):
+        self.progress_bar.setValue(done)
+        self.batch_info.setText(f"正在压缩 {done}/{total}: {filename}")
+    
+    def show_batch_summary(self, results):
+        succeeded = [item for item in results if not item[4]]
+        failed = [item for item in results if item[4]]
+        original_size = sum(item[2] for item in succeeded)
+        compressed_size = sum(item[3] for item in succeeded)
+        saved = original_size - compressed_size
+        
+        summary = f"批量压缩完成!\n"
+        summary += f"成功: {len(succeeded)} 个，失败: {len(failed)} 个，跳过: {self.batch_skipped} 个\n"
+        if self.use_cache_check.isChecked():
+            summary += f"缓存命中: {sum(1 for item in succeeded if item[5])} 个\n"
+        summary += f"原始大小: {original_size / 1024:.2f} KB\n"
+        summary += f"压缩后大小: {compressed_size / 1024:.2f} KB\n"
+        summary += f"节省空间: {saved / 1024:.2f} KB"
+        if original_size:
+            summary += f" ({saved / original_size * 100:.1f}%)"
+        if failed:
+            summary += "\n\n失败的文件:\n" + "\n".join(
+                f"{os.path.basename(item[0])}: {item[4]}" for item in failed[:20])
+        self.batch_info.setText(f"批量压缩完成，节省 {saved / 1024:.2f} KB")
+        QMessageBox.information(self, "批量压缩完成", summary)
+    
+    def clear_output_cache(self):
+        if self.batch_thread is not None:
+            QMessageBox.warning(self, "警告", "请等待批量压缩完成后再清空缓存")
+            return
+        try:
+            shutil.rmtree(default_output_cache_dir(), ignore_errors=True)
+            QMessageBox.information(self, "成功", "输出缓存已清空")
+        except Exception as e:
+            QMessageBox.critical(self, "错误", f"清空缓存时出错: {str(e)}")
+    
+    def cancel_batch(self):
+        if self.batch_thread is None:
+            return
+        self.batch_thread.cancel()
+        self.batch_thread.result_signal.disconnect()
+        self.batch_thread.progress_signal.disconnect()
+        self.batch_info.setText("已取消批量压缩")
+    
+    def batch_finished(self):
+        self.batch_thread.wait()
+        self.batch_thread = None
+        self.progress_bar.setVisible(False)
+        self.progress_bar.setRange(0, 100)
+        self.batch_btn.setEnabled(True)
+        self.batch_cancel_btn.setVisible(False)
@@ -1,19 +1,298 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLineEdit, 
                             QPushButton, QLabel, QFileDialog, QMessageBox,
-                            QHBoxLayout, QFrame, QComboBox, QSpinBox, QDialog)
+                            QHBoxLayout, QFrame, QComboBox, QSpinBox, QDialog,
+                            QProgressBar)
 from PyQt6.QtGui import QPixmap, QFont, QIcon, QImage, QGuiApplication
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QThread, pyqtSignal, QSettings
 import qrcode
 from PIL import Image
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+import csv
+import io
+import multiprocessing
 import os
+import re
+import time
 import traceback
 import sys
+import zipfile
+
+# 纠错级别，顺序与界面中的“低/中/高/最高”一致
+ERROR_CORRECTIONS = [
+    qrcode.constants.ERROR_CORRECT_L,
+    qrcode.constants.ERROR_CORRECT_M,
+    qrcode.constants.ERROR_CORRECT_Q,
+    qrcode.constants.ERROR_CORRECT_H
+]
+QR_BORDER = 4
+# 最近生成的二维码数量上限，重复生成或调整尺寸时直接使用缓存
+RENDER_CACHE_SIZE = 64
+# 批量生成的输出方式
+BATCH_OUTPUTS = {
+    "dir": "文件夹（PNG）",
+    "zip": "ZIP压缩包",
+    "pdf": "多页PDF",
+    "sheet": "拼图PNG",
+}
+DEFAULT_NAME_TEMPLATE = "qr_{index:05d}"
+# 每个进程池任务最多包含的二维码数量，减少进程间通信次数
+BATCH_CHUNK_SIZE = 100
+# 拼图和PDF页面中二维码之间的间距（像素）
+SHEET_GAP = 10
+PDF_RESOLUTION = 300
+# 性能测试生成的二维码数量
+BENCHMARK_COUNT = 2000
+UNSAFE_NAME_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def qr_matrix(text, error_level, border=QR_BORDER):
+    """计算二维码模块矩阵（含边框），返回由 bool 元组组成的元组"""
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=error_level,
+        border=border,
+    )
+    qr.add_data(text)
+    qr.make(fit=True)
+    return tuple(tuple(row) for row in qr.get_matrix())
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_qr(text, error_level, box_size):
+    """直接由模块矩阵构造 QImage，不经过 PIL 和临时文件
+    
+    每个模块先对应一个灰度像素，再用最近邻放大到 box_size 倍，边缘保持清晰。
+    """
+    matrix = qr_matrix(text, error_level)
+    size = len(matrix)
+    data = bytes(0 if dark else 255 for row in matrix for dark in row)
+    image = QImage(data, size, size, size, QImage.Format.Format_Grayscale8)
+    # scaled() 返回拥有独立数据的新图像，data 释放后仍然有效
+    return image.scaled(size * box_size, size * box_size,
+                        Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.FastTransformation)
+
+def render_qr_png(text, error_level, box_size):
+    """生成二维码的PNG数据，只依赖 PIL，可以在子进程中运行"""
+    matrix = qr_matrix(text, error_level)
+    size = len(matrix)
+    image = Image.frombytes("L", (size, size), bytes(0 if dark else 255 for row in matrix for dark in row))
+    image = image.resize((size * box_size, size * box_size), Image.Resampling.NEAREST)
+    buffer = io.BytesIO()
+    image.convert("1", dither=Image.Dither.NONE).save(buffer, "PNG")
+    return buffer.getvalue()
+
+def render_chunk(items, error_level, box_size):
+    """进程池任务：生成一组二维码，单条内容出错只记录错误"""
+    results = []
+    for index, text in items:
+        try:
+            results.append((index, render_qr_png(text, error_level, box_size), ""))
+        except Exception as e:
+            results.append((index, None, str(e) or type(e).__name__))
+    return results
+
+def generate_pngs(items, error_level, box_size, max_workers=None, is_cancelled=None):
+    """在进程池中分块生成二维码，按完成顺序逐块产出 [(序号, PNG数据, 错误)]；取消时提前结束"""
+    max_workers = max_workers or os.cpu_count() or 1
+    # 块不宜过大，保证每个进程都能分到任务、进度也能及时更新
+    chunk_size = max(1, min(BATCH_CHUNK_SIZE, len(items) // (max_workers * 4)))
+    # 在多线程的Qt进程中fork可能导致子进程死锁，统一使用spawn启动子进程
+    executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    cancelled = False
+    try:
+        pending = {executor.submit(render_chunk, items[start:start + chunk_size], error_level, box_size)
+                   for start in range(0, len(items), chunk_size)}
+        while pending:
+            if is_cancelled is not None and is_cancelled():
+                cancelled = True
+                return
+            finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+    finally:
+        executor.shutdown(wait=not cancelled, cancel_futures=True)
+
+def read_batch_records(path):
+    """读取批量生成的内容，返回供文件名模板使用的记录字典列表
+    
+    CSV 文件使用 text 列（没有时使用第一列），并保留其他列；其他文件每个非空行一条。
+    每条记录都带有从1开始的 index。
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            if not reader.fieldnames:
+                return []
+            column = "text" if "text" in reader.fieldnames else reader.fieldnames[0]
+            rows = [row for row in reader if (row.get(column) or "").strip()]
+            return [{**row, "index": index, "text": row[column]} for index, row in enumerate(rows, 1)]
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    return [{"index": index, "text": line} for index, line in enumerate(lines, 1)]
+
+def format_filename(template, record, used):
+    """按模板生成文件名（如 qr_{index:05d}、{sku}_{text}），替换非法字符，重名时追加序号"""
+    try:
+        name = template.format_map(record)
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"文件名模板无效: {e}")
+    name = UNSAFE_NAME_CHARS.sub("_", name).strip(" .") or f"qr_{record['index']}"
+    base = name
+    number = 2
+    while name.lower() in used:
+        name = f"{base}_{number}"
+        number += 1
+    used.add(name.lower())
+    return name + ".png"
+
+def compose_sheets(images, columns, rows=0, gap=SHEET_GAP):
+    """把二维码按网格排列到页面上，rows 为0时全部排在一页；尺寸不同的二维码在格子中居中"""
+    cell = max(image.width for image in images)
+    per_page = columns * rows if rows else len(images)
+    pages = []
+    for start in range(0, len(images), per_page):
+        page_images = images[start:start + per_page]
+        page_columns = columns if rows else min(columns, len(page_images))
+        page_rows = rows or (len(page_images) + columns - 1) // columns
+        page = Image.new("1", (page_columns * (cell + gap) + gap, page_rows * (cell + gap) + gap), 1)
+        for position, image in enumerate(page_images):
+            offset = (cell - image.width) // 2
+            x = gap + (position % columns) * (cell + gap) + offset
+            y = gap + (position // columns) * (cell + gap) + offset
+            page.paste(image, (x, y))
+        pages.append(page)
+    return pages
+
+class BatchQRThread(QThread):
+    """线程用于调度进程池批量生成二维码并写出结果"""
+    progress_signal = pyqtSignal(int, int, float)  # 已完成数量, 总数量, 速度(个/秒)
+    result_signal = pyqtSignal(str, int, list, float)  # 输出位置, 成功数量, 失败列表[(序号, 原因)], 速度(个/秒)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, records, target, output, error_level, box_size,
+                 template=DEFAULT_NAME_TEMPLATE, columns=4, rows=0, max_workers=None):
+        super().__init__()
+        self.records = records
+        self.target = target
+        self.output = output
+        self.error_level = error_level
+        self.box_size = box_size
+        self.template = template
+        self.columns = columns
+        self.rows = rows
+        self.max_workers = max_workers
+        self.cancel_requested = False
+        
+    def cancel(self):
+        self.cancel_requested = True
+        
+    def run(self):
+        start = time.perf_counter()
+        temp_path = f"{self.target}.part"
+        # 文件夹模式下本次写入的文件，取消或出错时删除，不留下只生成了一部分的结果
+        written = []
+        try:
+            used = set()
+            if self.output == "dir" and os.path.isdir(self.target):
+                # 目录中已有的PNG文件名视为已占用，新文件自动追加序号，不覆盖已有文件
+                used.update(os.path.splitext(name)[0].lower() for name in os.listdir(self.target)
+                            if name.lower().endswith(".png"))
+            names = [format_filename(self.template, record, used) for record in self.records]
+            items = [(position, record["text"]) for position, record in enumerate(self.records)]
+            archive = None
+            if self.output == "dir":
+                os.makedirs(self.target, exist_ok=True)
+            elif self.output == "zip":
+                # PNG 已经压缩过，直接存储即可
+                archive = zipfile.ZipFile(temp_path, "w", zipfile.ZIP_STORED)
+            images = {}
+            failures = []
+            done = 0
+            try:
+                for chunk in generate_pngs(items, self.error_level, self.box_size, self.max_workers,
+                                           lambda: self.cancel_requested):
+                    for position, data, error in chunk:
+                        if data is None:
+                            failures.append((self.records[position]["index"], error))
+                        elif self.output == "dir":
+                            # 先写临时文件再改名，中途取消或崩溃不会留下写了一半的PNG
+                            path = os.path.join(self.target, names[position])
+                            written.append(path)
+                            with open(f"{path}.part", "wb") as f:
+                                f.write(data)
+                            os.replace(f"{path}.part", path)
+                        elif archive is not None:
+                            archive.writestr(names[position], data)
+                        else:
+                            images[position] = data
+                    done += len(chunk)
+                    self.progress_signal.emit(done, len(items), done / max(time.perf_counter() - start, 1e-6))
+            finally:
+                if archive is not None:
+                    archive.close()
+            if self.cancel_requested:
+                self.remove_outputs(temp_path, written)
+                return
+                
+            if self.output in ("pdf", "sheet") and images:
+                pages = compose_sheets([Image.open(io.BytesIO(images[position])) for position in sorted(images)],
+                                       self.columns, self.rows if self.output == "pdf" else 0)
+                if self.output == "pdf":
+                    pages[0].save(temp_path, "PDF", save_all=True, append_images=pages[1:], resolution=PDF_RESOLUTION)
+                else:
+                    pages[0].save(temp_path, "PNG")
+            if os.path.exists(temp_path):
+                os.replace(temp_path, self.target)
+            failures.sort()
+            speed = len(items) / max(time.perf_counter() - start, 1e-6)
+            self.result_signal.emit(self.target, len(items) - len(failures), failures, speed)
+        except Exception as e:
+            self.remove_outputs(temp_path, written)
+            self.error_signal.emit(str(e))
+            
+    def remove_outputs(self, temp_path, written):
+        """删除本次未完成的输出：ZIP/PDF的临时文件，以及文件夹模式下已写入的PNG和临时文件"""
+        paths = [temp_path]
+        for path in written:
+            paths.extend((path, f"{path}.part"))
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+class QRBenchmarkThread(QThread):
+    """线程用于测试本机批量生成二维码的速度，分别使用单进程和全部CPU"""
+    result_signal = pyqtSignal(list)  # [(进程数, 速度(个/秒))]
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, error_level, box_size, count=BENCHMARK_COUNT):
+        super().__init__()
+        self.error_level = error_level
+        self.box_size = box_size
+        self.count = count
+        
+    def run(self):
+        try:
+            # 模拟资产标签内容，每条都不相同，避免命中缓存
+            items = [(index, f"ASSET-{index:08d}") for index in range(self.count)]
+            results = []
+            for workers in sorted({1, os.cpu_count() or 1}):
+                start = time.perf_counter()
+                for _ in generate_pngs(items, self.error_level, self.box_size, workers):
+                    pass
+                results.append((workers, self.count / (time.perf_counter() - start)))
+            self.result_signal.emit(results)
+        except Exception as e:
+            self.error_signal.emit(str(e))
 
 class QRCodeGenerator(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("二维码生成器")
         self.setModal(True)
+        self.batch_thread = None
+        self.benchmark_thread = None
+        self.batch_settings = QSettings("QRCodeGenerator", "Batch")
         self.init_ui()
         
     def init_ui(self):
@@ -232,6 +511,94 @@ class QRCodeGenerator(QDialog):
         
         main_layout.addLayout(btn_layout)
         
+        # 批量生成选项：使用上面的尺寸和纠错级别
+        batch_options_layout = QHBoxLayout()
+        
+        output_label = QLabel("批量输出:")
+        output_label.setStyleSheet("color: #666;")
+        self.batch_output_combo = QComboBox()
+        for output, label in BATCH_OUTPUTS.items():
+            self.batch_output_combo.addItem(label, output)
+        self.batch_output_combo.setCurrentIndex(max(self.batch_output_combo.findData(self.batch_settings.value("output", "dir")), 0))
+        self.batch_output_combo.currentIndexChanged.connect(self.update_batch_options)
+        
+        template_label = QLabel("文件名:")
+        template_label.setStyleSheet("color: #666;")
+        self.name_template_input = QLineEdit(self.batch_settings.value("template", DEFAULT_NAME_TEMPLATE))
+        self.name_template_input.setToolTip("可使用 {index}、{text} 以及CSV中的列名，例如 {index:05d}_{text}")
+        
+        columns_label = QLabel("每行:")
+        columns_label.setStyleSheet("color: #666;")
+        self.columns_spin = QSpinBox()
+        self.columns_spin.setRange(1, 50)
+        self.columns_spin.setValue(self.batch_settings.value("columns", 4, type=int))
+        
+        rows_label = QLabel("每页行数:")
+        rows_label.setStyleSheet("color: #666;")
+        self.rows_spin = QSpinBox()
+        self.rows_spin.setRange(1, 50)
+        self.rows_spin.setValue(self.batch_settings.value("rows", 6, type=int))
+        
+        batch_options_layout.addWidget(output_label)
+        batch_options_layout.addWidget(self.batch_output_combo)
+        batch_options_layout.addWidget(template_label)
+        batch_options_layout.addWidget(self.name_template_input, 1)
+        batch_options_layout.addWidget(columns_label)
+        batch_options_layout.addWidget(self.columns_spin)
+        batch_options_layout.addWidget(rows_label)
+        batch_options_layout.addWidget(self.rows_spin)
+        
+        main_layout.addLayout(batch_options_layout)
+        
+        # 批量生成按钮、进度条和性能测试
+        batch_layout = QHBoxLayout()
+        
+        self.batch_btn = QPushButton("批量生成...")
+        self.batch_btn.setToolTip("从CSV或每行一条的文本文件批量生成二维码")
+        self.batch_btn.clicked.connect(self.start_batch)
+        self.batch_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #673AB7;
+                color: white;
+                border-radius: 6px;
+                padding: 8px 15px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #7E57C2;
+            }
+            QPushButton:disabled {
+                background-color: #BDBDBD;
+                color: #EEEEEE;
+            }
+        """)
+        
+        self.benchmark_btn = QPushButton("性能测试")
+        self.benchmark_btn.setToolTip(f"生成 {BENCHMARK_COUNT} 个二维码，测试单进程和多进程的速度（个/秒）")
+        self.benchmark_btn.clicked.connect(self.start_benchmark)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        
+        self.cancel_btn = QPushButton("取消")
+        self.cancel_btn.clicked.connect(self.cancel_batch)
+        self.cancel_btn.setVisible(False)
+        
+        batch_layout.addWidget(self.batch_btn)
+        batch_layout.addWidget(self.benchmark_btn)
+        batch_layout.addWidget(self.progress_bar, 1)
+        batch_layout.addWidget(self.cancel_btn)
+        
+        main_layout.addLayout(batch_layout)
+        
+        self.update_batch_options()
+        
+    def update_batch_options(self):
+        output = self.batch_output_combo.currentData()
+        self.name_template_input.setEnabled(output in ("dir", "zip"))
+        self.columns_spin.setEnabled(output in ("pdf", "sheet"))
+        self.rows_spin.setEnabled(output == "pdf")
+        
     def generate_qr(self):
         try:
             text = self.text_input.text()
@@ -246,41 +613,14 @@ class QRCodeGenerator(QDialog):
             box_size = self.size_spinner.value() * 2  # 乘2以获得更合适的尺寸
             
             # 获取错误校正级别
-            error_corrections = [
-                qrcode.constants.ERROR_CORRECT_L,
-                qrcode.constants.ERROR_CORRECT_M,
-                qrcode.constants.ERROR_CORRECT_Q,
-                qrcode.constants.ERROR_CORRECT_H
-            ]
-            error_level = error_corrections[self.error_combo.currentIndex()]
-            
-            # 创建二维码
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=error_level,
-                box_size=box_size,
-                border=4,
-            )
-            qr.add_data(text)
-            qr.make(fit=True)
-            
-            # 生成二维码图片
-            self.qr_image = qr.make_image(fill_color="black", back_color="white")
+            error_level = ERROR_CORRECTIONS[self.error_combo.currentIndex()]
             
-            # 将PIL图像转换为QPixmap
-            img_path = os.path.join(os.path.dirname(__file__), "temp_qr.png")
-            self.qr_image.save(img_path)
-            
-            pixmap = QPixmap(img_path)
-            if os.path.exists(img_path):
-                os.remove(img_path)
+            # 在内存中生成二维码图片，相同参数直接命中缓存
+            self.qr_image = render_qr(text, error_level, box_size)
             
             # 调整大小并显示
-            if not pixmap.isNull():
-                size = min(self.qr_frame.width(), self.qr_frame.height()) - 30
-                pixmap = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                self.qr_label.setPixmap(pixmap)
-                self.qr_label.setStyleSheet("border: none;")
+            if not self.qr_image.isNull():
+                self.show_qr()
                 
                 # 激活按钮
                 self.save_btn.setEnabled(True)
@@ -305,6 +645,19 @@ class QRCodeGenerator(QDialog):
             self.save_btn.setEnabled(False)
             self.copy_btn.setEnabled(False)
             
+    def show_qr(self):
+        """按显示区域大小缩放当前二维码"""
+        size = min(self.qr_frame.width(), self.qr_frame.height()) - 30
+        pixmap = QPixmap.fromImage(self.qr_image)
+        pixmap = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        self.qr_label.setPixmap(pixmap)
+        self.qr_label.setStyleSheet("border: none;")
+        
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if hasattr(self, 'qr_image') and not self.qr_image.isNull():
+            self.show_qr()
+            
     def save_qr(self):
         try:
             if not hasattr(self, 'qr_image'):
@@ -320,7 +673,8 @@ class QRCodeGenerator(QDialog):
                 if not file_path.lower().endswith('.png'):
                     file_path += '.png'
                     
-                self.qr_image.save(file_path)
+                if not self.qr_image.save(file_path, "PNG"):
+                    raise OSError(f"无法写入文件 {file_path}")
                 self.status_label.setText(f"二维码已保存到: {os.path.basename(file_path)}")
                 self.status_label.setStyleSheet("color: #4CAF50; font-style: normal;")
                 QMessageBox.information(self, "成功", f"二维码已保存到: {file_path}")
@@ -337,18 +691,9 @@ class QRCodeGenerator(QDialog):
                 QMessageBox.warning(self, "警告", "请先生成二维码")
                 return
                 
-            # 临时保存图像
-            temp_path = os.path.join(os.path.dirname(__file__), "temp_qr_copy.png")
-            self.qr_image.save(temp_path)
-            
-            # 加载为QPixmap
-            pixmap = QPixmap(temp_path)
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-                
             # 复制到剪贴板
             clipboard = QGuiApplication.clipboard()
-            clipboard.setPixmap(pixmap)
+            clipboard.setImage(self.qr_image)
             
             self.status_label.setText("二维码已复制到剪贴板")
             self.status_label.setStyleSheet("color: #4CAF50; font-style: normal;")
@@ -356,4 +701,133 @@ class QRCodeGenerator(QDialog):
         except Exception as e:
             self.status_label.setText(f"复制失败: {str(e)}")
             self.status_label.setStyleSheet("color: #F44336; font-style: italic;")
-            QMessageBox.critical(self, "错误", f"复制二维码时出错: {str(e)}") 
\ No newline at end of file
+            QMessageBox.critical(self, "错误", f"复制二维码时出错: {str(e)}") 
+            
+    def start_batch(self):
+        source, _ = QFileDialog.getOpenFileName(
+            self, "选择批量内容", "", "CSV或文本文件 (*.csv *.txt);;所有文件 (*)"
+        )
+        if not source:
+            return
+        try:
+            records = read_batch_records(source)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            QMessageBox.critical(self, "错误", f"读取文件时出错: {str(e)}")
+            return
+        if not records:
+            QMessageBox.warning(self, "警告", "文件中没有可生成二维码的内容")
+            return
+            
+        output = self.batch_output_combo.currentData()
+        template = self.name_template_input.text().strip() or DEFAULT_NAME_TEMPLATE
+        if output in ("dir", "zip"):
+            # 先用第一条记录检查模板，避免生成到一半才出错
+            try:
+                format_filename(template, records[0], set())
+            except ValueError as e:
+                QMessageBox.warning(self, "警告", str(e))
+                return
+                
+        base = os.path.splitext(source)[0]
+        if output == "dir":
+            target = QFileDialog.getExistingDirectory(self, "选择输出目录")
+        else:
+            extension = {"zip": "zip", "pdf": "pdf", "sheet": "png"}[output]
+            target, _ = QFileDialog.getSaveFileName(
+                self, "保存批量结果", f"{base}_qr.{extension}", f"{BATCH_OUTPUTS[output]} (*.{extension})"
+            )
+            if target and not target.lower().endswith(f".{extension}"):
+                target += f".{extension}"
+        if not target:
+            return
+            
+        self.batch_settings.setValue("output", output)
+        self.batch_settings.setValue("template", template)
+        self.batch_settings.setValue("columns", self.columns_spin.value())
+        self.batch_settings.setValue("rows", self.rows_spin.value())
+        
+        self.progress_bar.setRange(0, len(records))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cancel_btn.setVisible(True)
+        self.batch_btn.setEnabled(False)
+        self.benchmark_btn.setEnabled(False)
+        self.status_label.setText(f"正在批量生成 {len(records)} 个二维码...")
+        self.status_label.setStyleSheet("color: #673AB7; font-style: italic;")
+        
+        self.batch_thread = BatchQRThread(
+            records, target, output, ERROR_CORRECTIONS[self.error_combo.currentIndex()],
+            self.size_spinner.value() * 2, template, self.columns_spin.value(), self.rows_spin.value()
+        )
+        self.batch_thread.progress_signal.connect(self.update_batch_progress)
+        self.batch_thread.result_signal.connect(self.show_batch_result)
+        self.batch_thread.error_signal.connect(self.show_batch_error)
+        self.batch_thread.finished.connect(self.batch_finished)
+        self.batch_thread.start()
+        
+    def update_batch_progress(self, done, total, speed):
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f"正在批量生成... {done}/{total}  {speed:.0f} 个/秒")
+        
+    def show_batch_result(self, target, succeeded, failures, speed):
+        message = f"已生成 {succeeded} 个二维码（{speed:.0f} 个/秒）"
+        self.status_label.setText(message)
+        if failures:
+            self.status_label.setStyleSheet("color: #F44336; font-style: normal;")
+            details = "\n".join(f"第 {index} 条: {error}" for index, error in failures[:10])
+            more = f"\n... 共 {len(failures)} 条失败" if len(failures) > 10 else ""
+            QMessageBox.warning(self, "完成", f"{message}，失败 {len(failures)} 条\n输出: {target}\n\n{details}{more}")
+        else:
+            self.status_label.setStyleSheet("color: #4CAF50; font-style: normal;")
+            QMessageBox.information(self, "成功", f"{message}\n输出: {target}")
+            
+    def show_batch_error(self, message):
+        self.status_label.setText(f"批量生成失败: {message}")
+        self.status_label.setStyleSheet("color: #F44336; font-style: italic;")
+        QMessageBox.critical(self, "错误", f"批量生成二维码时出错: {message}")
+        
+    def cancel_batch(self):
+        """取消批量生成，界面立即恢复，后台线程结束时清理未完成的输出"""
+        if self.batch_thread is None:
+            return
+        self.batch_thread.cancel()
+        self.batch_thread.result_signal.disconnect()
+        self.batch_thread.progress_signal.disconnect()
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.status_label.setText("已取消")
+        self.status_label.setStyleSheet("color: #666; font-style: italic;")
+        
+    def batch_finished(self):
+        self.batch_thread.wait()
+        self.batch_thread = None
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.batch_btn.setEnabled(True)
+        self.benchmark_btn.setEnabled(True)
+        
+    def start_benchmark(self):
+        self.batch_btn.setEnabled(False)
+        self.benchmark_btn.setEnabled(False)
+        self.status_label.setText(f"正在测试生成 {BENCHMARK_COUNT} 个二维码的速度...")
+        self.status_label.setStyleSheet("color: #673AB7; font-style: italic;")
+        
+        self.benchmark_thread = QRBenchmarkThread(
+            ERROR_CORRECTIONS[self.error_combo.currentIndex()], self.size_spinner.value() * 2
+        )
+        self.benchmark_thread.result_signal.connect(self.show_benchmark_result)
+        self.benchmark_thread.error_signal.connect(self.show_batch_error)
+        self.benchmark_thread.finished.connect(self.benchmark_finished)
+        self.benchmark_thread.start()
+        
+    def show_benchmark_result(self, results):
+        lines = [f"{workers} 个进程: {speed:.0f} 个/秒" for workers, speed in results]
+        self.status_label.setText("性能测试完成: " + "，".join(lines))
+        self.status_label.setStyleSheet("color: #4CAF50; font-style: normal;")
+        QMessageBox.information(self, "性能测试", "\n".join(lines))
+        
+    def benchmark_finished(self):
+        self.benchmark_thread.wait()
+        self.benchmark_thread = None
+        self.batch_btn.setEnabled(True)
+        self.benchmark_btn.setEnabled(True)
@@ -1,11 +1,29 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, 
                             QTextEdit, QPushButton, QMessageBox,
-                            QLabel, QFrame, QSplitter)
+                            QLabel, QFrame, QSplitter, QLineEdit,
+                            QComboBox, QProgressBar, QFileDialog,
+                            QCheckBox, QSpinBox, QApplication)
 from PyQt6.QtGui import QIcon, QFont
-from PyQt6.QtCore import Qt
-from cryptography.fernet import Fernet
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSettings
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import base64
+import binascii
+import csv
+import hashlib
+import json
+import math
 import os
+import struct
 import sys
+import threading
+import time
 try:
     import pyperclip
 except ImportError:
@@ -15,6 +33,495 @@ except ImportError:
             pass
     pyperclip = Pyperclip()
 
+# 分块加密文件格式：文件头 + 若干密文块，每块为 明文块 + 16字节认证标签
+# 文件头：魔数、版本、算法、密钥派生方式、附加数据长度、明文块大小、随机nonce前缀，之后是附加数据
+FILE_MAGIC = b"TENC"
+FILE_VERSION = 1
+HEADER_FORMAT = ">4sBBBBI7s"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+TAG_SIZE = 16
+# 算法编号 -> (名称, AEAD类)
+AEAD_ALGORITHMS = {
+    1: ("AES-256-GCM", AESGCM),
+    2: ("ChaCha20-Poly1305", ChaCha20Poly1305),
+}
+DEFAULT_ALGORITHM = 1
+# 密钥派生方式：0 表示直接使用随机密钥，其余表示由密码派生，派生参数保存在文件头的附加数据中
+KDF_NONE = 0
+KDF_SCRYPT = 1
+KDF_PBKDF2 = 2
+KDF_NAMES = {KDF_SCRYPT: "scrypt", KDF_PBKDF2: "pbkdf2"}
+# 成本参数范围：scrypt 为 log2(N)，PBKDF2 为迭代次数
+KDF_COST_RANGES = {KDF_SCRYPT: (10, 20), KDF_PBKDF2: (10000, 100000000)}
+DEFAULT_KDF_COSTS = {KDF_SCRYPT: 15, KDF_PBKDF2: 600000}
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_SIZE = 16
+DEFAULT_KDF_TARGET_MS = 250
+# 派生密钥在内存中保留的时间（秒）
+DERIVED_KEY_TTL = 300
+DERIVED_KEY_CACHE_SIZE = 32
+# 批量处理记录时每个任务包含的记录数和默认线程数
+BATCH_CHUNK_SIZE = 500
+DEFAULT_BATCH_WORKERS = min(8, os.cpu_count() or 1)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+ENCRYPTED_EXTENSION = ".tenc"
+
+def generate_file_key():
+    """生成256位随机密钥，返回可显示、可复制的URL安全Base64文本"""
+    return base64.urlsafe_b64encode(os.urandom(32)).decode("ascii")
+
+def parse_file_key(text):
+    try:
+        key = base64.urlsafe_b64decode(text.strip().encode("ascii"))
+    except (binascii.Error, UnicodeEncodeError):
+        key = b""
+    if len(key) != 32:
+        raise ValueError("密钥格式不正确，应为44个字符的Base64文本")
+    return key
+
+class KdfParams:
+    """密码派生密钥的参数：算法、成本和随机盐，文本形式为 算法$成本$盐"""
+    
+    def __init__(self, kdf, cost, salt=None):
+        self.kdf = kdf
+        self.cost = cost
+        self.salt = salt if salt is not None else os.urandom(SALT_SIZE)
+        
+    def to_text(self):
+        salt = base64.urlsafe_b64encode(self.salt).decode("ascii").rstrip("=")
+        return f"{KDF_NAMES[self.kdf]}${self.cost}${salt}"
+        
+    @classmethod
+    def from_text(cls, text):
+        try:
+            name, cost, salt = text.strip().split("$")
+            kdf = {name: kdf for kdf, name in KDF_NAMES.items()}[name]
+            cost = int(cost)
+            salt = base64.urlsafe_b64decode(salt + "=" * (-len(salt) % 4))
+        except (ValueError, KeyError, binascii.Error):
+            raise ValueError("密钥派生参数格式不正确")
+        low, high = KDF_COST_RANGES[kdf]
+        # 限制成本范围，防止篡改过的参数耗尽内存或长时间卡住
+        if not low <= cost <= high or not salt:
+            raise ValueError("密钥派生参数超出允许范围")
+        return cls(kdf, cost, salt)
+        
+    def derive(self, passphrase):
+        data = passphrase.encode("utf-8")
+        if self.kdf == KDF_SCRYPT:
+            kdf = Scrypt(salt=self.salt, length=32, n=2 ** self.cost, r=SCRYPT_R, p=SCRYPT_P)
+        else:
+            kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=self.salt, iterations=self.cost)
+        return kdf.derive(data)
+
+def calibrate_kdf(kdf, target_ms=DEFAULT_KDF_TARGET_MS):
+    """在本机测量一次派生耗时，按线性关系推算出耗时接近 target_ms 的成本参数"""
+    low, high = KDF_COST_RANGES[kdf]
+    base = 14 if kdf == KDF_SCRYPT else 100000
+    start = time.perf_counter()
+    KdfParams(kdf, base).derive("calibration")
+    elapsed_ms = max((time.perf_counter() - start) * 1000, 0.01)
+    if kdf == KDF_SCRYPT:
+        cost = base + round(math.log2(target_ms / elapsed_ms))
+    else:
+        cost = int(base * target_ms / elapsed_ms) // 1000 * 1000
+    return min(max(cost, low), high)
+
+class DerivedKeyCache:
+    """短时间缓存由密码派生的密钥，同一会话中反复解密时不必每次重新计算
+    
+    以密码的哈希和派生参数（含盐）为键，条目超过有效期后失效。加密每次都使用新盐，不复用已有条目。
+    """
+    
+    def __init__(self, ttl=DERIVED_KEY_TTL, max_entries=DERIVED_KEY_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        
+    @staticmethod
+    def passphrase_id(passphrase):
+        return hashlib.sha256(passphrase.encode("utf-8")).digest()
+        
+    def purge(self):
+        now = time.monotonic()
+        for cache_key in [k for k, (_, _, expires) in self.entries.items() if expires <= now]:
+            del self.entries[cache_key]
+            
+    def derive(self, passphrase, params):
+        cache_key = (self.passphrase_id(passphrase), params.to_text())
+        with self.lock:
+            self.purge()
+            entry = self.entries.get(cache_key)
+            if entry is not None:
+                self.entries.move_to_end(cache_key)
+                return entry[1]
+        key = params.derive(passphrase)
+        with self.lock:
+            self.entries[cache_key] = (params, key, time.monotonic() + self.ttl)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return key
+        
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+derived_keys = DerivedKeyCache()
+
+def chunk_nonce(prefix, index, last):
+    """nonce = 7字节随机前缀 + 4字节块序号 + 1字节末块标记，块被调换、删除或截断都会校验失败"""
+    return prefix + struct.pack(">IB", index, 1 if last else 0)
+
+def build_header(algorithm, chunk_size, nonce_prefix, kdf=KDF_NONE, extra=b""):
+    return struct.pack(HEADER_FORMAT, FILE_MAGIC, FILE_VERSION, algorithm, kdf, len(extra),
+                       chunk_size, nonce_prefix) + extra
+
+def read_header(f):
+    """读取并检查文件头，返回字段字典；整个文件头作为每块的附加认证数据"""
+    fixed = f.read(HEADER_SIZE)
+    if len(fixed) < HEADER_SIZE:
+        raise ValueError("不是有效的加密文件")
+    magic, version, algorithm, kdf, extra_size, chunk_size, nonce_prefix = struct.unpack(HEADER_FORMAT, fixed)
+    if magic != FILE_MAGIC:
+        raise ValueError("不是有效的加密文件")
+    if version != FILE_VERSION:
+        raise ValueError(f"不支持的加密文件版本: {version}")
+    if algorithm not in AEAD_ALGORITHMS:
+        raise ValueError(f"不支持的加密算法: {algorithm}")
+    if not chunk_size:
+        raise ValueError("加密文件头已损坏")
+    extra = f.read(extra_size)
+    if len(extra) < extra_size:
+        raise ValueError("加密文件头已损坏")
+    return {"algorithm": algorithm, "kdf": kdf, "extra": extra, "chunk_size": chunk_size,
+            "nonce_prefix": nonce_prefix, "raw": fixed + extra}
+
+def encrypt_file(source, target, key, algorithm=DEFAULT_ALGORITHM, chunk_size=DEFAULT_CHUNK_SIZE,
+                 progress_callback=None, is_cancelled=None, kdf=KDF_NONE, extra=b""):
+    """分块认证加密文件，同时只在内存中保留两块数据；取消时返回None，否则返回输出大小
+    
+    先写入临时文件，完成后再替换目标文件，取消或出错时不留下不完整的输出。
+    """
+    cipher = AEAD_ALGORITHMS[algorithm][1](key)
+    header = build_header(algorithm, chunk_size, os.urandom(7), kdf, extra)
+    nonce_prefix = header[HEADER_SIZE - 7:HEADER_SIZE]
+    total = os.path.getsize(source)
+    temp_path = f"{target}.part"
+    done = 0
+    try:
+        with open(source, "rb") as src, open(temp_path, "wb") as dst:
+            dst.write(header)
+            # 预读下一块才能知道当前块是不是最后一块；空文件也会写入一个空的末块
+            current = src.read(chunk_size)
+            index = 0
+            while True:
+                if is_cancelled is not None and is_cancelled():
+                    dst.close()
+                    os.remove(temp_path)
+                    return None
+                following = src.read(chunk_size)
+                last = not following
+                dst.write(cipher.encrypt(chunk_nonce(nonce_prefix, index, last), current, header))
+                done += len(current)
+                if progress_callback is not None:
+                    progress_callback(done, total)
+                if last:
+                    break
+                current = following
+                index += 1
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return os.path.getsize(target)
+
+class EncryptedFile:
+    """随机访问读取分块加密文件，只解密被读取范围覆盖的块"""
+    
+    def __init__(self, path, key):
+        self.file = open(path, "rb")
+        try:
+            self.header = read_header(self.file)
+            self.chunk_size = self.header["chunk_size"]
+            self.cipher = AEAD_ALGORITHMS[self.header["algorithm"]][1](key)
+            self.data_offset = len(self.header["raw"])
+            body = os.fstat(self.file.fileno()).st_size - self.data_offset
+            stride = self.chunk_size + TAG_SIZE
+            self.chunk_count = max((body + stride - 1) // stride, 1)
+            self.size = body - self.chunk_count * TAG_SIZE
+            if body < TAG_SIZE or 0 < body % stride < TAG_SIZE:
+                raise ValueError("加密文件已被截断或损坏")
+        except BaseException:
+            self.file.close()
+            raise
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.close()
+        
+    def close(self):
+        self.file.close()
+        
+    def read_chunk(self, index):
+        """解密第 index 块（从0开始）"""
+        stride = self.chunk_size + TAG_SIZE
+        self.file.seek(self.data_offset + index * stride)
+        data = self.file.read(stride)
+        last = index == self.chunk_count - 1
+        try:
+            return self.cipher.decrypt(chunk_nonce(self.header["nonce_prefix"], index, last),
+                                       data, self.header["raw"])
+        except InvalidTag:
+            raise ValueError(f"密钥错误或文件已损坏（第 {index + 1} 块校验失败）")
+            
+    def read(self, offset, length):
+        """解密明文中 [offset, offset + length) 范围的数据"""
+        end = min(offset + length, self.size)
+        if offset >= end:
+            return b""
+        first = offset // self.chunk_size
+        last = (end - 1) // self.chunk_size
+        data = b"".join(self.read_chunk(index) for index in range(first, last + 1))
+        start = offset - first * self.chunk_size
+        return data[start:start + end - offset]
+
+def decrypt_range(path, key, offset, length):
+    """只解密加密文件中的一段明文，用于预览或读取大文件的一部分"""
+    with EncryptedFile(path, key) as encrypted:
+        return encrypted.read(offset, length)
+
+def passphrase_file_key(path, passphrase):
+    """根据加密文件头中保存的派生参数，由密码得到文件密钥"""
+    with open(path, "rb") as f:
+        header = read_header(f)
+    if header["kdf"] == KDF_NONE:
+        raise ValueError("该文件使用随机密钥加密，请输入加密时生成的密钥")
+    params = KdfParams.from_text(header["extra"].decode("ascii", "replace"))
+    if params.kdf != header["kdf"]:
+        raise ValueError("加密文件头已损坏")
+    return derived_keys.derive(passphrase, params)
+
+def decrypt_file(source, target, key, progress_callback=None, is_cancelled=None):
+    """逐块解密文件并校验每块的认证标签；取消时返回None，否则返回明文大小"""
+    temp_path = f"{target}.part"
+    try:
+        with EncryptedFile(source, key) as encrypted, open(temp_path, "wb") as dst:
+            done = 0
+            for index in range(encrypted.chunk_count):
+                if is_cancelled is not None and is_cancelled():
+                    dst.close()
+                    os.remove(temp_path)
+                    return None
+                chunk = encrypted.read_chunk(index)
+                dst.write(chunk)
+                done += len(chunk)
+                if progress_callback is not None:
+                    progress_callback(done, encrypted.size)
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return done
+
+def read_records(path):
+    """读取记录文件，每行一条，跳过空行；返回 (行号, 内容) 列表"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        return [(number, line) for number, line in enumerate(f.read().splitlines(), 1) if line.strip()]
+
+def process_records(records, mode, key=None, passphrase=None, kdf_params=None,
+                    max_workers=DEFAULT_BATCH_WORKERS, chunk_size=BATCH_CHUNK_SIZE,
+                    progress_callback=None, is_cancelled=None):
+    """用同一个 Fernet 对象分块并行加密或解密记录；取消时返回None
+    
+    返回与 records 对应的 (输出, 错误) 列表，单条记录失败只记录错误，不影响其他记录。
+    密码模式下加密结果带有“派生参数$”前缀，每条记录都可以单独解密。
+    """
+    fernets = {}
+    fernet_lock = threading.Lock()
+    
+    def fernet_for(params_text):
+        # 同一组派生参数只派生一次密钥、只创建一个 Fernet 对象
+        with fernet_lock:
+            if params_text not in fernets:
+                if params_text:
+                    derived = derived_keys.derive(passphrase, KdfParams.from_text(params_text))
+                else:
+                    derived = key
+                fernets[params_text] = Fernet(base64.urlsafe_b64encode(derived))
+            return fernets[params_text]
+            
+    prefix = ""
+    if passphrase is not None and mode == "encrypt":
+        prefix = kdf_params.to_text() + "$"
+        
+    def convert(value):
+        if mode == "encrypt":
+            return prefix + fernet_for(prefix[:-1]).encrypt(value.encode("utf-8")).decode("ascii")
+        value = value.strip()
+        params_text = ""
+        if passphrase is not None:
+            if "$" not in value:
+                raise ValueError("缺少密钥派生参数")
+            params_text, value = value.rsplit("$", 1)
+        return fernet_for(params_text).decrypt(value.encode("ascii")).decode("utf-8")
+        
+    def run_chunk(start):
+        results = []
+        for _, value in records[start:start + chunk_size]:
+            if is_cancelled is not None and is_cancelled():
+                return start, None
+            try:
+                results.append((convert(value), ""))
+            except (InvalidToken, UnicodeError):
+                results.append(("", "密钥错误或数据已损坏"))
+            except Exception as e:
+                results.append(("", str(e)))
+        return start, results
+        
+    results = [None] * len(records)
+    done = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_chunk, start) for start in range(0, len(records), chunk_size)]
+        for future in as_completed(futures):
+            start, chunk_results = future.result()
+            if chunk_results is None:
+                return None
+            results[start:start + len(chunk_results)] = chunk_results
+            done += len(chunk_results)
+            if progress_callback is not None:
+                progress_callback(done, len(records))
+    return results
+
+def write_records(path, records, results, fmt="csv"):
+    """写出输入与输出的对应关系，格式为 CSV 或 JSON Lines"""
+    temp_path = f"{path}.part"
+    try:
+        with open(temp_path, "w", encoding="utf-8", newline="") as f:
+            if fmt == "jsonl":
+                for (number, value), (output, error) in zip(records, results):
+                    record = {"line": number, "input": value, "output": output, "error": error}
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            else:
+                writer = csv.writer(f)
+                writer.writerow(["line", "input", "output", "error"])
+                for (number, value), (output, error) in zip(records, results):
+                    writer.writerow([number, value, output, error])
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class BatchCryptoThread(QThread):
+    """线程用于在后台批量加密或解密记录文件中的每一行"""
+    progress_signal = pyqtSignal(int, float)  # 进度(千分比), 速度(条/秒)
+    result_signal = pyqtSignal(str, int, int)  # 输出文件, 成功数, 失败数
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, mode, source, target, fmt, key=None, passphrase=None, kdf_params=None,
+                 max_workers=DEFAULT_BATCH_WORKERS):
+        super().__init__()
+        self.mode = mode
+        self.source = source
+        self.target = target
+        self.fmt = fmt
+        self.key = key
+        self.passphrase = passphrase
+        self.kdf_params = kdf_params
+        self.max_workers = max_workers
+        self.cancel_requested = False
+        
+    def cancel(self):
+        self.cancel_requested = True
+        
+    def run(self):
+        start = time.perf_counter()
+        last_emit = 0.0
+        
+        def report(done, total):
+            nonlocal last_emit
+            now = time.perf_counter()
+            if now - last_emit < 0.1 and done < total:
+                return
+            last_emit = now
+            speed = done / max(now - start, 1e-6)
+            self.progress_signal.emit(int(done * 1000 / total) if total else 1000, speed)
+            
+        try:
+            records = read_records(self.source)
+            results = process_records(records, self.mode, self.key, self.passphrase, self.kdf_params,
+                                      self.max_workers, progress_callback=report,
+                                      is_cancelled=lambda: self.cancel_requested)
+            if results is None:
+                return
+            write_records(self.target, records, results, self.fmt)
+            failed = sum(1 for _, error in results if error)
+            self.result_signal.emit(self.target, len(results) - failed, failed)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+class FileCryptoThread(QThread):
+    """线程用于在后台分块加密或解密文件"""
+    progress_signal = pyqtSignal(int, float)  # 进度(千分比), 速度(MB/s)
+    result_signal = pyqtSignal(str, int)  # 输出文件, 输出大小
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, mode, source, target, key, algorithm=DEFAULT_ALGORITHM,
+                 passphrase=None, kdf_params=None):
+        super().__init__()
+        self.mode = mode
+        self.source = source
+        self.target = target
+        self.key = key
+        self.algorithm = algorithm
+        # 密码模式下 key 为 None，密钥在后台线程中派生，避免界面卡顿
+        self.passphrase = passphrase
+        self.kdf_params = kdf_params
+        self.cancel_requested = False
+        
+    def cancel(self):
+        self.cancel_requested = True
+        
+    def run(self):
+        start = time.perf_counter()
+        last_emit = 0.0
+        
+        def report(done, total):
+            nonlocal last_emit
+            now = time.perf_counter()
+            # 限制进度信号频率，避免刷屏拖慢界面
+            if now - last_emit < 0.1 and done < total:
+                return
+            last_emit = now
+            speed = done / (1024 * 1024) / max(now - start, 1e-6)
+            self.progress_signal.emit(int(done * 1000 / total) if total else 1000, speed)
+            
+        try:
+            key = self.key
+            if self.mode == "encrypt":
+                kdf, extra = KDF_NONE, b""
+                if self.passphrase is not None:
+                    key = derived_keys.derive(self.passphrase, self.kdf_params)
+                    kdf, extra = self.kdf_params.kdf, self.kdf_params.to_text().encode("ascii")
+                written = encrypt_file(self.source, self.target, key, self.algorithm,
+                                       progress_callback=report, is_cancelled=lambda: self.cancel_requested,
+                                       kdf=kdf, extra=extra)
+            else:
+                if self.passphrase is not None:
+                    key = passphrase_file_key(self.source, self.passphrase)
+                written = decrypt_file(self.source, self.target, key,
+                                       progress_callback=report, is_cancelled=lambda: self.cancel_requested)
+            if written is not None:
+                self.result_signal.emit(self.target, written)
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
 class TextEncryptor(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -23,6 +530,8 @@ class TextEncryptor(QDialog):
         self.setMinimumSize(650, 500)
         self.current_key = None
         self.current_result = None
+        self.file_thread = None
+        self.kdf_settings = QSettings("TextEncryptor", "KDF")
         self.setup_ui()
         
     def setup_ui(self):
@@ -84,6 +593,43 @@ class TextEncryptor(QDialog):
         self.status_label.setStyleSheet("color: #666; font-style: italic;")
         main_layout.addWidget(self.status_label)
         
+        # 密码模式：由密码派生密钥，成本参数按本机速度校准
+        password_layout = QHBoxLayout()
+        password_layout.setSpacing(10)
+        
+        self.use_password_check = QCheckBox("使用密码")
+        self.use_password_check.setChecked(self.kdf_settings.value("enabled", False, type=bool))
+        self.use_password_check.toggled.connect(self.toggle_password_mode)
+        password_layout.addWidget(self.use_password_check)
+        
+        self.password_input = QLineEdit()
+        self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.password_input.setPlaceholderText("输入密码")
+        password_layout.addWidget(self.password_input, 1)
+        
+        self.kdf_combo = QComboBox()
+        self.kdf_combo.addItem("scrypt", KDF_SCRYPT)
+        self.kdf_combo.addItem("PBKDF2-SHA256", KDF_PBKDF2)
+        self.kdf_combo.setCurrentIndex(max(self.kdf_combo.findData(self.kdf_settings.value("kdf", KDF_SCRYPT, type=int)), 0))
+        self.kdf_combo.currentIndexChanged.connect(lambda: self.kdf_settings.setValue("kdf", self.kdf_combo.currentData()))
+        password_layout.addWidget(self.kdf_combo)
+        
+        password_layout.addWidget(QLabel("目标耗时:"))
+        self.kdf_target_spin = QSpinBox()
+        self.kdf_target_spin.setRange(50, 5000)
+        self.kdf_target_spin.setSingleStep(50)
+        self.kdf_target_spin.setSuffix(" ms")
+        self.kdf_target_spin.setValue(self.kdf_settings.value("target_ms", DEFAULT_KDF_TARGET_MS, type=int))
+        self.kdf_target_spin.valueChanged.connect(lambda value: self.kdf_settings.setValue("target_ms", value))
+        password_layout.addWidget(self.kdf_target_spin)
+        
+        self.calibrate_btn = QPushButton("校准")
+        self.calibrate_btn.setToolTip("按目标耗时在本机测量并保存密钥派生的成本参数")
+        self.calibrate_btn.clicked.connect(self.calibrate)
+        password_layout.addWidget(self.calibrate_btn)
+        
+        main_layout.addLayout(password_layout)
+        
         # 按钮区域
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(10)
@@ -162,6 +708,130 @@ class TextEncryptor(QDialog):
         
         main_layout.addLayout(btn_layout)
         
+        # 文件加密区域：分块认证加密，支持任意大小的文件
+        file_layout = QHBoxLayout()
+        file_layout.setSpacing(10)
+        
+        self.algorithm_combo = QComboBox()
+        for algorithm, (name, _) in AEAD_ALGORITHMS.items():
+            self.algorithm_combo.addItem(name, algorithm)
+        file_layout.addWidget(self.algorithm_combo)
+        
+        self.file_key_input = QLineEdit()
+        self.file_key_input.setPlaceholderText("文件密钥（加密时留空自动生成）")
+        file_layout.addWidget(self.file_key_input, 1)
+        
+        self.encrypt_file_btn = QPushButton("加密文件...")
+        self.encrypt_file_btn.clicked.connect(lambda: self.start_file_job("encrypt"))
+        self.encrypt_file_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2E7D32;
+                color: white;
+                border-radius: 6px;
+                padding: 8px 15px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #388E3C;
+            }
+        """)
+        file_layout.addWidget(self.encrypt_file_btn)
+        
+        self.decrypt_file_btn = QPushButton("解密文件...")
+        self.decrypt_file_btn.clicked.connect(lambda: self.start_file_job("decrypt"))
+        self.decrypt_file_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #0277BD;
+                color: white;
+                border-radius: 6px;
+                padding: 8px 15px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #0288D1;
+            }
+        """)
+        file_layout.addWidget(self.decrypt_file_btn)
+        
+        main_layout.addLayout(file_layout)
+        
+        # 批量记录区域：记录文件每行一条，使用上面的文件密钥或密码
+        batch_layout = QHBoxLayout()
+        batch_layout.setSpacing(10)
+        
+        batch_label = QLabel("批量记录（每行一条）:")
+        batch_label.setStyleSheet("color: #666;")
+        batch_layout.addWidget(batch_label)
+        batch_layout.addStretch()
+        
+        self.encrypt_batch_btn = QPushButton("批量加密...")
+        self.encrypt_batch_btn.clicked.connect(lambda: self.start_batch_job("encrypt"))
+        batch_layout.addWidget(self.encrypt_batch_btn)
+        
+        self.decrypt_batch_btn = QPushButton("批量解密...")
+        self.decrypt_batch_btn.clicked.connect(lambda: self.start_batch_job("decrypt"))
+        batch_layout.addWidget(self.decrypt_batch_btn)
+        
+        main_layout.addLayout(batch_layout)
+        
+        # 进度条和取消按钮
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setVisible(False)
+        progress_layout.addWidget(self.progress_bar)
+        
+        self.cancel_btn = QPushButton("取消")
+        self.cancel_btn.clicked.connect(self.cancel_file_job)
+        self.cancel_btn.setVisible(False)
+        progress_layout.addWidget(self.cancel_btn)
+        main_layout.addLayout(progress_layout)
+        
+        self.toggle_password_mode(self.use_password_check.isChecked())
+        
+    def toggle_password_mode(self, checked):
+        self.kdf_settings.setValue("enabled", checked)
+        for widget in (self.password_input, self.kdf_combo, self.kdf_target_spin, self.calibrate_btn):
+            widget.setEnabled(checked)
+        self.file_key_input.setEnabled(not checked)
+        
+    def calibrate(self):
+        """测量本机速度，保存当前算法在目标耗时下的成本参数"""
+        kdf = self.kdf_combo.currentData()
+        target_ms = self.kdf_target_spin.value()
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            cost = calibrate_kdf(kdf, target_ms)
+        finally:
+            QApplication.restoreOverrideCursor()
+        self.kdf_settings.setValue(f"cost_{KDF_NAMES[kdf]}", cost)
+        self.kdf_settings.setValue(f"cost_target_{KDF_NAMES[kdf]}", target_ms)
+        label = f"N=2^{cost}" if kdf == KDF_SCRYPT else f"{cost} 次迭代"
+        self.status_label.setText(f"校准完成: {self.kdf_combo.currentText()} {label}（目标 {target_ms} ms）")
+        self.status_label.setStyleSheet("color: #666; font-style: italic;")
+        return cost
+        
+    def kdf_cost(self):
+        """返回当前算法已校准的成本；尚未校准或目标耗时已修改时先校准"""
+        kdf = self.kdf_combo.currentData()
+        name = KDF_NAMES[kdf]
+        cost = self.kdf_settings.value(f"cost_{name}", 0, type=int)
+        target_ms = self.kdf_settings.value(f"cost_target_{name}", 0, type=int)
+        low, high = KDF_COST_RANGES[kdf]
+        if not low <= cost <= high or target_ms != self.kdf_target_spin.value():
+            cost = self.calibrate()
+        return cost
+        
+    def encryption_params(self):
+        """加密用的派生参数，每次加密都生成新盐，避免同一密钥用于多个文件"""
+        return KdfParams(self.kdf_combo.currentData(), self.kdf_cost())
+        
+    def password(self):
+        passphrase = self.password_input.text()
+        if not passphrase:
+            QMessageBox.warning(self, "警告", "请输入密码")
+        return passphrase
+        
     def encrypt(self):
         try:
             text = self.text_edit.toPlainText()
@@ -172,6 +842,23 @@ class TextEncryptor(QDialog):
             self.status_label.setText("正在加密...")
             self.status_label.setStyleSheet("color: #2E7D32;")
             
+            if self.use_password_check.isChecked():
+                passphrase = self.password()
+                if not passphrase:
+                    return
+                # 只保存派生参数（含随机盐），解密时用同一密码重新派生
+                params = self.encryption_params()
+                f = Fernet(base64.urlsafe_b64encode(derived_keys.derive(passphrase, params)))
+                self.current_result = f.encrypt(text.encode())
+                
+                result_text = f"密钥派生: {params.to_text()}\n加密结果: {self.current_result.decode()}"
+                self.text_edit.setPlainText(result_text)
+                
+                self.status_label.setText("加密成功！解密时需要输入相同的密码。")
+                
+                QMessageBox.information(self, "成功", "文本已成功加密！\n请牢记密码，解密时将需要使用。")
+                return
+                
             self.current_key = Fernet.generate_key()
             f = Fernet(self.current_key)
             self.current_result = f.encrypt(text.encode())
@@ -197,12 +884,24 @@ class TextEncryptor(QDialog):
             self.status_label.setText("正在解密...")
             self.status_label.setStyleSheet("color: #0277BD;")
                 
-            lines = text.split('\n')
-            if len(lines) < 2:
+            # 按标签读取各行，密钥行为“密钥”或“密钥派生”
+            fields = dict(line.strip().split(': ', 1) for line in text.split('\n') if ': ' in line)
+            if "加密结果" not in fields or ("密钥" not in fields and "密钥派生" not in fields):
                 raise ValueError("请提供密钥和加密文本，格式为：\n密钥: xxx\n加密结果: xxx")
                 
-            key = lines[0].split(': ')[1].encode()
-            encrypted = lines[1].split(': ')[1].encode()
+            encrypted = fields["加密结果"].encode()
+            if "密钥派生" in fields:
+                passphrase = self.password_input.text()
+                if not passphrase:
+                    self.use_password_check.setChecked(True)
+                    self.status_label.setText("准备就绪")
+                    self.status_label.setStyleSheet("color: #666; font-style: italic;")
+                    QMessageBox.warning(self, "警告", "该文本使用密码加密，请输入密码")
+                    return
+                params = KdfParams.from_text(fields["密钥派生"])
+                key = base64.urlsafe_b64encode(derived_keys.derive(passphrase, params))
+            else:
+                key = fields["密钥"].encode()
             
             f = Fernet(key)
             decrypted = f.decrypt(encrypted)
@@ -243,4 +942,177 @@ class TextEncryptor(QDialog):
         except Exception as e:
             self.status_label.setText(f"复制结果失败: {str(e)}")
             self.status_label.setStyleSheet("color: #D32F2F;")
-            QMessageBox.critical(self, "错误", f"复制结果时出错: {str(e)}") 
\ No newline at end of file
+            QMessageBox.critical(self, "错误", f"复制结果时出错: {str(e)}") 
+            
+    def start_file_job(self, mode):
+        passphrase = None
+        if self.use_password_check.isChecked():
+            passphrase = self.password()
+            if not passphrase:
+                return
+            key = None
+        else:
+            key_text = self.file_key_input.text().strip()
+            if mode == "decrypt" and not key_text:
+                QMessageBox.warning(self, "警告", "请输入加密文件时生成的密钥")
+                return
+            if mode == "encrypt" and not key_text:
+                key_text = generate_file_key()
+            try:
+                key = parse_file_key(key_text)
+            except ValueError as e:
+                QMessageBox.warning(self, "警告", str(e))
+                return
+            
+        if mode == "encrypt":
+            source, _ = QFileDialog.getOpenFileName(self, "选择要加密的文件")
+            default_target = source + ENCRYPTED_EXTENSION
+        else:
+            source, _ = QFileDialog.getOpenFileName(self, "选择要解密的文件", "",
+                                                    f"加密文件 (*{ENCRYPTED_EXTENSION});;所有文件 (*)")
+            root, ext = os.path.splitext(source)
+            default_target = root if ext == ENCRYPTED_EXTENSION else source + ".dec"
+        if not source:
+            return
+        target, _ = QFileDialog.getSaveFileName(self, "保存结果", default_target)
+        if not target:
+            return
+        if os.path.abspath(target) == os.path.abspath(source):
+            QMessageBox.warning(self, "警告", "输出文件不能与输入文件相同")
+            return
+            
+        # 加密时显示并记住密钥，可以用“复制密钥”按钮复制
+        kdf_params = None
+        if passphrase is not None:
+            if mode == "encrypt":
+                kdf_params = self.encryption_params()
+        elif mode == "encrypt":
+            self.file_key_input.setText(key_text)
+            self.current_key = key_text.encode("ascii")
+            
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cancel_btn.setVisible(True)
+        self.set_jobs_enabled(False)
+        self.status_label.setText("正在加密文件..." if mode == "encrypt" else "正在解密文件...")
+        self.status_label.setStyleSheet("color: #2E7D32;" if mode == "encrypt" else "color: #0277BD;")
+        
+        self.file_thread = FileCryptoThread(mode, source, target, key, self.algorithm_combo.currentData(),
+                                            passphrase, kdf_params)
+        self.file_thread.progress_signal.connect(self.update_file_progress)
+        self.file_thread.result_signal.connect(lambda target, size: self.show_file_result(mode, target, size))
+        self.file_thread.error_signal.connect(self.show_file_error)
+        self.file_thread.finished.connect(self.file_job_finished)
+        self.file_thread.start()
+        
+    def start_batch_job(self, mode):
+        passphrase = None
+        key = None
+        if self.use_password_check.isChecked():
+            passphrase = self.password()
+            if not passphrase:
+                return
+        else:
+            key_text = self.file_key_input.text().strip()
+            if mode == "decrypt" and not key_text:
+                QMessageBox.warning(self, "警告", "请输入批量加密时生成的密钥")
+                return
+            if mode == "encrypt" and not key_text:
+                key_text = generate_file_key()
+            try:
+                key = parse_file_key(key_text)
+            except ValueError as e:
+                QMessageBox.warning(self, "警告", str(e))
+                return
+                
+        source, _ = QFileDialog.getOpenFileName(self, "选择记录文件", "", "文本文件 (*.txt);;所有文件 (*)")
+        if not source:
+            return
+        suffix = "encrypted" if mode == "encrypt" else "decrypted"
+        target, selected_filter = QFileDialog.getSaveFileName(
+            self, "保存对应关系", f"{os.path.splitext(source)[0]}.{suffix}.csv",
+            "CSV文件 (*.csv);;JSON Lines (*.jsonl)"
+        )
+        if not target:
+            return
+        fmt = "jsonl" if target.lower().endswith(".jsonl") or "jsonl" in selected_filter.lower() else "csv"
+        if not target.lower().endswith(f".{fmt}"):
+            target += f".{fmt}"
+            
+        kdf_params = None
+        if passphrase is not None:
+            if mode == "encrypt":
+                kdf_params = self.encryption_params()
+        elif mode == "encrypt":
+            self.file_key_input.setText(key_text)
+            self.current_key = key_text.encode("ascii")
+            
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cancel_btn.setVisible(True)
+        self.set_jobs_enabled(False)
+        self.status_label.setText("正在批量加密..." if mode == "encrypt" else "正在批量解密...")
+        self.status_label.setStyleSheet("color: #2E7D32;" if mode == "encrypt" else "color: #0277BD;")
+        
+        self.file_thread = BatchCryptoThread(mode, source, target, fmt, key, passphrase, kdf_params)
+        self.file_thread.progress_signal.connect(self.update_batch_progress)
+        self.file_thread.result_signal.connect(self.show_batch_result)
+        self.file_thread.error_signal.connect(self.show_file_error)
+        self.file_thread.finished.connect(self.file_job_finished)
+        self.file_thread.start()
+        
+    def update_batch_progress(self, permille, speed):
+        self.progress_bar.setValue(permille)
+        self.status_label.setText(f"正在处理记录... {permille / 10:.1f}%  {speed:.0f} 条/秒")
+        
+    def show_batch_result(self, target, succeeded, failed):
+        message = f"成功 {succeeded} 条，失败 {failed} 条"
+        self.status_label.setText(f"批量处理完成：{message}")
+        self.status_label.setStyleSheet("color: #D32F2F;" if failed else "color: #2E7D32;")
+        if failed:
+            QMessageBox.warning(self, "完成", f"{message}\n失败原因已写入结果文件: {target}")
+        else:
+            QMessageBox.information(self, "成功", f"{message}\n结果已保存到: {target}")
+            
+    def set_jobs_enabled(self, enabled):
+        for button in (self.encrypt_file_btn, self.decrypt_file_btn, self.encrypt_batch_btn, self.decrypt_batch_btn):
+            button.setEnabled(enabled)
+            
+    def update_file_progress(self, permille, speed):
+        self.progress_bar.setValue(permille)
+        self.status_label.setText(f"正在处理文件... {permille / 10:.1f}%  {speed:.1f} MB/s")
+        
+    def show_file_result(self, mode, target, size):
+        if mode == "encrypt":
+            if self.use_password_check.isChecked():
+                self.status_label.setText("文件加密成功！解密时需要输入相同的密码。")
+                QMessageBox.information(self, "成功", f"文件已加密保存到: {target}\n请牢记密码，解密时将需要使用。")
+                return
+            self.status_label.setText("文件加密成功！请妥善保管密钥。")
+            QMessageBox.information(self, "成功", f"文件已加密保存到: {target}\n请保存密钥，解密时将需要使用。")
+        else:
+            self.status_label.setText("文件解密成功！")
+            QMessageBox.information(self, "成功", f"文件已解密保存到: {target}\n大小: {size / 1024:.2f} KB")
+            
+    def show_file_error(self, message):
+        self.status_label.setText(f"处理文件失败: {message}")
+        self.status_label.setStyleSheet("color: #D32F2F;")
+        QMessageBox.critical(self, "错误", f"处理文件时出错: {message}")
+        
+    def cancel_file_job(self):
+        """取消处理，界面立即恢复，后台线程在当前块结束后删除临时文件并退出"""
+        if self.file_thread is None:
+            return
+        self.file_thread.cancel()
+        self.file_thread.result_signal.disconnect()
+        self.file_thread.progress_signal.disconnect()
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.status_label.setText("已取消")
+        
+    def file_job_finished(self):
+        self.file_thread.wait()
+        self.file_thread = None
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.set_jobs_enabled(True)